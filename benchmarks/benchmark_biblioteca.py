@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cifra_biblioteca import BibliotecaCifras
+from cifra_cache import CacheCifras
+from gerar_fixtures import PROGRESSOES, gerar_texto_cifra
+
+
+TOTAL_MUSICAS = 20000
+ACESSOS_ALEATORIOS = 1000
+LIMITE_CARREGAMENTO_S = 1.0
+LIMITE_ACESSO_MS = 5.0
+LIMITE_CACHE_IMPORTACAO = 50
+
+
+def gerar_musicas(total: int):
+    rng = random.Random(16)
+    for indice in range(total):
+        yield f"artista-{indice % 1500}/musica-{indice}", {
+            'url': f"https://www.cifraclub.com.br/artista-{indice % 1500}/musica-{indice}/",
+            'artista': f"Artista {indice % 1500}",
+            'musica': f"Música {indice}",
+            'tom_original': rng.choice(PROGRESSOES)[0],
+            'cifra': gerar_texto_cifra(rng, rng.randint(2, 8), rng.choice([0, 0, 0, 2])),
+            'youtube_url': None,
+        }
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_MUSICAS
+    pasta = tempfile.mkdtemp(prefix='cifra_biblioteca_')
+    caminho = os.path.join(pasta, 'biblioteca.cifras')
+    falhas = []
+
+    try:
+        inicio = time.perf_counter()
+        with BibliotecaCifras(caminho) as biblioteca:
+            biblioteca.exportar(gerar_musicas(total))
+        exportacao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        with BibliotecaCifras(caminho, somente_leitura=True) as biblioteca:
+            catalogo = biblioteca.catalogo()
+            carregamento = time.perf_counter() - inicio
+
+            chaves = random.Random(1).sample([musica['chave'] for musica in catalogo], min(ACESSOS_ALEATORIOS, len(catalogo)))
+            inicio = time.perf_counter()
+            for chave in chaves:
+                biblioteca.obter(chave)
+            acesso_ms = (time.perf_counter() - inicio) / len(chaves) * 1000
+
+            cache = CacheCifras(os.path.join(pasta, 'cache'), max_entradas=LIMITE_CACHE_IMPORTACAO)
+            importadas = biblioteca.importar_para_cache(cache)
+            no_cache = len([nome for nome in os.listdir(cache.diretorio) if nome.endswith('.json')])
+            if importadas != min(total, LIMITE_CACHE_IMPORTACAO) or no_cache != importadas:
+                falhas.append(f"importação para um cache de {LIMITE_CACHE_IMPORTACAO} cifras gravou {importadas} "
+                              f"e manteve {no_cache}")
+
+        caminho_enarmonicos = os.path.join(pasta, 'enarmonicos.cifras')
+        with BibliotecaCifras(caminho_enarmonicos) as biblioteca:
+            biblioteca.exportar([('teste/enarmonicos', {'artista': 'Teste', 'musica': 'Enarmônicos',
+                                                        'cifra': "Cb    B    E    Fb\nLetra da música"})])
+            if biblioteca.com_acorde('Cb') != ['teste/enarmonicos'] or biblioteca.com_acorde('Fb') != ['teste/enarmonicos']:
+                falhas.append("acordes enarmônicos (Cb/B, Fb/E) não foram guardados separadamente")
+
+        tamanho_mb = os.path.getsize(caminho) / 1024 / 1024
+        print(f"Músicas:                 {len(catalogo)}")
+        print(f"Arquivo:                 {tamanho_mb:.1f} MB ({tamanho_mb * 1024 * 1024 / len(catalogo):.0f} bytes/música)")
+        print(f"Exportação:              {exportacao:.2f} s ({len(catalogo) / exportacao:,.0f} músicas/s)")
+        print(f"Carregamento do catálogo: {carregamento * 1000:.0f} ms (limite {LIMITE_CARREGAMENTO_S * 1000:.0f} ms)")
+        print(f"Acesso a uma música:     {acesso_ms:.2f} ms (limite {LIMITE_ACESSO_MS:.0f} ms)")
+
+        if carregamento > LIMITE_CARREGAMENTO_S:
+            falhas.append(f"carregamento levou {carregamento:.2f} s")
+        if acesso_ms > LIMITE_ACESSO_MS:
+            falhas.append(f"acesso a uma música levou {acesso_ms:.2f} ms")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print("\n✅ Biblioteca dentro dos limites")
+
+
+if __name__ == "__main__":
+    main()
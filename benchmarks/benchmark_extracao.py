@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import glob
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from cifra_standalone import CifraClubStandalone
+from cifra_extracao import extrair_pagina, motor_disponivel
+from gerar_fixtures import PASTA_FIXTURES, gerar_fixtures
+
+
+REPETICOES = 20
+
+
+def extrair_bs4(cifra_club: CifraClubStandalone, conteudo: bytes) -> dict:
+    html_text = conteudo.decode('utf-8')
+    soup = BeautifulSoup(html_text, 'html.parser')
+    return {
+        'artista': cifra_club._extrair_artista(soup),
+        'musica': cifra_club._extrair_musica(soup),
+        'tom_original': cifra_club._extrair_tom_original(soup),
+        'cifra': cifra_club._extrair_cifra(soup),
+        'youtube_url': cifra_club._extrair_youtube(html_text)
+    }
+
+
+def medir(funcao, repeticoes: int = REPETICOES) -> float:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    caminhos = sorted(glob.glob(os.path.join(PASTA_FIXTURES, '*.html'))) or gerar_fixtures()
+    cifra_club = CifraClubStandalone(usar_cache=False)
+    motores = [motor for motor in ('html.parser', 'lxml') if motor_disponivel(motor)]
+
+    print(f"{'Página':<24}{'KB':>6}{'bs4 (ms)':>12}" + ''.join(f"{motor + ' (ms)':>18}" for motor in motores))
+    divergencias = 0
+
+    for caminho in caminhos:
+        with open(caminho, 'rb') as arquivo:
+            conteudo = arquivo.read()
+
+        referencia = extrair_bs4(cifra_club, conteudo)
+        tempo_bs4 = medir(lambda: extrair_bs4(cifra_club, conteudo), max(3, REPETICOES // 4))
+
+        colunas = []
+        for motor in motores:
+            if extrair_pagina(conteudo, motor=motor) != referencia:
+                divergencias += 1
+                print(f"⚠️  {os.path.basename(caminho)}: resultado do motor {motor} difere do BeautifulSoup")
+            tempo = medir(lambda: extrair_pagina(conteudo, motor=motor))
+            colunas.append(f"{tempo * 1000:>10.2f} ({tempo_bs4 / tempo:>4.1f}x)")
+
+        print(f"{os.path.basename(caminho):<24}{len(conteudo) // 1024:>6}{tempo_bs4 * 1000:>12.2f}" + ''.join(f"{coluna:>18}" for coluna in colunas))
+
+    sys.exit(1 if divergencias else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS = ('cifra_standalone', 'cifra_interativo')
+DEPENDENCIAS_PESADAS = ('requests', 'urllib3', 'bs4', 'reportlab', 'lxml', 'pypdf', 'webbrowser')
+LIMITE_IMPORTACAO_MS = 60
+REPETICOES = 7
+
+
+def importtime(modulo: str) -> dict:
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=PASTA_PROJETO, capture_output=True, text=True, check=True
+    )
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or '|' not in linha:
+            continue
+        _, acumulado, nome = linha.split('|')
+        if acumulado.strip().isdigit():
+            tempos[nome.strip()] = int(acumulado)
+    return tempos
+
+
+def tempo_total(codigo: str) -> float:
+    medidas = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-c', codigo], cwd=PASTA_PROJETO, check=True)
+        medidas.append(time.perf_counter() - inicio)
+    return statistics.median(medidas)
+
+
+def main():
+    falhas = []
+    base = tempo_total('pass')
+
+    print(f"{'Módulo':<20}{'importtime (ms)':>18}{'processo (ms)':>16}{'limite (ms)':>14}")
+    for modulo in MODULOS:
+        tempos = importtime(modulo)
+        importacao_ms = tempos.get(modulo, 0) / 1000
+        processo_ms = (tempo_total(f'import {modulo}') - base) * 1000
+        print(f"{modulo:<20}{importacao_ms:>18.1f}{processo_ms:>16.1f}{LIMITE_IMPORTACAO_MS:>14}")
+
+        if importacao_ms > LIMITE_IMPORTACAO_MS:
+            falhas.append(f"{modulo} levou {importacao_ms:.1f} ms para importar (limite {LIMITE_IMPORTACAO_MS} ms)")
+
+        carregadas = [dependencia for dependencia in DEPENDENCIAS_PESADAS if dependencia in tempos]
+        if carregadas:
+            falhas.append(f"{modulo} importa na inicialização: {', '.join(carregadas)}")
+
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print("\n✅ Inicialização dentro do limite")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+import gc
+import os
+import sys
+import glob
+import time
+import random
+import shutil
+import tempfile
+import threading
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cifra_standalone
+from cifra_standalone import CifraClubStandalone
+from cifra_transporte import Transporte
+from gerar_fixtures import PASTA_FIXTURES, gerar_cifra, gerar_fixtures, gerar_pagina
+from servidor_fixtures import ARTISTA_FIXTURES, ServidorFixtures
+
+
+TOTAL_BUSCAS = 2000
+AQUECIMENTO = 200
+BLOCOS_RUIDO_PAGINA_ENORME = 2400
+LIMITE_PICO_STREAMING = 0.25
+LIMITE_CRESCIMENTO_KB = 256
+TAMANHO_MAXIMO_TESTE = 1024 * 1024
+ESPERA_MAXIMA_ALTERNATIVA = 10
+
+MODOS = [
+    ('streaming', {'streaming': True}),
+    ('streaming + bs4', {'streaming': True, 'motor_extracao': 'bs4'}),
+    ('sem streaming', {'streaming': False}),
+    ('sem streaming + bs4', {'streaming': False, 'motor_extracao': 'bs4'}),
+]
+
+
+def criar_cifra_club(base_url: str, **opcoes) -> CifraClubStandalone:
+    return CifraClubStandalone(usar_cache=False, base_url=base_url,
+                               transporte=Transporte(requisicoes_por_segundo=0), **opcoes)
+
+
+def pico_da_busca(cifra_club: CifraClubStandalone, musica: str) -> tuple:
+    gc.collect()
+    antes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    dados = cifra_club.buscar_cifra(ARTISTA_FIXTURES, musica)
+    _, pico = tracemalloc.get_traced_memory()
+    return dados, (pico - antes) / 1024
+
+
+def busca_com_extracao_interrompida(base_url: str, musica: str) -> dict:
+    def extracao_interrompida(leitor, *argumentos):
+        next(leitor)
+        raise ValueError("extração interrompida depois do primeiro bloco")
+
+    cifra_club = CifraClubStandalone(usar_cache=False, base_url=base_url, usar_indice=False,
+                                     transporte=Transporte(max_conexoes=1, requisicoes_por_segundo=0))
+    resultado = {}
+    thread = threading.Thread(target=lambda: resultado.update(cifra_club.buscar_cifra(ARTISTA_FIXTURES, musica)),
+                              daemon=True)
+    extrair_pagina = cifra_standalone.extrair_pagina
+    cifra_standalone.extrair_pagina = extracao_interrompida
+    try:
+        thread.start()
+        thread.join(ESPERA_MAXIMA_ALTERNATIVA)
+    finally:
+        cifra_standalone.extrair_pagina = extrair_pagina
+    return None if thread.is_alive() else resultado
+
+
+def memoria_atual_kb() -> float:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 1024
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_BUSCAS
+    paginas = sorted(glob.glob(os.path.join(PASTA_FIXTURES, '*.html'))) or gerar_fixtures()
+    pasta = tempfile.mkdtemp(prefix='cifra_memoria_')
+    falhas = []
+
+    try:
+        for caminho in paginas:
+            shutil.copy(caminho, pasta)
+        rng = random.Random(20)
+        caminho_enorme = os.path.join(pasta, 'pagina_enorme.html')
+        with open(caminho_enorme, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(gerar_pagina(rng, 'Página Enorme', 'Banda Teste', 'C', gerar_cifra(rng, 60),
+                                       BLOCOS_RUIDO_PAGINA_ENORME))
+        tamanho_kb = os.path.getsize(caminho_enorme) / 1024
+        musicas = [os.path.splitext(os.path.basename(caminho))[0] for caminho in paginas]
+
+        with ServidorFixtures(pasta) as servidor:
+            tracemalloc.start()
+            try:
+                print(f"Página enorme: {tamanho_kb:,.0f} KB\n")
+                print(f"{'Modo':<22}{'pico por busca (KB)':>22}")
+                referencia = None
+                referencia_longa = criar_cifra_club(servidor.base_url).buscar_cifra(ARTISTA_FIXTURES, 'pagina_longa')
+                picos = {}
+                for nome, opcoes in MODOS:
+                    cifra_club = criar_cifra_club(servidor.base_url, **opcoes)
+                    cifra_club.buscar_cifra(ARTISTA_FIXTURES, musicas[0])
+                    dados, pico = pico_da_busca(cifra_club, 'pagina_enorme')
+                    picos[nome] = pico
+                    print(f"{nome:<22}{pico:>22,.0f}")
+                    if 'erro' in dados:
+                        falhas.append(f"{nome}: {dados['erro']}")
+                        continue
+                    dados.pop('documento', None)
+                    if referencia is None:
+                        referencia = dados
+                    elif dados != referencia:
+                        falhas.append(f"{nome}: dados extraídos diferem do modo streaming")
+
+                if picos['streaming'] > tamanho_kb * LIMITE_PICO_STREAMING:
+                    falhas.append(f"pico de {picos['streaming']:,.0f} KB com streaming "
+                                  f"(limite {tamanho_kb * LIMITE_PICO_STREAMING:,.0f} KB)")
+
+                limitado = criar_cifra_club(servidor.base_url, tamanho_maximo=TAMANHO_MAXIMO_TESTE)
+                dados = limitado.buscar_cifra(ARTISTA_FIXTURES, 'pagina_enorme')
+                print(f"\nLimite de {TAMANHO_MAXIMO_TESTE // 1024} KB:   {dados.get('erro', 'página aceita')}")
+                if 'erro' not in dados:
+                    falhas.append("página acima do tamanho máximo foi aceita")
+
+                dados = busca_com_extracao_interrompida(servidor.base_url, 'pagina_longa')
+                if dados is None:
+                    falhas.append(f"alternativa bs4 com 1 conexão travou por mais de {ESPERA_MAXIMA_ALTERNATIVA}s")
+                elif 'erro' in dados or dados.get('cifra') != referencia_longa['cifra']:
+                    falhas.append(f"alternativa bs4 após extração interrompida falhou: {dados.get('erro')}")
+                else:
+                    print("Extração interrompida:  página lida de novo com bs4")
+
+                cifra_club = criar_cifra_club(servidor.base_url)
+                inicio = time.perf_counter()
+                for indice in range(total):
+                    if indice == AQUECIMENTO:
+                        memoria_inicial = memoria_atual_kb()
+                    dados = cifra_club.buscar_cifra(ARTISTA_FIXTURES, musicas[indice % len(musicas)])
+                    if 'erro' in dados:
+                        falhas.append(f"busca {indice}: {dados['erro']}")
+                        break
+                duracao = time.perf_counter() - inicio
+                del dados
+                crescimento = memoria_atual_kb() - memoria_inicial
+            finally:
+                tracemalloc.stop()
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print(f"\n{total} buscas:            {duracao:.1f} s ({total / duracao:,.0f} buscas/s)")
+    print(f"Memória após {AQUECIMENTO} buscas: {crescimento:+,.1f} KB até o fim (limite {LIMITE_CRESCIMENTO_KB} KB)")
+    if crescimento > LIMITE_CRESCIMENTO_KB:
+        falhas.append(f"memória cresceu {crescimento:,.0f} KB durante as buscas")
+
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print("\n✅ Memória por busca limitada e estável")
+
+
+if __name__ == "__main__":
+    main()
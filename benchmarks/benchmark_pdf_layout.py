@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import shutil
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfReader
+
+from cifra_pdf import LAYOUTS, montar_cabecalho, renderizar_pdf
+from cifra_standalone import CifraClubStandalone
+from gerar_fixtures import gerar_texto_cifra
+
+
+ACELERACAO_MINIMA = 3.0
+REPETICOES = 3
+PARTES = 60
+TABS = 12
+
+
+def textos_pdf(caminho: str) -> list:
+    return [pagina.extract_text() for pagina in PdfReader(caminho).pages]
+
+
+def main():
+    cifra_club = CifraClubStandalone(usar_cache=False)
+    dados = {
+        'url': 'https://www.cifraclub.com.br/artista/musica/',
+        'artista': 'Artista',
+        'musica': 'Música Longa',
+        'tom_original': 'G',
+        'cifra': gerar_texto_cifra(random.Random(19), PARTES, TABS),
+        'youtube_url': None,
+    }
+    tons = []
+    for semitons in range(12):
+        cabecalho = montar_cabecalho(dados, semitons, cifra_club.tom_transposto(dados, semitons))
+        tons.append((semitons, cabecalho, cifra_club.linhas_pdf(dados, semitons)))
+
+    pasta = tempfile.mkdtemp(prefix='cifra_pdf_layout_')
+    falhas = []
+    try:
+        completo = reaproveitado = float('inf')
+        for _ in range(REPETICOES):
+            inicio = time.perf_counter()
+            for semitons, cabecalho, linhas in tons:
+                paginas = renderizar_pdf(os.path.join(pasta, f"completo_{semitons}.pdf"), cabecalho, linhas,
+                                         reutilizar_layout=False)
+            completo = min(completo, time.perf_counter() - inicio)
+
+            LAYOUTS.limpar()
+            inicio = time.perf_counter()
+            for semitons, cabecalho, linhas in tons:
+                renderizar_pdf(os.path.join(pasta, f"layout_{semitons}.pdf"), cabecalho, linhas)
+            reaproveitado = min(reaproveitado, time.perf_counter() - inicio)
+
+        for semitons, _, _ in tons:
+            if textos_pdf(os.path.join(pasta, f"completo_{semitons}.pdf")) != textos_pdf(os.path.join(pasta, f"layout_{semitons}.pdf")):
+                falhas.append(f"PDF com layout reaproveitado difere do completo em {semitons:+d} semitons")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    aceleracao = completo / reaproveitado
+    print(f"Cifra:                  {len(tons[0][2])} linhas, {paginas} páginas")
+    print(f"12 tons, layout novo:   {completo * 1000:.0f} ms ({completo / 12 * 1000:.1f} ms por tom)")
+    print(f"12 tons, layout reusado: {reaproveitado * 1000:.0f} ms ({reaproveitado / 12 * 1000:.1f} ms por tom)")
+    print(f"Aceleração:             {aceleracao:.1f}x (mínimo {ACELERACAO_MINIMA:.0f}x)")
+
+    if aceleracao < ACELERACAO_MINIMA:
+        falhas.append(f"aceleração de apenas {aceleracao:.1f}x")
+
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print("\n✅ Layout reaproveitado entre os tons")
+
+
+if __name__ == "__main__":
+    main()
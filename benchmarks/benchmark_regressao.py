@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import glob
+import json
+import time
+import random
+import shutil
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cifra_acordes
+import cifra_pdf
+from cifra_acordes import e_linha_de_acordes, transpor_linha
+from cifra_extracao import extrair_pagina
+from cifra_pdf_cache import CachePDF
+from cifra_standalone import CifraClubStandalone
+from gerar_fixtures import PASTA_FIXTURES, gerar_texto_cifra, gerar_fixtures
+from servidor_fixtures import ARTISTA_FIXTURES, ServidorFixtures
+
+
+CAMINHO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+CORPUS_CIFRAS = [
+    ('curta', 4, 0),
+    ('media', 16, 0),
+    ('longa', 60, 0),
+    ('tablatura', 24, 12),
+]
+SEMITONS = 5
+REPETICOES = 7
+AQUECIMENTO = 1
+TOLERANCIA_VAZAO = 0.30
+TOLERANCIA_MEMORIA = 0.50
+
+
+def carga_referencia() -> int:
+    contagem = {}
+    for indice in range(40000):
+        simbolo = f"{'CDEFGAB'[indice % 7]}{'#b'[indice % 2]}m7/{indice % 12}"
+        contagem[simbolo] = contagem.get(simbolo, 0) + len(simbolo.upper().split('/')[0])
+    return len(contagem)
+
+
+def medir_referencia() -> float:
+    inicio = time.perf_counter()
+    carga_referencia()
+    return time.perf_counter() - inicio
+
+
+def limpar_caches():
+    for funcao in (cifra_acordes.e_linha_de_acordes, cifra_acordes.tokenizar_acorde,
+                   cifra_acordes.tokenizar_linha, cifra_acordes.qualidade_basica):
+        funcao.cache_clear()
+    cifra_pdf.LAYOUTS.limpar()
+
+
+def carregar_corpus() -> dict:
+    caminhos = sorted(glob.glob(os.path.join(PASTA_FIXTURES, '*.html'))) or gerar_fixtures()
+    paginas = {}
+    for caminho in caminhos:
+        with open(caminho, 'rb') as arquivo:
+            paginas[os.path.splitext(os.path.basename(caminho))[0]] = arquivo.read()
+
+    cifras = {nome: gerar_texto_cifra(random.Random(nome), partes, tabs) for nome, partes, tabs in CORPUS_CIFRAS}
+    linhas = [linha for cifra in cifras.values() for linha in cifra.split('\n')]
+    return {
+        'paginas': paginas,
+        'cifras': cifras,
+        'linhas': linhas,
+        'linhas_de_acordes': [linha for linha in linhas if e_linha_de_acordes(linha)],
+    }
+
+
+def _etapa_linhas_de_acordes(corpus, contexto):
+    linhas = corpus['linhas']
+
+    def executar():
+        for linha in linhas:
+            e_linha_de_acordes(linha)
+        return len(linhas)
+    return 'linhas/s', executar
+
+
+def _etapa_transpor_linha(corpus, contexto):
+    linhas = corpus['linhas_de_acordes']
+
+    def executar():
+        for linha in linhas:
+            transpor_linha(linha, SEMITONS)
+        return len(linhas)
+    return 'linhas/s', executar
+
+
+def _etapa_transpor_cifra(corpus, contexto):
+    cifra_club = contexto['cifra_club']
+    cifras = list(corpus['cifras'].values())
+
+    def executar():
+        for cifra in cifras:
+            cifra_club.transpor_cifra(cifra, SEMITONS)
+        return len(cifras)
+    return 'músicas/s', executar
+
+
+def _etapa_extracao(corpus, contexto):
+    paginas = list(corpus['paginas'].values())
+
+    def executar():
+        for pagina in paginas:
+            extrair_pagina(pagina)
+        return len(paginas)
+    return 'músicas/s', executar
+
+
+def _etapa_buscar_cifra(corpus, contexto):
+    cifra_club = contexto['cifra_club']
+    nomes = list(corpus['paginas'])
+
+    def executar():
+        for nome in nomes:
+            dados = cifra_club.buscar_cifra(ARTISTA_FIXTURES, nome)
+            if 'erro' in dados:
+                raise RuntimeError(dados['erro'])
+        return len(nomes)
+    return 'músicas/s', executar
+
+
+def _etapa_salvar_pdf(corpus, contexto):
+    cifra_club = contexto['cifra_club']
+    musicas = [cifra_club.buscar_cifra(ARTISTA_FIXTURES, nome) for nome in corpus['paginas']]
+    cache_pdf = CachePDF()
+
+    def executar():
+        paginas = 0
+        for dados in musicas:
+            caminho_pdf = cifra_club.salvar_pdf(dados, semitons=SEMITONS)
+            paginas += cache_pdf.manifesto()[os.path.basename(caminho_pdf)]['paginas']
+            os.remove(caminho_pdf)
+        return paginas
+    return 'páginas/s', executar
+
+
+ETAPAS = {
+    'linhas_de_acordes': _etapa_linhas_de_acordes,
+    'transpor_linha': _etapa_transpor_linha,
+    'transpor_cifra': _etapa_transpor_cifra,
+    'extracao': _etapa_extracao,
+    'buscar_cifra': _etapa_buscar_cifra,
+    'salvar_pdf': _etapa_salvar_pdf,
+}
+
+
+def medir_etapa(executar, repeticoes: int) -> dict:
+    tempos = []
+    indices = []
+    unidades = 0
+    for repeticao in range(repeticoes + AQUECIMENTO):
+        referencia = medir_referencia()
+        limpar_caches()
+        inicio = time.perf_counter()
+        unidades = executar()
+        tempo = time.perf_counter() - inicio
+        if repeticao >= AQUECIMENTO:
+            tempos.append(tempo)
+            indices.append(unidades / tempo * referencia)
+    mediana = statistics.median(tempos)
+
+    limpar_caches()
+    tracemalloc.start()
+    try:
+        executar()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'vazao': unidades / mediana, 'indice': statistics.median(indices), 'segundos': mediana,
+            'pico_memoria_kb': pico / 1024}
+
+
+def comparar(resultados: dict, baseline: dict, tolerancia_vazao: float, tolerancia_memoria: float) -> list:
+    falhas = []
+    for nome, resultado in resultados.items():
+        referencia = baseline.get('etapas', {}).get(nome)
+        if not referencia or 'indice' not in referencia:
+            continue
+        minimo = referencia['indice'] * (1 - tolerancia_vazao)
+        if resultado['indice'] < minimo:
+            falhas.append(f"{nome}: índice {resultado['indice']:.2f} "
+                          f"(baseline {referencia['indice']:.2f}, mínimo {minimo:.2f}; {resultado['vazao']:.0f} {resultado['unidade']})")
+        maximo = referencia['pico_memoria_kb'] * (1 + tolerancia_memoria)
+        if resultado['pico_memoria_kb'] > maximo:
+            falhas.append(f"{nome}: pico de memória {resultado['pico_memoria_kb']:.0f} KB "
+                          f"(baseline {referencia['pico_memoria_kb']:.0f} KB, máximo {maximo:.0f} KB)")
+    return falhas
+
+
+def carregar_baseline(caminho: str) -> dict:
+    try:
+        with open(caminho, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def salvar_baseline(caminho: str, resultados: dict):
+    baseline = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'gerado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'etapas': {nome: {'unidade': resultado['unidade'], 'indice': round(resultado['indice'], 4),
+                          'vazao': round(resultado['vazao'], 1),
+                          'pico_memoria_kb': round(resultado['pico_memoria_kb'], 1)}
+                   for nome, resultado in resultados.items()}
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(baseline, arquivo, ensure_ascii=False, indent=2)
+        arquivo.write('\n')
+
+
+def main():
+    argumentos = sys.argv[1:]
+    opcoes = [argumento.lower() for argumento in argumentos]
+    caminho_baseline = CAMINHO_BASELINE
+    tolerancia_vazao = TOLERANCIA_VAZAO
+    tolerancia_memoria = TOLERANCIA_MEMORIA
+    repeticoes = REPETICOES
+    etapas = list(ETAPAS)
+
+    i = 0
+    while i < len(opcoes):
+        if opcoes[i] == '--baseline' and i + 1 < len(argumentos):
+            caminho_baseline = argumentos[i + 1]
+            i += 1
+        elif opcoes[i] == '--tolerancia' and i + 1 < len(argumentos):
+            tolerancia_vazao = float(argumentos[i + 1])
+            i += 1
+        elif opcoes[i] == '--repeticoes' and i + 1 < len(argumentos):
+            repeticoes = max(1, int(argumentos[i + 1]))
+            i += 1
+        elif opcoes[i] == '--etapas' and i + 1 < len(argumentos):
+            etapas = [etapa for etapa in argumentos[i + 1].split(',') if etapa]
+            desconhecidas = [etapa for etapa in etapas if etapa not in ETAPAS]
+            if desconhecidas:
+                print(f"❌ Etapas desconhecidas: {', '.join(desconhecidas)} (disponíveis: {', '.join(ETAPAS)})")
+                sys.exit(2)
+            i += 1
+        i += 1
+
+    corpus = carregar_corpus()
+    print(f"Corpus: {len(corpus['paginas'])} páginas, {len(corpus['cifras'])} cifras, "
+          f"{len(corpus['linhas'])} linhas ({len(corpus['linhas_de_acordes'])} de acordes)\n")
+
+    pasta_trabalho = tempfile.mkdtemp(prefix='cifra_benchmark_')
+    diretorio_original = os.getcwd()
+    resultados = {}
+
+    with ServidorFixtures() as servidor:
+        contexto = {'cifra_club': CifraClubStandalone(usar_cache=False, base_url=servidor.base_url)}
+        os.chdir(pasta_trabalho)
+        try:
+            print(f"{'Etapa':<20}{'vazão':>14}  {'unidade':<11}{'tempo (ms)':>12}{'índice':>10}{'pico (KB)':>12}")
+            for nome in etapas:
+                unidade, executar = ETAPAS[nome](corpus, contexto)
+                resultado = medir_etapa(executar, repeticoes)
+                resultado['unidade'] = unidade
+                resultados[nome] = resultado
+                print(f"{nome:<20}{resultado['vazao']:>14,.1f}  {unidade:<11}"
+                      f"{resultado['segundos'] * 1000:>12.2f}{resultado['indice']:>10.2f}{resultado['pico_memoria_kb']:>12,.0f}")
+        finally:
+            os.chdir(diretorio_original)
+            shutil.rmtree(pasta_trabalho, ignore_errors=True)
+
+    if '--salvar-baseline' in opcoes:
+        salvar_baseline(caminho_baseline, resultados)
+        print(f"\n💾 Baseline salva em {caminho_baseline}")
+        return
+
+    baseline = carregar_baseline(caminho_baseline)
+    if baseline and not any('indice' in etapa for etapa in baseline.get('etapas', {}).values()):
+        print(f"\n⚠️  A baseline em {caminho_baseline} é de um formato antigo (sem índices); use --salvar-baseline para recriá-la")
+        return
+    if not baseline:
+        print(f"\n⚠️  Nenhuma baseline em {caminho_baseline}; use --salvar-baseline para criar")
+        return
+
+    falhas = comparar(resultados, baseline, tolerancia_vazao, tolerancia_memoria)
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print(f"\n✅ Sem regressões em relação à baseline ({baseline.get('gerado_em', '?')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cifra_cache import CacheCifras
+from cifra_standalone import CifraClubStandalone
+from cifra_sync import MOTIVO_CIFRA, MOTIVO_TOM, SincronizadorSetlist, imprimir_resumo
+from cifra_transporte import Transporte
+from gerar_fixtures import gerar_cifra, gerar_pagina
+from servidor_fixtures import ARTISTA_FIXTURES, ServidorFixtures
+
+
+TOTAL_MUSICAS = 12
+TONS_ORIGINAIS = ['G', 'Dm', 'A', 'C', 'Eb', 'E']
+TONS = ['C', 'D', 'E', 'F', 'G', 'A', 'Bb', '2', '-3']
+ACELERACAO_MINIMA = 5.0
+
+
+def escrever_pagina(pasta: str, indice: int, versao: int = 0):
+    rng = random.Random(f"{indice}-{versao}")
+    pagina = gerar_pagina(rng, f"Música {indice}", 'Banda Teste', TONS_ORIGINAIS[indice % len(TONS_ORIGINAIS)],
+                          gerar_cifra(rng, rng.randint(8, 24)), 20)
+    with open(os.path.join(pasta, f"musica-{indice}.html"), 'w', encoding='utf-8') as arquivo:
+        arquivo.write(pagina)
+
+
+def escrever_setlist(caminho: str, tons: list):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for indice, tom in enumerate(tons):
+            arquivo.write(f"{ARTISTA_FIXTURES}/musica-{indice} {tom}\n")
+
+
+def sincronizar(sincronizador: SincronizadorSetlist, titulo: str) -> dict:
+    print(f"\n— {titulo}")
+    resumo = sincronizador.sincronizar()
+    imprimir_resumo(resumo)
+    return resumo
+
+
+def main():
+    pasta = tempfile.mkdtemp(prefix='cifra_sync_')
+    diretorio_original = os.getcwd()
+    falhas = []
+
+    try:
+        pasta_paginas = os.path.join(pasta, 'paginas')
+        os.makedirs(pasta_paginas)
+        for indice in range(TOTAL_MUSICAS):
+            escrever_pagina(pasta_paginas, indice)
+        tons = [TONS[indice % len(TONS)] for indice in range(TOTAL_MUSICAS)]
+        caminho_setlist = os.path.join(pasta, 'setlist.txt')
+        escrever_setlist(caminho_setlist, tons)
+        os.chdir(pasta)
+
+        with ServidorFixtures(pasta_paginas) as servidor:
+            transporte = Transporte(requisicoes_por_segundo=0)
+            cifra_club = CifraClubStandalone(cache=CacheCifras(os.path.join(pasta, 'cache')), base_url=servidor.base_url,
+                                             transporte=transporte, usar_indice=False, revalidar=True)
+            sincronizador = SincronizadorSetlist(cifra_club, caminho_setlist)
+
+            primeira = sincronizar(sincronizador, "Primeira sincronização")
+            segunda = sincronizar(sincronizador, "Sem mudanças")
+            respostas_304 = transporte.metricas.resumo()['por_status'].get('304', 0)
+
+            escrever_pagina(pasta_paginas, 0, versao=1)
+            tons[1] = 'Eb'
+            escrever_setlist(caminho_setlist, tons)
+            terceira = sincronizar(sincronizador, "Uma cifra e um tom alterados")
+
+            with open(caminho_setlist, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(f"{ARTISTA_FIXTURES}/musica-2 {tons[2]}\n")
+            sincronizador.forcar = True
+            repetida = sincronizar(sincronizador, "Música repetida no setlist, regeneração forçada")
+            sincronizador.forcar = False
+
+        if len(primeira['geradas']) != TOTAL_MUSICAS:
+            falhas.append(f"primeira sincronização gerou {len(primeira['geradas'])} de {TOTAL_MUSICAS} PDFs")
+        if segunda['geradas'] or len(segunda['puladas']) != TOTAL_MUSICAS:
+            falhas.append(f"sincronização sem mudanças gerou {len(segunda['geradas'])} PDFs")
+        if respostas_304 < TOTAL_MUSICAS:
+            falhas.append(f"só {respostas_304} de {TOTAL_MUSICAS} páginas revalidadas com 304")
+        motivos = sorted(motivo for _, _, motivo, _ in terceira['geradas'])
+        if motivos != sorted([MOTIVO_CIFRA, MOTIVO_TOM]):
+            falhas.append(f"esperava regenerar uma cifra alterada e um tom alterado, regenerou: {motivos}")
+        if len(terceira['removidas']) != 1 or os.path.exists(os.path.join('pdf', terceira['removidas'][0])):
+            falhas.append("PDF do tom antigo não foi removido")
+        if repetida['erros'] or len(repetida['geradas']) != TOTAL_MUSICAS + 1:
+            falhas.append(f"setlist com música repetida gerou {len(repetida['geradas'])} de {TOTAL_MUSICAS + 1} entradas")
+        if len(sincronizador.estado()) != TOTAL_MUSICAS + 1:
+            falhas.append("a entrada repetida não foi registrada no estado")
+        if set(os.listdir('pdf')) - {'.manifesto.json'} != {entrada['pdf'] for entrada in sincronizador.estado().values()}:
+            falhas.append("pasta pdf/ não corresponde ao setlist")
+    finally:
+        os.chdir(diretorio_original)
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    aceleracao = primeira['tempo'] / segunda['tempo']
+    print(f"\nTodas as músicas:       {primeira['tempo'] * 1000:.0f} ms")
+    print(f"Sem mudanças:           {segunda['tempo'] * 1000:.0f} ms ({aceleracao:.1f}x mais rápido, mínimo {ACELERACAO_MINIMA:.0f}x)")
+    print(f"Duas mudanças:          {terceira['tempo'] * 1000:.0f} ms")
+    if aceleracao < ACELERACAO_MINIMA:
+        falhas.append(f"sincronização sem mudanças só {aceleracao:.1f}x mais rápida")
+
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print("\n✅ Só os PDFs afetados foram gerados de novo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cifra_acordes import transpor_texto
+from cifra_documento import analisar_cifra
+from cifra_tonalidade import detectar_tom, recomendar_transposicoes, tonalidade_declarada
+from gerar_fixtures import PALAVRAS, SECOES
+
+
+TOTAL_MUSICAS = 2000
+ACERTO_MINIMO = 0.85
+LIMITE_MS_POR_MUSICA = 1.0
+
+PROGRESSOES_MAIORES = [
+    ['C', 'G', 'Am', 'F'],
+    ['C', 'Am', 'F', 'G'],
+    ['C', 'F', 'G', 'C'],
+    ['C', 'Em', 'F', 'G7'],
+    ['F', 'G', 'C', 'Am'],
+    ['C7M', 'Dm7', 'Em7', 'F7M(9)'],
+    ['C', 'G/B', 'Am7', 'F', 'Dm7', 'G4', 'G'],
+    ['C', 'C7', 'F', 'Fm', 'C', 'G7'],
+]
+PROGRESSOES_MENORES = [
+    ['Am', 'F', 'C', 'G'],
+    ['Am', 'Dm', 'E7', 'Am'],
+    ['Am', 'G', 'F', 'E'],
+    ['Am7', 'Dm7', 'G7', 'C7M', 'F7M', 'Bm7(b5)', 'E7'],
+    ['Am', 'Am/G', 'F', 'E7'],
+    ['Am', 'C', 'D', 'F', 'E'],
+]
+
+
+def gerar_musica(rng: random.Random, menor: bool) -> tuple:
+    progressoes = PROGRESSOES_MENORES if menor else PROGRESSOES_MAIORES
+    linhas = []
+    for indice in range(rng.randint(2, 5)):
+        progressao = rng.choice(progressoes)
+        linhas.append(f"[{SECOES[indice % len(SECOES)]}]")
+        for _ in range(rng.randint(2, 4)):
+            linhas.append(''.join(acorde + ' ' * rng.randint(2, 6) for acorde in progressao).rstrip())
+            linhas.append(' '.join(rng.choice(PALAVRAS) for _ in range(rng.randint(4, 9))).capitalize())
+        linhas.append('')
+    linhas.append('Am' if menor else 'C')
+
+    semitons = rng.randrange(12)
+    tom = tonalidade_declarada('Am' if menor else 'C')
+    return transpor_texto('\n'.join(linhas), semitons), (tom.tonica + semitons) % 12, menor
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_MUSICAS
+    rng = random.Random(17)
+    musicas = [gerar_musica(rng, rng.random() < 0.4) for _ in range(total)]
+    documentos = [(analisar_cifra(texto), tonica, menor) for texto, tonica, menor in musicas]
+
+    inicio = time.perf_counter()
+    resultados = [(detectar_tom(documento), tonica, menor) for documento, tonica, menor in documentos]
+    deteccao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for documento, _, _ in documentos:
+        recomendar_transposicoes(documento, extensao=(45, 64))
+    recomendacao = time.perf_counter() - inicio
+
+    acertos = sum(1 for tonalidade, tonica, menor in resultados
+                  if tonalidade and (tonalidade.tonica, tonalidade.menor) == (tonica, menor))
+    relativos = sum(1 for tonalidade, tonica, menor in resultados
+                    if tonalidade and tonalidade.menor != menor
+                    and tonalidade.tonica == (tonica + (3 if menor else -3)) % 12)
+    acerto = acertos / total
+    ms_por_musica = deteccao / total * 1000
+
+    print(f"Músicas:                {total}")
+    print(f"Acerto:                 {acerto:.1%} (mínimo {ACERTO_MINIMO:.0%}); "
+          f"{relativos} confundidas com o relativo maior/menor")
+    print(f"Detecção:               {ms_por_musica:.3f} ms/música ({total / deteccao:,.0f} músicas/s)")
+    print(f"Recomendação (com voz): {recomendacao / total * 1000:.3f} ms/música")
+
+    falhas = []
+    if acerto < ACERTO_MINIMO:
+        falhas.append(f"acerto de {acerto:.1%}")
+    if ms_por_musica > LIMITE_MS_POR_MUSICA:
+        falhas.append(f"detecção levou {ms_por_musica:.3f} ms por música")
+
+    if falhas:
+        print()
+        for falha in falhas:
+            print(f"❌ {falha}")
+        sys.exit(1)
+
+    print("\n✅ Detecção de tom dentro dos limites")
+
+
+if __name__ == "__main__":
+    main()
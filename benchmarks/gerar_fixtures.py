@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import html
+
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+PROGRESSOES = [
+    ['G', 'D', 'Em', 'C'],
+    ['Dm7', 'Bb9', 'F', 'C/E'],
+    ['A', 'E/G#', 'F#m7', 'D7M'],
+    ['C', 'G/B', 'Am7', 'F7M(9)'],
+    ['Eb', 'Bb/D', 'Cm', 'Ab'],
+    ['E', 'B', 'C#m', 'A'],
+]
+PALAVRAS = ('amor luz caminho tempo noite sol mar vento coração estrada '
+            'saudade sonho céu chão voz canção manhã fogo rio lua').split()
+SECOES = ['Intro', 'Primeira Parte', 'Pré-Refrão', 'Refrão', 'Segunda Parte', 'Ponte', 'Solo', 'Final']
+
+
+def _verso(rng: random.Random) -> str:
+    return ' '.join(rng.choice(PALAVRAS) for _ in range(rng.randint(4, 9))).capitalize()
+
+
+def _linha_acordes(rng: random.Random, progressao: list) -> str:
+    partes = []
+    for acorde in progressao:
+        partes.append(f"<b>{acorde}</b>" + ' ' * rng.randint(2, 10))
+    return ''.join(partes).rstrip()
+
+
+def _tablatura(rng: random.Random) -> list:
+    linhas = []
+    for corda in 'eBGDAE':
+        compassos = []
+        for _ in range(4):
+            compassos.append(''.join(rng.choice(['-', '-', '-', str(rng.randint(0, 12))]) for _ in range(12)))
+        linhas.append(f"{corda}|" + '|'.join(compassos) + '|')
+    return linhas
+
+
+def gerar_cifra(rng: random.Random, partes: int, tabs: int = 0) -> str:
+    linhas = []
+    for indice in range(partes):
+        progressao = rng.choice(PROGRESSOES)
+        linhas.append(f"[{SECOES[indice % len(SECOES)]}]")
+        linhas.append('')
+        for _ in range(rng.randint(3, 6)):
+            linhas.append(_linha_acordes(rng, progressao))
+            linhas.append(html.escape(_verso(rng)))
+        if tabs and indice % max(1, partes // tabs) == 0:
+            linhas.append('')
+            linhas.append('[Tab - Riff]')
+            linhas.append('')
+            linhas.extend(_tablatura(rng))
+        linhas.append('')
+    return '\n'.join(linhas)
+
+
+def gerar_texto_cifra(rng: random.Random, partes: int, tabs: int = 0) -> str:
+    return html.unescape(gerar_cifra(rng, partes, tabs).replace('<b>', '').replace('</b>', ''))
+
+
+def _ruido(rng: random.Random, blocos: int) -> str:
+    partes = []
+    for indice in range(blocos):
+        dados = ','.join(f'"k{indice}_{i}":"{rng.random():.8f}"' for i in range(40))
+        partes.append(f'<script>window.__dados{indice} = {{{dados}}}; if (a < b) {{ c(); }}</script>')
+        itens = ''.join(f'<li class="item"><a href="/artista-{indice}-{i}/">Artista {i}</a></li>' for i in range(25))
+        partes.append(f'<nav class="menu"><ul>{itens}</ul></nav><!-- bloco {indice} -->')
+    return '\n'.join(partes)
+
+
+def gerar_pagina(rng: random.Random, musica: str, artista: str, tom: str, cifra: str, blocos_ruido: int) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>{musica} - {artista} - Cifra Club</title>
+{_ruido(rng, blocos_ruido // 2)}
+</head>
+<body>
+<div class="g-1 g-fix cifra">
+<h1 class="t1">{musica}</h1>
+<h2 class="t3"><a href="/{artista.lower()}/">{artista}</a></h2>
+<div class="cifra_cnt"><span id="cifra_tom">tom: <a class="js-modal-trigger" href="#" title="alterar o tom da cifra">{tom}</a></span></div>
+<pre>{cifra}</pre>
+</div>
+<div class="player"><a href="https://www.youtube.com/watch?v=RB-RcX5DS5A" class="video">Ver vídeo</a></div>
+{_ruido(rng, blocos_ruido - blocos_ruido // 2)}
+</body>
+</html>
+"""
+
+
+FIXTURES = [
+    ('pagina_curta.html', 'Canção Curta', 'Banda Teste', 'G', 4, 0, 20),
+    ('pagina_longa.html', 'Medley Completo', 'Orquestra Teste', 'Dm', 60, 0, 40),
+    ('pagina_tablatura.html', 'Riff Pesado', 'Guitarras Teste', 'E', 24, 12, 30),
+]
+
+
+def gerar_fixtures(pasta: str = PASTA_FIXTURES) -> list:
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for nome, musica, artista, tom, partes, tabs, ruido in FIXTURES:
+        rng = random.Random(nome)
+        cifra = gerar_cifra(rng, partes, tabs)
+        pagina = gerar_pagina(rng, musica, artista, tom, cifra, ruido)
+        caminho = os.path.join(pasta, nome)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(pagina)
+        caminhos.append(caminho)
+    return caminhos
+
+
+if __name__ == "__main__":
+    for caminho in gerar_fixtures():
+        print(f"✅ {caminho} ({os.path.getsize(caminho) // 1024} KB)")
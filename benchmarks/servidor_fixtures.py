@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gerar_fixtures import PASTA_FIXTURES
+
+
+ARTISTA_FIXTURES = 'fixtures'
+TAMANHO_BLOCO = 64 * 1024
+
+
+class _TratadorFixtures(BaseHTTPRequestHandler):
+    pasta = PASTA_FIXTURES
+
+    def do_GET(self):
+        partes = [parte for parte in self.path.split('?')[0].split('/') if parte]
+        if len(partes) != 2 or partes[0] != ARTISTA_FIXTURES:
+            self.send_error(404)
+            return
+
+        caminho = os.path.join(self.pasta, os.path.basename(partes[1]) + '.html')
+        try:
+            arquivo = open(caminho, 'rb')
+        except OSError:
+            self.send_error(404)
+            return
+
+        with arquivo:
+            informacoes = os.fstat(arquivo.fileno())
+            etag = f'"{informacoes.st_size:x}-{informacoes.st_mtime_ns:x}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(informacoes.st_size))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            try:
+                shutil.copyfileobj(arquivo, self.wfile, TAMANHO_BLOCO)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    def log_message(self, formato, *argumentos):
+        pass
+
+
+class ServidorFixtures:
+
+    def __init__(self, pasta: str = PASTA_FIXTURES, porta: int = 0):
+        tratador = type('TratadorFixtures', (_TratadorFixtures,), {'pasta': pasta})
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', porta), tratador)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._servidor.server_address[1]}/"
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def executar(self):
+        try:
+            self._servidor.serve_forever()
+        finally:
+            self._servidor.server_close()
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *excecao):
+        self.parar()
+
+
+if __name__ == "__main__":
+    porta = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    servidor = ServidorFixtures(porta=porta)
+    print(f"🎸 Servindo {PASTA_FIXTURES} em {servidor.base_url}{ARTISTA_FIXTURES}/<pagina>")
+    try:
+        servidor.executar()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+
+NOTAS = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+NOTAS_FLAT = ['C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B']
+NOTAS_NEUTRAS = ['C', 'C#', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B']
+
+TONS_MAIORES = ('C', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B')
+TONS_MENORES = ('Cm', 'C#m', 'Dm', 'Ebm', 'Em', 'Fm', 'F#m', 'Gm', 'G#m', 'Am', 'Bbm', 'Bm')
+TONS_SUSTENIDOS = frozenset(('G', 'D', 'A', 'E', 'B', 'F#', 'Em', 'Bm', 'F#m', 'C#m', 'G#m'))
+TONS_NEUTROS = frozenset(('C', 'Am'))
+
+GRAFIA_SUSTENIDOS = 0
+GRAFIA_BEMOIS = 1
+GRAFIA_NEUTRA = 2
+NOTAS_POR_GRAFIA = (NOTAS, NOTAS_FLAT, NOTAS_NEUTRAS)
+
+CLASSES_DE_ALTURA = {nota: indice for indice, nota in enumerate(NOTAS)}
+CLASSES_DE_ALTURA.update({nota: indice for indice, nota in enumerate(NOTAS_FLAT)})
+CLASSES_DE_ALTURA.update({'Cb': 11, 'Fb': 4, 'B#': 0, 'E#': 5})
+
+TABELAS_TRANSPOSICAO = []
+for _semitons in range(12):
+    _tabela = {}
+    for _nota, _classe in CLASSES_DE_ALTURA.items():
+        _nova_classe = (_classe + _semitons) % 12
+        _tabela[_nota] = NOTAS_FLAT[_nova_classe] if _nota.endswith('b') else NOTAS[_nova_classe]
+    TABELAS_TRANSPOSICAO.append(_tabela)
+
+TABELAS_GRAFIA = [
+    [{_nota: _notas[(_classe + _semitons) % 12] for _nota, _classe in CLASSES_DE_ALTURA.items()} for _semitons in range(12)]
+    for _notas in NOTAS_POR_GRAFIA
+]
+
+GRAFIAS_DOS_TONS = {}
+for _tonica in range(12):
+    for _menor, _nome in ((False, TONS_MAIORES[_tonica]), (True, TONS_MENORES[_tonica])):
+        if _nome in TONS_NEUTROS:
+            GRAFIAS_DOS_TONS[(_tonica, _menor)] = GRAFIA_NEUTRA
+        elif _nome in TONS_SUSTENIDOS:
+            GRAFIAS_DOS_TONS[(_tonica, _menor)] = GRAFIA_SUSTENIDOS
+        else:
+            GRAFIAS_DOS_TONS[(_tonica, _menor)] = GRAFIA_BEMOIS
+
+PADRAO_ACORDE = re.compile(r'([A-G])([#b]?)([^\s/)]*)(?:/([A-G])([#b]?))?')
+PADRAO_NOTA = re.compile(r'^([A-Ga-g])([#bB]?)')
+PADRAO_TOM = re.compile(r'^\s*([A-Ga-g])([#b]?)(m(?!aj))?')
+PADRAO_INICIO_ACORDE = re.compile(r'^\s+[A-G][#b]?')
+PADRAO_CANDIDATO_ACORDE = re.compile(r'\b[A-G][#b]?[m]?[0-9]?[^\s]{0,5}\b')
+
+TAMANHO_CACHE = 8192
+
+Acorde = namedtuple('Acorde', 'raiz acidente qualidade baixo')
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def e_linha_de_acordes(linha: str) -> bool:
+    linha_limpa = linha.strip()
+
+    if not linha_limpa or linha_limpa.startswith('[') or len(linha_limpa) < 2:
+        return False
+
+    if linha.startswith('    ') and not PADRAO_INICIO_ACORDE.match(linha):
+        return False
+
+    if linha_limpa.startswith('(') and linha_limpa.endswith(')'):
+        return True
+
+    if '  ' in linha or '\t' in linha:
+        palavras = linha_limpa.split()
+        if len(palavras) <= 8:
+            acordes = PADRAO_CANDIDATO_ACORDE.findall(linha)
+            if len(acordes) >= max(2, len(palavras) * 0.6):
+                return True
+
+    return False
+
+
+def classe_de_altura(nota: str):
+    match = PADRAO_NOTA.match(nota.strip())
+    if not match:
+        return None
+    acidente = match.group(2).lower()
+    return CLASSES_DE_ALTURA.get(match.group(1).upper() + acidente)
+
+
+def tabela_transposicao(semitons: int, grafia: int = None) -> dict:
+    if grafia is None:
+        return TABELAS_TRANSPOSICAO[semitons % 12]
+    return TABELAS_GRAFIA[grafia][semitons % 12]
+
+
+def interpretar_tom(tom: str):
+    match = PADRAO_TOM.match(tom) if tom else None
+    if not match:
+        return None
+    tonica = CLASSES_DE_ALTURA.get(match.group(1).upper() + match.group(2))
+    if tonica is None:
+        return None
+    return tonica, bool(match.group(3))
+
+
+def nome_do_tom(tonica: int, menor: bool) -> str:
+    return (TONS_MENORES if menor else TONS_MAIORES)[tonica % 12]
+
+
+def grafia_para(tom: str, semitons: int = 0):
+    tonalidade = interpretar_tom(tom)
+    if tonalidade is None:
+        return None
+    return GRAFIAS_DOS_TONS[((tonalidade[0] + semitons) % 12, tonalidade[1])]
+
+
+def transpor_nota(nota: str, semitons: int, grafia: int = None) -> str:
+    match = PADRAO_NOTA.match(nota)
+    if not match:
+        return nota
+    chave = match.group(1).upper() + match.group(2).lower()
+    transposta = tabela_transposicao(semitons, grafia).get(chave)
+    if transposta is None:
+        return nota
+    return transposta + nota[match.end():]
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def tokenizar_acorde(texto: str):
+    match = PADRAO_ACORDE.fullmatch(texto)
+    if not match:
+        return None
+    baixo = match.group(4) + match.group(5) if match.group(4) else None
+    return Acorde(match.group(1), match.group(2), match.group(3), baixo)
+
+
+def renderizar_acorde(acorde: Acorde, semitons: int = 0, grafia: int = None) -> str:
+    tabela = tabela_transposicao(semitons, grafia)
+    texto = tabela[acorde.raiz + acorde.acidente] + acorde.qualidade
+    if acorde.baixo:
+        texto += '/' + tabela[acorde.baixo]
+    return texto
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def tokenizar_linha(linha: str) -> tuple:
+    partes = []
+    inicio = 0
+    for match in PADRAO_ACORDE.finditer(linha):
+        if match.start() > inicio:
+            partes.append(linha[inicio:match.start()])
+        baixo = match.group(4) + match.group(5) if match.group(4) else None
+        partes.append(Acorde(match.group(1), match.group(2), match.group(3), baixo))
+        inicio = match.end()
+    if inicio < len(linha):
+        partes.append(linha[inicio:])
+    return tuple(partes)
+
+
+def renderizar_linha(partes: tuple, semitons: int = 0, grafia: int = None) -> str:
+    tabela = tabela_transposicao(semitons, grafia)
+    saida = []
+    for parte in partes:
+        if parte.__class__ is str:
+            saida.append(parte)
+        else:
+            saida.append(tabela[parte.raiz + parte.acidente])
+            saida.append(parte.qualidade)
+            if parte.baixo:
+                saida.append('/')
+                saida.append(tabela[parte.baixo])
+    return ''.join(saida)
+
+
+def transpor_linha(linha: str, semitons: int, grafia: int = None) -> str:
+    return renderizar_linha(tokenizar_linha(linha), semitons, grafia)
+
+
+def iterar_linhas(fonte):
+    if isinstance(fonte, str):
+        inicio = 0
+        while True:
+            fim = fonte.find('\n', inicio)
+            if fim < 0:
+                yield fonte[inicio:]
+                return
+            yield fonte[inicio:fim]
+            inicio = fim + 1
+
+    resto = ''
+    for bloco in fonte:
+        partes = (resto + bloco).split('\n')
+        resto = partes.pop()
+        yield from partes
+    yield resto
+
+
+def transpor_linhas(linhas, semitons: int, grafia: int = None):
+    if semitons % 12 == 0:
+        yield from linhas
+        return
+
+    for linha in linhas:
+        if e_linha_de_acordes(linha):
+            yield renderizar_linha(tokenizar_linha(linha), semitons, grafia)
+        else:
+            yield linha
+
+
+def transpor_texto(texto: str, semitons: int, grafia: int = None) -> str:
+    if semitons % 12 == 0:
+        return texto
+    return '\n'.join(transpor_linhas(iterar_linhas(texto), semitons, grafia))
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def qualidade_basica(qualidade: str) -> str:
+    if qualidade.startswith(('dim', 'º', '°', 'o')) or (qualidade.startswith('m') and 'b5' in qualidade):
+        return 'd'
+    if qualidade.startswith('m') and not qualidade.startswith('maj'):
+        return 'm'
+    return 'M'
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import zlib
+import sqlite3
+import threading
+from collections import Counter
+
+from cifra_cache import CacheCifras
+from cifra_documento import analisar_cifra, codigos_de_tipo, montar_documento
+
+
+VERSAO_BIBLIOTECA = 1
+NIVEL_COMPRESSAO = 6
+TAMANHO_LOTE = 500
+ACOES_BIBLIOTECA = ('exportar', 'importar', 'info')
+
+CAMPOS_MUSICA = ('artista', 'musica', 'url', 'tom_original', 'youtube_url')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS metadados (
+    nome TEXT PRIMARY KEY,
+    valor TEXT
+);
+CREATE TABLE IF NOT EXISTS musicas (
+    id INTEGER PRIMARY KEY,
+    chave TEXT NOT NULL UNIQUE,
+    artista TEXT,
+    musica TEXT,
+    url TEXT,
+    tom_original TEXT,
+    youtube_url TEXT,
+    linhas INTEGER NOT NULL,
+    tipos TEXT NOT NULL,
+    cifra BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS acordes (
+    id INTEGER PRIMARY KEY,
+    simbolo TEXT NOT NULL UNIQUE,
+    raiz TEXT NOT NULL,
+    acidente TEXT NOT NULL,
+    qualidade TEXT NOT NULL,
+    baixo TEXT
+);
+CREATE TABLE IF NOT EXISTS musica_acordes (
+    musica_id INTEGER NOT NULL,
+    acorde_id INTEGER NOT NULL,
+    ocorrencias INTEGER NOT NULL,
+    PRIMARY KEY (musica_id, acorde_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS musica_acordes_acorde ON musica_acordes (acorde_id);
+"""
+
+
+class ErroBiblioteca(Exception):
+    pass
+
+
+def simbolo_acorde(acorde) -> str:
+    simbolo = acorde.raiz + acorde.acidente + acorde.qualidade
+    return f"{simbolo}/{acorde.baixo}" if acorde.baixo else simbolo
+
+
+class BibliotecaCifras:
+
+    def __init__(self, caminho: str, somente_leitura: bool = False):
+        self.caminho = caminho
+        if somente_leitura:
+            if not os.path.exists(caminho):
+                raise ErroBiblioteca(f"Biblioteca não encontrada: {caminho}")
+            self._conexao = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            pasta = os.path.dirname(caminho)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+            self._conexao.executescript(ESQUEMA)
+            with self._conexao:
+                self._conexao.execute('INSERT OR IGNORE INTO metadados (nome, valor) VALUES (?, ?)',
+                                      ('versao', str(VERSAO_BIBLIOTECA)))
+        self._lock = threading.Lock()
+        self._verificar_versao()
+
+    def _verificar_versao(self):
+        try:
+            linha = self._conexao.execute("SELECT valor FROM metadados WHERE nome = 'versao'").fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ErroBiblioteca(f"Arquivo não é uma biblioteca de cifras: {self.caminho} ({e})")
+        if linha is None or int(linha[0]) > VERSAO_BIBLIOTECA:
+            raise ErroBiblioteca(f"Versão de biblioteca não suportada em {self.caminho}")
+
+    def fechar(self):
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self):
+        with self._lock:
+            return self._conexao.execute('SELECT COUNT(*) FROM musicas').fetchone()[0]
+
+    def __contains__(self, chave: str):
+        with self._lock:
+            return self._conexao.execute('SELECT 1 FROM musicas WHERE chave = ?', (chave,)).fetchone() is not None
+
+    def _ids_acordes(self, acordes: Counter, ids: dict) -> list:
+        linhas = []
+        for acorde, ocorrencias in acordes.items():
+            simbolo = simbolo_acorde(acorde)
+            if simbolo not in ids:
+                cursor = self._conexao.execute(
+                    'INSERT INTO acordes (simbolo, raiz, acidente, qualidade, baixo) VALUES (?, ?, ?, ?, ?)',
+                    (simbolo, acorde.raiz, acorde.acidente, acorde.qualidade, acorde.baixo)
+                )
+                ids[simbolo] = cursor.lastrowid
+            linhas.append((ids[simbolo], ocorrencias))
+        return linhas
+
+    def exportar(self, itens) -> int:
+        total = 0
+        with self._lock, self._conexao:
+            ids = dict(self._conexao.execute('SELECT simbolo, id FROM acordes'))
+            for chave, dados in itens:
+                cifra = dados.get('cifra') or ''
+                documento = dados.get('documento')
+                if documento is None or documento.texto is not cifra:
+                    documento = analisar_cifra(cifra)
+
+                existente = self._conexao.execute('SELECT id FROM musicas WHERE chave = ?', (chave,)).fetchone()
+                if existente:
+                    self._conexao.execute('DELETE FROM musica_acordes WHERE musica_id = ?', (existente[0],))
+                    self._conexao.execute('DELETE FROM musicas WHERE id = ?', (existente[0],))
+
+                cursor = self._conexao.execute(
+                    'INSERT INTO musicas (chave, artista, musica, url, tom_original, youtube_url, linhas, tipos, cifra) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (chave, *(None if campo == 'tom_original' and dados.get('tom_detectado') else dados.get(campo)
+                              for campo in CAMPOS_MUSICA), len(documento),
+                     codigos_de_tipo(documento), zlib.compress(cifra.encode('utf-8'), NIVEL_COMPRESSAO))
+                )
+                acordes = self._ids_acordes(Counter(documento.acordes()), ids)
+                self._conexao.executemany(
+                    'INSERT INTO musica_acordes (musica_id, acorde_id, ocorrencias) VALUES (?, ?, ?)',
+                    [(cursor.lastrowid, acorde_id, ocorrencias) for acorde_id, ocorrencias in acordes]
+                )
+                total += 1
+        return total
+
+    def exportar_cache(self, cache: CacheCifras) -> int:
+        return self.exportar((entrada['chave'], entrada['dados']) for entrada in cache.entradas()
+                             if 'erro' not in entrada['dados'])
+
+    def catalogo(self) -> list:
+        with self._lock:
+            cursor = self._conexao.execute(
+                'SELECT chave, artista, musica, url, tom_original, youtube_url, linhas FROM musicas ORDER BY chave'
+            )
+            return [{'chave': chave, 'artista': artista, 'musica': musica, 'url': url, 'tom_original': tom,
+                     'youtube_url': youtube, 'linhas': linhas}
+                    for chave, artista, musica, url, tom, youtube, linhas in cursor]
+
+    def _dados(self, linha) -> dict:
+        chave, artista, musica, url, tom, youtube, tipos, cifra = linha
+        texto = zlib.decompress(cifra).decode('utf-8')
+        return {
+            'url': url,
+            'artista': artista,
+            'musica': musica,
+            'tom_original': tom,
+            'cifra': texto,
+            'youtube_url': youtube,
+            'documento': montar_documento(texto, tipos),
+        }
+
+    def obter(self, chave: str):
+        with self._lock:
+            linha = self._conexao.execute(
+                'SELECT chave, artista, musica, url, tom_original, youtube_url, tipos, cifra FROM musicas WHERE chave = ?',
+                (chave,)
+            ).fetchone()
+        return self._dados(linha) if linha else None
+
+    def musicas(self):
+        cursor = self._conexao.cursor()
+        with self._lock:
+            cursor.execute('SELECT chave, artista, musica, url, tom_original, youtube_url, tipos, cifra FROM musicas ORDER BY id')
+        while True:
+            with self._lock:
+                linhas = cursor.fetchmany(TAMANHO_LOTE)
+            if not linhas:
+                return
+            for linha in linhas:
+                yield linha[0], self._dados(linha)
+
+    def com_acorde(self, simbolo: str) -> list:
+        with self._lock:
+            return [chave for chave, in self._conexao.execute(
+                'SELECT m.chave FROM musica_acordes ma JOIN acordes a ON a.id = ma.acorde_id '
+                'JOIN musicas m ON m.id = ma.musica_id WHERE a.simbolo = ? ORDER BY ma.ocorrencias DESC',
+                (simbolo,)
+            )]
+
+    def importar_para_cache(self, cache: CacheCifras, indice=None) -> int:
+        total = 0
+        for chave, dados in self.musicas():
+            if total >= cache.max_entradas:
+                break
+            cache.salvar(chave, dados, evictar=False)
+            if indice is not None:
+                indice.indexar(chave, dados, dados['documento'])
+            total += 1
+        cache.evictar()
+        return total
+
+
+def main_biblioteca(argumentos: list):
+    opcoes = [argumento.lower() for argumento in argumentos]
+    posicao = opcoes.index('--biblioteca') if '--biblioteca' in opcoes else -1
+    restantes = argumentos[posicao + 1:]
+
+    if len(restantes) < 2 or restantes[0].lower() not in ACOES_BIBLIOTECA:
+        print("Uso: python cifra_standalone.py --biblioteca exportar|importar|info <arquivo.cifras>")
+        sys.exit(1)
+
+    acao, caminho = restantes[0].lower(), restantes[1]
+    inicio = time.perf_counter()
+
+    try:
+        if acao == 'exportar':
+            with BibliotecaCifras(caminho) as biblioteca:
+                total = biblioteca.exportar_cache(CacheCifras())
+            print(f"\n✅ {total} cifras exportadas para {caminho} "
+                  f"({os.path.getsize(caminho) / 1024:.0f} KB) em {time.perf_counter() - inicio:.2f}s\n")
+
+        elif acao == 'importar':
+            from cifra_indice import IndiceCifras
+            cache = CacheCifras()
+            indice = IndiceCifras.do_cache(cache)
+            try:
+                with BibliotecaCifras(caminho, somente_leitura=True) as biblioteca:
+                    total = biblioteca.importar_para_cache(cache, indice)
+                    disponiveis = len(biblioteca)
+            finally:
+                indice.fechar()
+            print(f"\n✅ {total} cifras importadas de {caminho} em {time.perf_counter() - inicio:.2f}s\n")
+            if total < disponiveis:
+                print(f"⚠️  O cache guarda no máximo {cache.max_entradas} cifras: {disponiveis - total} de {disponiveis} "
+                      f"não foram importadas. Use --biblioteca {caminho} para consultar a biblioteca inteira sem importar\n")
+
+        else:
+            with BibliotecaCifras(caminho, somente_leitura=True) as biblioteca:
+                catalogo = biblioteca.catalogo()
+            print(f"\n📚 {caminho}: {len(catalogo)} cifras, {os.path.getsize(caminho) / 1024:.0f} KB "
+                  f"(lida em {(time.perf_counter() - inicio) * 1000:.0f} ms)\n")
+            for musica in catalogo[:20]:
+                tom = f" (Tom: {musica['tom_original']})" if musica['tom_original'] else ''
+                print(f"🎵 {musica['musica']} - {musica['artista']}{tom}  [{musica['chave']}]")
+            if len(catalogo) > 20:
+                print(f"   ... e mais {len(catalogo) - 20}")
+            print()
+
+    except ErroBiblioteca as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_biblioteca(['--biblioteca'] + sys.argv[1:])
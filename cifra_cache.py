@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+
+DIRETORIO_CACHE_PADRAO = os.path.join(os.path.expanduser('~'), '.cache', 'cifraclub')
+TTL_PADRAO = 7 * 24 * 3600
+MAX_ENTRADAS_PADRAO = 2000
+
+CAMPOS_CACHE = ('url', 'artista', 'musica', 'tom_original', 'tom_detectado', 'cifra', 'youtube_url')
+
+
+class CacheCifras:
+
+    def __init__(self, diretorio: str = DIRETORIO_CACHE_PADRAO, ttl: int = TTL_PADRAO,
+                 max_entradas: int = MAX_ENTRADAS_PADRAO):
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    @staticmethod
+    def chave(artista: str, musica: str) -> str:
+        return f"{artista.strip('/')}/{musica.strip('/')}".lower()
+
+    def _caminho(self, chave: str) -> str:
+        nome = hashlib.sha1(chave.encode('utf-8')).hexdigest()
+        return os.path.join(self.diretorio, f"{nome}.json")
+
+    def _ler(self, caminho: str):
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+
+    def obter(self, chave: str):
+        caminho = self._caminho(chave)
+        entrada = self._ler(caminho)
+        if entrada is None or entrada.get('chave') != chave:
+            return None
+
+        try:
+            os.utime(caminho, None)
+        except OSError:
+            pass
+
+        return entrada
+
+    def expirado(self, entrada: dict) -> bool:
+        return time.time() - entrada.get('salvo_em', 0) > self.ttl
+
+    def cabecalhos_revalidacao(self, entrada: dict) -> dict:
+        cabecalhos = {}
+        if entrada.get('etag'):
+            cabecalhos['If-None-Match'] = entrada['etag']
+        if entrada.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = entrada['last_modified']
+        return cabecalhos
+
+    def salvar(self, chave: str, dados: dict, etag: str = None, last_modified: str = None, evictar: bool = True):
+        entrada = {
+            'chave': chave,
+            'salvo_em': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'dados': {campo: dados.get(campo) for campo in CAMPOS_CACHE}
+        }
+        self._gravar(chave, entrada)
+        if evictar:
+            self.evictar()
+
+    def renovar(self, chave: str, entrada: dict, etag: str = None, last_modified: str = None):
+        entrada['salvo_em'] = time.time()
+        if etag:
+            entrada['etag'] = etag
+        if last_modified:
+            entrada['last_modified'] = last_modified
+        self._gravar(chave, entrada)
+
+    def remover(self, chave: str):
+        try:
+            os.remove(self._caminho(chave))
+        except FileNotFoundError:
+            pass
+
+    def limpar(self):
+        for caminho in self._arquivos():
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+    def entradas(self):
+        for caminho in self._arquivos():
+            entrada = self._ler(caminho)
+            if entrada and 'chave' in entrada:
+                yield entrada
+
+    def __len__(self):
+        return len(self._arquivos())
+
+    def _arquivos(self) -> list:
+        try:
+            nomes = os.listdir(self.diretorio)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.diretorio, nome) for nome in nomes if nome.endswith('.json')]
+
+    def _gravar(self, chave: str, entrada: dict):
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(entrada, arquivo, ensure_ascii=False)
+            os.replace(temporario, self._caminho(chave))
+        except BaseException:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            raise
+
+    def evictar(self):
+        with self._lock:
+            arquivos = self._arquivos()
+            excesso = len(arquivos) - self.max_entradas
+            if excesso <= 0:
+                return
+
+            acessos = []
+            for caminho in arquivos:
+                try:
+                    acessos.append((os.path.getmtime(caminho), caminho))
+                except OSError:
+                    pass
+
+            for _, caminho in sorted(acessos)[:excesso]:
+                try:
+                    os.remove(caminho)
+                except FileNotFoundError:
+                    pass
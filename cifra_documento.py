@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import re
+import threading
+
+from cifra_acordes import e_linha_de_acordes, grafia_para, iterar_linhas, tokenizar_linha, renderizar_linha
+
+
+TIPO_VAZIA = 'vazia'
+TIPO_SECAO = 'secao'
+TIPO_ACORDES = 'acordes'
+TIPO_TAB = 'tab'
+TIPO_LETRA = 'letra'
+
+CODIGOS_TIPO = {TIPO_VAZIA: 'v', TIPO_SECAO: 's', TIPO_ACORDES: 'a', TIPO_TAB: 't', TIPO_LETRA: 'l'}
+TIPOS_POR_CODIGO = {codigo: tipo for tipo, codigo in CODIGOS_TIPO.items()}
+
+PADRAO_TAB = re.compile(r'^\s*[A-Ga-g][#b]?\s*[|:][-0-9|hpbrx/\\~^().* ]*-{2,}')
+
+
+def classificar_linha(linha: str) -> str:
+    linha_limpa = linha.strip()
+    if not linha_limpa:
+        return TIPO_VAZIA
+    if linha_limpa.startswith('['):
+        return TIPO_SECAO
+    if PADRAO_TAB.match(linha):
+        return TIPO_TAB
+    if e_linha_de_acordes(linha):
+        return TIPO_ACORDES
+    return TIPO_LETRA
+
+
+class LinhaCifra:
+    __slots__ = ('tipo', 'texto', 'partes', 'acordes')
+
+    def __init__(self, tipo: str, texto: str):
+        self.tipo = tipo
+        self.texto = texto
+        self.partes = None
+        self.acordes = ()
+
+        if tipo == TIPO_ACORDES:
+            self.partes = tokenizar_linha(texto)
+            acordes = []
+            posicao = 0
+            for parte in self.partes:
+                if parte.__class__ is str:
+                    posicao += len(parte)
+                else:
+                    acordes.append((posicao, parte))
+                    posicao += len(renderizar_linha((parte,)))
+            self.acordes = tuple(acordes)
+
+    def renderizar(self, semitons: int = 0, grafia: int = None) -> str:
+        if self.partes is None or semitons % 12 == 0:
+            return self.texto
+        return renderizar_linha(self.partes, semitons, grafia)
+
+    def __repr__(self):
+        return f"LinhaCifra({self.tipo!r}, {self.texto!r})"
+
+
+class DocumentoCifra:
+    __slots__ = ('texto', 'linhas')
+
+    def __init__(self, texto: str, linhas: list):
+        self.texto = texto
+        self.linhas = linhas
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def __iter__(self):
+        return iter(self.linhas)
+
+    def acordes(self):
+        for linha in self.linhas:
+            for _, acorde in linha.acordes:
+                yield acorde
+
+    def renderizar_linhas(self, semitons: int = 0, grafia: int = None) -> list:
+        return [linha.renderizar(semitons, grafia) for linha in self.linhas]
+
+    def renderizar(self, semitons: int = 0, grafia: int = None) -> str:
+        if semitons % 12 == 0:
+            return self.texto
+        return '\n'.join(self.renderizar_linhas(semitons, grafia))
+
+
+def iterar_linhas_cifra(fonte):
+    for linha in iterar_linhas(fonte):
+        yield LinhaCifra(classificar_linha(linha), linha)
+
+
+def renderizar_em_fluxo(fonte, semitons: int = 0, grafia: int = None):
+    if semitons % 12 == 0:
+        yield from iterar_linhas(fonte)
+        return
+
+    for linha in iterar_linhas_cifra(fonte):
+        yield linha.renderizar(semitons, grafia)
+
+
+def analisar_cifra(texto: str) -> DocumentoCifra:
+    return DocumentoCifra(texto, list(iterar_linhas_cifra(texto)))
+
+
+def montar_documento(texto: str, codigos: str) -> DocumentoCifra:
+    linhas = [LinhaCifra(TIPOS_POR_CODIGO[codigo], linha) for codigo, linha in zip(codigos, iterar_linhas(texto))]
+    return DocumentoCifra(texto, linhas)
+
+
+def codigos_de_tipo(documento: DocumentoCifra) -> str:
+    return ''.join(CODIGOS_TIPO[linha.tipo] for linha in documento.linhas)
+
+
+class TabelaTransposicoes:
+
+    def __init__(self, documento: DocumentoCifra, tom: str = None):
+        self.documento = documento
+        self.tom = tom
+        self._linhas = [None] * 12
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._calcular_todas, daemon=True)
+            self._thread.start()
+        return self
+
+    def _calcular_todas(self):
+        for indice in range(12):
+            self._calcular(indice)
+
+    def _calcular(self, indice: int):
+        with self._lock:
+            if self._linhas[indice] is None:
+                self._linhas[indice] = self.documento.renderizar_linhas(indice, grafia_para(self.tom, indice))
+
+    def linhas(self, semitons: int) -> list:
+        indice = semitons % 12
+        if self._linhas[indice] is None:
+            self._calcular(indice)
+        return self._linhas[indice]
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+import re
+import codecs
+from html.parser import HTMLParser
+
+
+TAMANHO_BLOCO = 64 * 1024
+
+PADRAO_TOM = re.compile(r'Tom:\s*([A-G][#b]?[m]?)', re.IGNORECASE)
+PADRAO_YOUTUBE = re.compile(rb'youtube\.com/watch\?v=([A-Za-z0-9_-]+)')
+PADRAO_YOUTUBE_CURTO = re.compile(rb'youtu\.be/([A-Za-z0-9_-]+)')
+SOBREPOSICAO_YOUTUBE = 96
+
+MOTORES = ('auto', 'lxml', 'html.parser')
+
+
+_etree = None
+_lxml_disponivel = None
+
+
+class ErroExtracao(Exception):
+    pass
+
+
+def _carregar_lxml():
+    global _etree, _lxml_disponivel
+    if _lxml_disponivel is None:
+        try:
+            from lxml import etree
+            _etree = etree
+            _lxml_disponivel = True
+        except ImportError:
+            _lxml_disponivel = False
+    return _etree
+
+
+def motor_disponivel(motor: str) -> bool:
+    if motor == 'lxml':
+        return _carregar_lxml() is not None
+    return motor in MOTORES
+
+
+def _resolver_motor(motor: str) -> str:
+    if motor == 'auto':
+        return 'lxml' if _carregar_lxml() is not None else 'html.parser'
+    if motor not in MOTORES:
+        raise ErroExtracao(f"Motor de extração desconhecido: {motor}")
+    if not motor_disponivel(motor):
+        raise ErroExtracao(f"Motor de extração indisponível: {motor}")
+    return motor
+
+
+def _tem_classe(valor: str, classe: str) -> bool:
+    return bool(valor) and classe in valor.split()
+
+
+class _BuscadorYoutube:
+
+    def __init__(self):
+        self.video = None
+        self.video_curto = None
+        self._cauda = b''
+
+    @property
+    def completo(self) -> bool:
+        return self.video is not None
+
+    def alimentar(self, bloco: bytes):
+        if self.completo:
+            return
+        texto = self._cauda + bloco
+        if self.video is None:
+            match = PADRAO_YOUTUBE.search(texto)
+            if match and match.end() < len(texto):
+                self.video = match.group(1).decode('ascii')
+        if self.video_curto is None:
+            match = PADRAO_YOUTUBE_CURTO.search(texto)
+            if match and match.end() < len(texto):
+                self.video_curto = match.group(1).decode('ascii')
+        self._cauda = texto[-SOBREPOSICAO_YOUTUBE:]
+
+    def finalizar(self):
+        if self._cauda:
+            cauda, self._cauda = self._cauda, b''
+            self.alimentar(cauda + b' ')
+
+    def url(self):
+        video = self.video or self.video_curto
+        if video:
+            return f"https://www.youtube.com/watch?v={video}"
+        return None
+
+
+class _ExtratorHTMLParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.campos = {}
+        self._capturando = None
+        self._tag_captura = None
+        self._profundidade = 0
+        self._partes = []
+        self._dentro_tom = 0
+
+    @property
+    def completo(self) -> bool:
+        return len(self.campos) == 4
+
+    def _iniciar_captura(self, campo, tag):
+        self._capturando = campo
+        self._tag_captura = tag
+        self._profundidade = 1
+        self._partes = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._capturando:
+            if tag == self._tag_captura:
+                self._profundidade += 1
+            return
+
+        if tag == 'h1' and 'musica' not in self.campos:
+            if _tem_classe(dict(attrs).get('class'), 't1'):
+                self._iniciar_captura('musica', tag)
+        elif tag == 'h2' and 'artista' not in self.campos:
+            if _tem_classe(dict(attrs).get('class'), 't3'):
+                self._iniciar_captura('artista', tag)
+        elif tag == 'span' and 'tom' not in self.campos:
+            if self._dentro_tom:
+                self._dentro_tom += 1
+            elif dict(attrs).get('id') == 'cifra_tom':
+                self._dentro_tom = 1
+        elif tag == 'a' and self._dentro_tom and 'tom' not in self.campos:
+            self._iniciar_captura('tom', tag)
+        elif tag == 'pre' and 'pre' not in self.campos:
+            self._iniciar_captura('pre', tag)
+
+    def handle_endtag(self, tag):
+        if self._capturando:
+            if tag == self._tag_captura:
+                self._profundidade -= 1
+                if self._profundidade == 0:
+                    self._encerrar_captura()
+            return
+
+        if tag == 'span' and self._dentro_tom:
+            self._dentro_tom -= 1
+            if not self._dentro_tom and 'tom' not in self.campos:
+                self.campos['tom'] = None
+
+    def handle_data(self, data):
+        if self._capturando:
+            self._partes.append(data)
+
+    def _encerrar_captura(self):
+        campo = self._capturando
+        self.campos[campo] = ''.join(self._partes)
+        self._capturando = None
+        self._tag_captura = None
+        self._partes = []
+        if campo == 'tom' and not self.campos['tom'].strip():
+            self.campos['tom'] = None
+
+
+def _extrair_html_parser(blocos, codificacao: str, youtube: _BuscadorYoutube) -> dict:
+    decodificador = codecs.getincrementaldecoder(codificacao)(errors='replace')
+    parser = _ExtratorHTMLParser()
+
+    for bloco in blocos:
+        youtube.alimentar(bloco)
+        if not parser.completo:
+            parser.feed(decodificador.decode(bloco))
+        if parser.completo and youtube.completo:
+            break
+    else:
+        youtube.finalizar()
+        parser.feed(decodificador.decode(b'', final=True))
+        parser.close()
+
+    return parser.campos
+
+
+def _texto_lxml(elemento) -> str:
+    return ''.join(elemento.itertext())
+
+
+def _extrair_lxml(blocos, codificacao: str, youtube: _BuscadorYoutube) -> dict:
+    parser = _carregar_lxml().HTMLPullParser(events=('end',), encoding=codificacao)
+    campos = {}
+
+    def processar_eventos():
+        for _, elemento in parser.read_events():
+            tag = elemento.tag
+            if tag == 'h1' and 'musica' not in campos and _tem_classe(elemento.get('class'), 't1'):
+                campos['musica'] = _texto_lxml(elemento)
+            elif tag == 'h2' and 'artista' not in campos and _tem_classe(elemento.get('class'), 't3'):
+                campos['artista'] = _texto_lxml(elemento)
+            elif tag == 'span' and 'tom' not in campos and elemento.get('id') == 'cifra_tom':
+                link = elemento.find('.//a')
+                tom = _texto_lxml(link) if link is not None else ''
+                campos['tom'] = tom if tom.strip() else None
+            elif tag == 'pre' and 'pre' not in campos:
+                campos['pre'] = _texto_lxml(elemento)
+            elif tag in ('script', 'style', 'svg', 'ul', 'nav', 'footer'):
+                elemento.clear()
+
+    for bloco in blocos:
+        youtube.alimentar(bloco)
+        if len(campos) < 4:
+            parser.feed(bloco)
+            processar_eventos()
+        if len(campos) == 4 and youtube.completo:
+            break
+    else:
+        youtube.finalizar()
+        parser.close()
+        processar_eventos()
+
+    return campos
+
+
+def _blocos(conteudo):
+    if isinstance(conteudo, (bytes, bytearray, memoryview)):
+        visao = memoryview(conteudo)
+        for inicio in range(0, len(visao), TAMANHO_BLOCO):
+            yield bytes(visao[inicio:inicio + TAMANHO_BLOCO])
+    else:
+        for bloco in conteudo:
+            if bloco:
+                yield bloco
+
+
+def extrair_pagina(conteudo, codificacao: str = 'utf-8', motor: str = 'auto') -> dict:
+    motor = _resolver_motor(motor)
+    codificacao = codificacao or 'utf-8'
+    youtube = _BuscadorYoutube()
+
+    if motor == 'lxml':
+        campos = _extrair_lxml(_blocos(conteudo), codificacao, youtube)
+    else:
+        campos = _extrair_html_parser(_blocos(conteudo), codificacao, youtube)
+
+    pre = campos.get('pre')
+    tom = campos.get('tom')
+    if tom:
+        tom = tom.strip()
+    elif pre:
+        match = PADRAO_TOM.search(pre)
+        tom = match.group(1) if match else None
+
+    return {
+        'artista': campos['artista'].strip() if campos.get('artista') is not None else 'Desconhecido',
+        'musica': campos['musica'].strip() if campos.get('musica') is not None else 'Desconhecida',
+        'tom_original': tom or None,
+        'cifra': pre.strip() if pre is not None else 'Cifra não encontrada',
+        'youtube_url': youtube.url()
+    }
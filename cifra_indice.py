@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+
+from cifra_acordes import CLASSES_DE_ALTURA, qualidade_basica, tokenizar_acorde
+from cifra_cache import CacheCifras, DIRETORIO_CACHE_PADRAO
+from cifra_documento import analisar_cifra, TIPO_LETRA
+
+
+NOME_INDICE = 'indice.sqlite'
+CAMINHO_INDICE_PADRAO = os.path.join(DIRETORIO_CACHE_PADRAO, NOME_INDICE)
+
+PESO_TITULO = 10
+PESO_ARTISTA = 5
+PESO_LETRA = 1
+TAMANHOS_NGRAMA = (2, 3, 4)
+MAX_RESULTADOS = 20
+
+PADRAO_PALAVRA = re.compile(r'\w{2,}')
+PADRAO_SEPARADOR_PROGRESSAO = re.compile(r'[\s,;–—-]+')
+PADRAO_GRAU = re.compile(r'^([b#]?)(VII|VI|V|IV|III|II|I|vii|vi|v|iv|iii|ii|i)(°|º|o|dim)?$')
+
+GRAUS = {'I': 0, 'II': 2, 'III': 4, 'IV': 5, 'V': 7, 'VI': 9, 'VII': 11}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS musicas (
+    chave TEXT PRIMARY KEY,
+    artista TEXT,
+    musica TEXT,
+    url TEXT,
+    tom_original TEXT,
+    trigramas INTEGER NOT NULL DEFAULT 0,
+    atualizado_em REAL
+);
+CREATE TABLE IF NOT EXISTS termos (
+    termo TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    peso INTEGER NOT NULL,
+    PRIMARY KEY (termo, chave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS termos_chave ON termos (chave);
+CREATE TABLE IF NOT EXISTS trigramas (
+    trigrama TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    PRIMARY KEY (trigrama, chave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trigramas_chave ON trigramas (chave);
+CREATE TABLE IF NOT EXISTS progressoes (
+    ngrama TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    ocorrencias INTEGER NOT NULL,
+    PRIMARY KEY (ngrama, chave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS progressoes_chave ON progressoes (chave);
+"""
+
+
+def normalizar(texto: str) -> str:
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(caractere for caractere in texto if not unicodedata.combining(caractere)).lower()
+
+
+def palavras(texto: str) -> list:
+    return PADRAO_PALAVRA.findall(normalizar(texto))
+
+
+def trigramas(texto: str) -> set:
+    texto = f"  {' '.join(palavras(texto))} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _chave_ngrama(sequencia: list) -> str:
+    raiz = sequencia[0][0]
+    return ' '.join(f"{(classe - raiz) % 12}{qualidade}" for classe, qualidade in sequencia)
+
+
+def sequencia_de_acordes(documento) -> list:
+    sequencia = []
+    for acorde in documento.acordes():
+        item = (CLASSES_DE_ALTURA[acorde.raiz + acorde.acidente], qualidade_basica(acorde.qualidade))
+        if not sequencia or sequencia[-1] != item:
+            sequencia.append(item)
+    return sequencia
+
+
+def ngramas_de_progressao(sequencia: list) -> Counter:
+    contagem = Counter()
+    for tamanho in TAMANHOS_NGRAMA:
+        for inicio in range(len(sequencia) - tamanho + 1):
+            contagem[_chave_ngrama(sequencia[inicio:inicio + tamanho])] += 1
+    return contagem
+
+
+def interpretar_progressao(consulta: str) -> list:
+    sequencia = []
+    for simbolo in PADRAO_SEPARADOR_PROGRESSAO.split(consulta.strip()):
+        if not simbolo:
+            continue
+
+        match = PADRAO_GRAU.match(simbolo)
+        if match:
+            alteracao, grau, diminuto = match.groups()
+            classe = GRAUS[grau.upper()] + {'b': -1, '#': 1}.get(alteracao, 0)
+            qualidade = 'd' if diminuto else ('M' if grau.isupper() else 'm')
+            sequencia.append((classe % 12, qualidade))
+            continue
+
+        acorde = tokenizar_acorde(simbolo)
+        if acorde is None:
+            raise ValueError(f"Acorde ou grau inválido na progressão: '{simbolo}'")
+        sequencia.append((CLASSES_DE_ALTURA[acorde.raiz + acorde.acidente], qualidade_basica(acorde.qualidade)))
+
+    if len(sequencia) < 2:
+        raise ValueError("A progressão precisa de pelo menos dois acordes")
+    return sequencia
+
+
+class IndiceCifras:
+
+    def __init__(self, caminho: str = CAMINHO_INDICE_PADRAO):
+        self.caminho = caminho
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._conexao = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.executescript(ESQUEMA)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def do_cache(cls, cache: CacheCifras) -> 'IndiceCifras':
+        return cls(os.path.join(cache.diretorio, NOME_INDICE))
+
+    def fechar(self):
+        self._conexao.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conexao.execute('SELECT COUNT(*) FROM musicas').fetchone()[0]
+
+    def indexar(self, chave: str, dados: dict, documento=None):
+        if documento is None:
+            documento = analisar_cifra(dados.get('cifra') or '')
+
+        pesos = Counter()
+        for palavra in palavras(dados.get('musica')):
+            pesos[palavra] += PESO_TITULO
+        for palavra in palavras(dados.get('artista')):
+            pesos[palavra] += PESO_ARTISTA
+        for linha in documento.linhas:
+            if linha.tipo == TIPO_LETRA:
+                for palavra in palavras(linha.texto):
+                    pesos[palavra] += PESO_LETRA
+
+        trigramas_titulo = trigramas(dados.get('musica'))
+        progressoes = ngramas_de_progressao(sequencia_de_acordes(documento))
+
+        with self._lock, self._conexao:
+            self._remover(chave)
+            self._conexao.execute(
+                'INSERT INTO musicas (chave, artista, musica, url, tom_original, trigramas, atualizado_em) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (chave, dados.get('artista'), dados.get('musica'), dados.get('url'), dados.get('tom_original'),
+                 len(trigramas_titulo), time.time())
+            )
+            self._conexao.executemany('INSERT INTO termos (termo, chave, peso) VALUES (?, ?, ?)',
+                                      [(termo, chave, peso) for termo, peso in pesos.items()])
+            self._conexao.executemany('INSERT INTO trigramas (trigrama, chave) VALUES (?, ?)',
+                                      [(trigrama, chave) for trigrama in trigramas_titulo])
+            self._conexao.executemany('INSERT INTO progressoes (ngrama, chave, ocorrencias) VALUES (?, ?, ?)',
+                                      [(ngrama, chave, total) for ngrama, total in progressoes.items()])
+
+    def remover(self, chave: str):
+        with self._lock, self._conexao:
+            self._remover(chave)
+
+    def _remover(self, chave: str):
+        for tabela in ('musicas', 'termos', 'trigramas', 'progressoes'):
+            self._conexao.execute(f'DELETE FROM {tabela} WHERE chave = ?', (chave,))
+
+    def indexar_cache(self, cache: CacheCifras) -> int:
+        total = 0
+        for entrada in cache.entradas():
+            if 'erro' not in entrada['dados']:
+                self.indexar(entrada['chave'], entrada['dados'])
+                total += 1
+        return total
+
+    def _musicas(self, pontuacoes: list) -> list:
+        resultados = []
+        for chave, pontuacao in pontuacoes:
+            linha = self._conexao.execute(
+                'SELECT artista, musica, url, tom_original FROM musicas WHERE chave = ?', (chave,)
+            ).fetchone()
+            if linha:
+                resultados.append({'chave': chave, 'artista': linha[0], 'musica': linha[1], 'url': linha[2],
+                                   'tom_original': linha[3], 'pontuacao': pontuacao})
+        return resultados
+
+    def buscar_texto(self, consulta: str, limite: int = MAX_RESULTADOS) -> list:
+        termos = sorted(set(palavras(consulta)))
+        if not termos:
+            return []
+
+        marcadores = ','.join('?' * len(termos))
+        with self._lock:
+            pontuacoes = self._conexao.execute(
+                f'SELECT chave, SUM(peso) AS total FROM termos WHERE termo IN ({marcadores}) '
+                f'GROUP BY chave HAVING COUNT(*) = ? ORDER BY total DESC LIMIT ?',
+                (*termos, len(termos), limite)
+            ).fetchall()
+            return self._musicas(pontuacoes)
+
+    def buscar_titulo(self, consulta: str, limite: int = 5, similaridade_minima: float = 0.3) -> list:
+        trigramas_consulta = trigramas(consulta)
+        if not trigramas_consulta:
+            return []
+
+        marcadores = ','.join('?' * len(trigramas_consulta))
+        with self._lock:
+            candidatos = self._conexao.execute(
+                f'SELECT c.chave, c.comuns, m.trigramas FROM (SELECT chave, COUNT(*) AS comuns FROM trigramas '
+                f'WHERE trigrama IN ({marcadores}) GROUP BY chave ORDER BY comuns DESC LIMIT ?) c '
+                f'JOIN musicas m ON m.chave = c.chave',
+                (*trigramas_consulta, limite * 10)
+            ).fetchall()
+
+            pontuacoes = []
+            for chave, comuns, total in candidatos:
+                similaridade = comuns / (len(trigramas_consulta) + total - comuns)
+                if similaridade >= similaridade_minima:
+                    pontuacoes.append((chave, round(similaridade, 3)))
+            pontuacoes.sort(key=lambda item: item[1], reverse=True)
+            return self._musicas(pontuacoes[:limite])
+
+    def buscar_progressao(self, consulta: str, limite: int = MAX_RESULTADOS) -> list:
+        sequencia = interpretar_progressao(consulta)
+        maior = max(TAMANHOS_NGRAMA)
+        if len(sequencia) <= maior:
+            ngramas = [_chave_ngrama(sequencia)]
+        else:
+            ngramas = [_chave_ngrama(sequencia[inicio:inicio + maior]) for inicio in range(len(sequencia) - maior + 1)]
+
+        ngramas = sorted(set(ngramas))
+        marcadores = ','.join('?' * len(ngramas))
+        with self._lock:
+            pontuacoes = self._conexao.execute(
+                f'SELECT chave, MIN(ocorrencias) AS total FROM progressoes WHERE ngrama IN ({marcadores}) '
+                f'GROUP BY chave HAVING COUNT(*) = ? ORDER BY total DESC LIMIT ?',
+                (*ngramas, len(ngramas), limite)
+            ).fetchall()
+            return self._musicas(pontuacoes)
+
+
+def _imprimir_resultados(resultados: list):
+    if not resultados:
+        print("\nNenhuma música encontrada no índice local\n")
+        return
+    print()
+    for resultado in resultados:
+        tom = f" (Tom: {resultado['tom_original']})" if resultado.get('tom_original') else ''
+        print(f"🎵 {resultado['musica']} - {resultado['artista']}{tom}")
+        print(f"   {resultado['chave']}")
+    print()
+
+
+def main_indice(argumentos: list, cache: CacheCifras = None):
+    opcoes = [argumento.lower() for argumento in argumentos]
+    cache = cache if cache is not None else CacheCifras()
+    indice = IndiceCifras.do_cache(cache)
+
+    try:
+        if '--reindexar' in opcoes:
+            inicio = time.perf_counter()
+            total = indice.indexar_cache(cache)
+            print(f"\n✅ {total} cifras do cache indexadas em {time.perf_counter() - inicio:.2f}s\n")
+            return
+
+        for opcao, busca in (('--buscar', indice.buscar_texto), ('--titulo', indice.buscar_titulo),
+                             ('--progressao', indice.buscar_progressao)):
+            if opcao in opcoes:
+                posicao = opcoes.index(opcao)
+                consulta = ' '.join(argumento for argumento in argumentos[posicao + 1:] if not argumento.startswith('--'))
+                if not consulta:
+                    break
+                inicio = time.perf_counter()
+                try:
+                    resultados = busca(consulta)
+                except ValueError as e:
+                    print(f"\n❌ {e}\n")
+                    sys.exit(1)
+                _imprimir_resultados(resultados)
+                print(f"({len(resultados)} resultados em {(time.perf_counter() - inicio) * 1000:.1f} ms, {len(indice)} músicas no índice)\n")
+                return
+
+        print("Uso: python cifra_standalone.py --buscar <texto> | --titulo <nome> | --progressao <I V vi IV> | --reindexar")
+        sys.exit(1)
+    finally:
+        indice.fechar()
+
+
+if __name__ == "__main__":
+    main_indice(sys.argv[1:])
@@ -1,33 +1,66 @@
 #!/usr/bin/env python3
 
 import re
-from cifra_standalone import CifraClubStandalone
+import sys
+from cifra_standalone import CifraClubStandalone, linhas_do_terminal
+from cifra_tonalidade import imprimir_recomendacoes
 
 
-def main():
-    print("\n" + "="*70)
-    print("🎸 CIFRACLUB - Buscador de Cifras com Transposição")
-    print("="*70 + "\n")
+def sugerir_musicas(cifra_club: CifraClubStandalone, titulo: str):
+    indice = cifra_club.obter_indice()
+    if indice is None:
+        return
     
+    sugestoes = indice.buscar_titulo(titulo)
+    if sugestoes:
+        print("💡 Você quis dizer:")
+        for sugestao in sugestoes:
+            print(f"   {sugestao['musica']} - {sugestao['artista']} ({sugestao['chave']})")
+        print()
+
+
+def carregar_musica(cifra_club: CifraClubStandalone, modo_ensaio: bool, linhas_por_pagina: int = None):
     artista = input("Nome do artista (ex: coldplay): ").strip().lower().replace(" ", "-")
     musica = input("Nome da música (ex: the-scientist): ").strip().lower().replace(" ", "-")
     
     if not artista or not musica:
         print("\n❌ Artista e música são obrigatórios!\n")
-        return
+        return None
     
     print(f"\n🔍 Buscando cifra...")
-    cifra_club = CifraClubStandalone()
     dados = cifra_club.buscar_cifra(artista, musica)
     
     if 'erro' in dados:
         print(f"\n❌ {dados['erro']}\n")
-        return
+        sugerir_musicas(cifra_club, musica.replace("-", " "))
+        return None
+    
+    cifra_club.transposicoes = None
+    if modo_ensaio:
+        cifra_club.precalcular_transposicoes(dados)
+    
+    cifra_club.exibir_cifra(dados, 0, linhas_por_pagina=linhas_por_pagina)
+    return dados
+
+
+def main():
+    modo_ensaio = '--ensaio' in sys.argv[1:]
+    linhas_por_pagina = linhas_do_terminal() if '--paginar' in sys.argv[1:] else None
     
-    cifra_club.exibir_cifra(dados, 0)
+    print("\n" + "="*70)
+    print("🎸 CIFRACLUB - Buscador de Cifras com Transposição")
+    if modo_ensaio:
+        print("🎤 Modo ensaio: todos os 12 tons são pré-calculados")
+    print("="*70 + "\n")
+    
+    cifra_club = CifraClubStandalone()
+    dados = carregar_musica(cifra_club, modo_ensaio, linhas_por_pagina)
+    if dados is None:
+        return
     
     ultimo_semitom = 0
     ultimo_tom = None
+    capo = None
     
     while True:
         print("\n" + "="*70)
@@ -35,8 +68,11 @@ def main():
         print("  [número] - Transpor por semitons (ex: 2, -3)")
         print("  [tom] - Transpor para um tom específico (ex: C, D#, Cm, Bb)")
         print("  [0] - Ver tom original")
+        print("  [tons] - Ver os 12 tons com pestanas e capotraste")
+        print("  [capo] - Ligar/desligar o capotraste no tom atual")
         print("  [pdf] - Salvar a cifra atual em PDF")
         print("  [abrir] - Salvar e abrir o PDF automaticamente")
+        print("  [nova] - Buscar outra música")
         print("  [s] - Sair")
         print("="*70)
         
@@ -46,16 +82,43 @@ def main():
             print("\n👋 Até logo!\n")
             break
         
+        if opcao.lower() == 'nova':
+            print()
+            nova = carregar_musica(cifra_club, modo_ensaio, linhas_por_pagina)
+            if nova is not None:
+                dados = nova
+                ultimo_semitom = 0
+                ultimo_tom = None
+                capo = None
+            continue
+        
+        if opcao.lower() == 'tons':
+            tonalidade, opcoes = cifra_club.sugerir_tons(dados)
+            imprimir_recomendacoes(tonalidade, opcoes, dados.get('tom_detectado'))
+            continue
+        
+        if opcao.lower() == 'capo':
+            if ultimo_tom:
+                ultimo_semitom = cifra_club.calcular_semitons_entre_tons(dados.get('tom_original') or '', ultimo_tom)
+                ultimo_tom = None
+            capo = None if capo is not None else cifra_club.melhor_capo(dados, ultimo_semitom)
+            if capo == 0:
+                print("\n💡 Neste tom o capotraste não evita nenhuma pestana\n")
+                capo = None
+            cifra_club.exibir_cifra(dados, semitons=ultimo_semitom, linhas_por_pagina=linhas_por_pagina, capo=capo)
+            continue
+        
         if opcao.lower() == 'pdf':
             print("\n💾 Salvando em PDF...")
-            caminho = cifra_club.salvar_pdf(dados, semitons=ultimo_semitom, tom_destino=ultimo_tom)
+            caminho = cifra_club.salvar_pdf(dados, semitons=ultimo_semitom, tom_destino=ultimo_tom, capo=capo)
             if caminho:
                 print(f"✅ PDF salvo em: {caminho}\n")
             continue
         
         if opcao.lower() == 'abrir':
             print("\n💾 Salvando e abrindo PDF...")
-            caminho = cifra_club.salvar_pdf(dados, semitons=ultimo_semitom, tom_destino=ultimo_tom, abrir_automaticamente=True)
+            caminho = cifra_club.salvar_pdf(dados, semitons=ultimo_semitom, tom_destino=ultimo_tom, abrir_automaticamente=True,
+                                            capo=capo)
             if caminho:
                 print(f"✅ PDF salvo e aberto: {caminho}\n")
             continue
@@ -63,18 +126,20 @@ def main():
         try:
             semitons = int(opcao)
             if -12 <= semitons <= 12:
-                cifra_club.exibir_cifra(dados, semitons=semitons)
+                capo = None
+                cifra_club.exibir_cifra(dados, semitons=semitons, linhas_por_pagina=linhas_por_pagina)
                 ultimo_semitom = semitons
                 ultimo_tom = None
             else:
                 print("\n⚠️  Use valores entre -12 e 12 semitons\n")
         except ValueError:
             if opcao and re.match(r'^[A-G][#b]?m?$', opcao, re.IGNORECASE):
-                cifra_club.exibir_cifra(dados, tom_destino=opcao)
+                capo = None
+                cifra_club.exibir_cifra(dados, tom_destino=opcao, linhas_por_pagina=linhas_por_pagina)
                 ultimo_tom = opcao
                 ultimo_semitom = 0
             else:
-                print("\n⚠️  Opção inválida! Use um número, um tom (ex: C, D#, Cm), 'pdf', 'abrir' ou 's' para sair\n")
+                print("\n⚠️  Opção inválida! Use um número, um tom (ex: C, D#, Cm), 'tons', 'capo', 'pdf', 'abrir', 'nova' ou 's' para sair\n")
 
 
 if __name__ == "__main__":
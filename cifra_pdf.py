@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Spacer, Preformatted, KeepTogether, Frame, PageTemplate
+from reportlab.platypus.doctemplate import BaseDocTemplate
+
+from cifra_documento import CODIGOS_TIPO, TIPO_VAZIA, TIPO_SECAO, TIPO_ACORDES
+
+
+LAYOUT_PDF = {
+    'versao': 2,
+    'pagina': 'A4',
+    'colunas': 2,
+    'fonte': 'Courier',
+    'tamanho_fonte': 8,
+    'entrelinha': 10,
+    'espaco_secao_cm': 0.3,
+    'espaco_vazio_cm': 0.15,
+}
+
+MAX_LAYOUTS = 256
+
+
+@lru_cache(maxsize=None)
+def estilo_cifra() -> ParagraphStyle:
+    styles = getSampleStyleSheet()
+    return ParagraphStyle(
+        'Code',
+        parent=styles['Code'],
+        fontSize=LAYOUT_PDF['tamanho_fonte'],
+        fontName=LAYOUT_PDF['fonte'],
+        leftIndent=0,
+        rightIndent=0,
+        spaceAfter=2,
+        spaceBefore=0,
+        leading=LAYOUT_PDF['entrelinha'],
+        keepWithNext=False
+    )
+
+
+def _cabecalho_rodape(canvas, doc):
+    cabecalho = doc.cabecalho_cifra
+    canvas.saveState()
+
+    canvas.setFont('Helvetica-Bold', 14)
+    canvas.drawCentredString(A4[0]/2, A4[1] - 1.5*cm, cabecalho['titulo'])
+
+    canvas.setFont('Helvetica', 9)
+    y_pos = A4[1] - 2*cm
+
+    if cabecalho.get('tom_original'):
+        semitons = cabecalho['semitons']
+        if semitons != 0:
+            info_tom = f"Tom original: {cabecalho['tom_original']} → Tom atual: {cabecalho['tom_exibir']} ({'+' if semitons > 0 else ''}{semitons} semitons)"
+        else:
+            info_tom = f"Tom: {cabecalho['tom_exibir']}"
+        canvas.drawCentredString(A4[0]/2, y_pos, info_tom)
+        y_pos -= 0.4*cm
+
+    if cabecalho.get('capo'):
+        canvas.drawCentredString(A4[0]/2, y_pos, f"Capotraste na {cabecalho['capo']}ª casa — formas de {cabecalho['tom_formas']}")
+        y_pos -= 0.4*cm
+
+    if cabecalho.get('youtube_url'):
+        canvas.drawCentredString(A4[0]/2, y_pos, f"YouTube: {cabecalho['youtube_url']}")
+        y_pos -= 0.4*cm
+
+    canvas.setFont('Helvetica', 8)
+    canvas.drawCentredString(A4[0]/2, y_pos, f"Fonte: {cabecalho['url']}")
+
+    if cabecalho.get('numerar_paginas', True):
+        desenhar_numero_pagina(canvas, doc.page)
+
+    canvas.restoreState()
+
+
+def desenhar_numero_pagina(canvas, numero: int):
+    canvas.setFont('Helvetica', 8)
+    canvas.drawCentredString(A4[0]/2, 1*cm, f"Página {numero}")
+
+
+@lru_cache(maxsize=None)
+def template_duas_colunas() -> PageTemplate:
+    frame_width = (A4[0] - 4*cm) / 2
+    frame_height = A4[1] - 7*cm
+
+    frame1 = Frame(1.5*cm, 2*cm, frame_width, frame_height, id='col1',
+                  leftPadding=0, rightPadding=10, topPadding=0, bottomPadding=0)
+    frame2 = Frame(1.5*cm + frame_width + 1*cm, 2*cm, frame_width, frame_height, id='col2',
+                  leftPadding=10, rightPadding=0, topPadding=0, bottomPadding=0)
+
+    return PageTemplate(id='TwoCol', frames=[frame1, frame2], onPage=_cabecalho_rodape)
+
+
+def montar_cabecalho(dados: dict, semitons: int, tom_exibir: str, capo: int = None, tom_formas: str = None) -> dict:
+    return {
+        'titulo': f"{dados['musica']} - {dados['artista']}",
+        'tom_original': dados.get('tom_original'),
+        'tom_exibir': tom_exibir,
+        'semitons': semitons,
+        'capo': capo or None,
+        'tom_formas': tom_formas,
+        'youtube_url': dados.get('youtube_url'),
+        'url': dados['url']
+    }
+
+
+def largura_coluna() -> float:
+    return (A4[0] - 4*cm) / 2 - 10
+
+
+class LayoutPDF:
+
+    def __init__(self, linhas: list):
+        self.paginas = 0
+        self.blocos = []
+        self.reutilizavel = True
+        largura_caractere = stringWidth('M', LAYOUT_PDF['fonte'], LAYOUT_PDF['tamanho_fonte'])
+        self.caracteres_por_coluna = int(largura_coluna() / largura_caractere)
+        self.comprimentos = [len(texto) for _, texto in linhas]
+
+    def registrar(self, pagina: int, x: float, y: float, indices: tuple):
+        self.blocos.append((pagina, x, y, indices))
+
+    def comporta(self, linhas: list) -> bool:
+        if len(linhas) != len(self.comprimentos):
+            return False
+        limite = self.caracteres_por_coluna
+        for (_, texto), comprimento in zip(linhas, self.comprimentos):
+            if len(texto) > limite and len(texto) > comprimento:
+                return False
+        return True
+
+
+class CacheLayouts:
+
+    def __init__(self, max_layouts: int = MAX_LAYOUTS):
+        self.max_layouts = max_layouts
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(linhas: list) -> tuple:
+        return ''.join(CODIGOS_TIPO[tipo] for tipo, _ in linhas), tuple(sorted(LAYOUT_PDF.items()))
+
+    def obter(self, chave: tuple):
+        with self._lock:
+            layout = self._layouts.get(chave)
+            if layout is not None:
+                self._layouts.move_to_end(chave)
+            return layout
+
+    def guardar(self, chave: tuple, layout: LayoutPDF):
+        with self._lock:
+            self._layouts[chave] = layout
+            self._layouts.move_to_end(chave)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._layouts.clear()
+
+
+LAYOUTS = CacheLayouts()
+
+
+class _PreformatadoMedido(Preformatted):
+
+    def __init__(self, texto: str, estilo: ParagraphStyle, indices: tuple, layout: LayoutPDF):
+        super().__init__(texto, estilo)
+        self.indices = indices
+        self.layout = layout
+        if len(self.lines) != len(indices):
+            layout.reutilizavel = False
+
+    def split(self, availWidth, availHeight):
+        partes = super().split(availWidth, availHeight)
+        if len(partes) != 2:
+            return partes
+        corte = len(partes[0].lines)
+        return [_PreformatadoMedido('\n'.join(partes[0].lines), partes[0].style, self.indices[:corte], self.layout),
+                _PreformatadoMedido('\n'.join(partes[1].lines), partes[1].style, self.indices[corte:], self.layout)]
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        self.layout.registrar(canvas.getPageNumber(), x + self.style.leftIndent,
+                              y + self.height - self.style.fontSize, self.indices)
+        super().drawOn(canvas, x, y, _sW)
+
+
+def construir_story(linhas: list, layout: LayoutPDF = None) -> list:
+    code_style = estilo_cifra()
+    story = []
+
+    def preformatado(texto: str, *indices):
+        if layout is None:
+            return Preformatted(texto, code_style)
+        return _PreformatadoMedido(texto, code_style, indices, layout)
+
+    i = 0
+    while i < len(linhas):
+        tipo, texto = linhas[i]
+
+        if tipo == TIPO_SECAO:
+            if i > 0:
+                story.append(Spacer(1, LAYOUT_PDF['espaco_secao_cm']*cm))
+            story.append(preformatado(texto, i))
+        elif tipo == TIPO_VAZIA:
+            story.append(Spacer(1, LAYOUT_PDF['espaco_vazio_cm']*cm))
+        elif tipo == TIPO_ACORDES and i + 1 < len(linhas) and linhas[i + 1][0] not in (TIPO_VAZIA, TIPO_SECAO):
+            combined = texto + '\n' + linhas[i + 1][1]
+            story.append(KeepTogether([preformatado(combined, i, i + 1)]))
+            i += 1
+        else:
+            story.append(preformatado(texto, i))
+
+        i += 1
+
+    return story
+
+
+class _PaginaLayout:
+
+    def __init__(self, cabecalho: dict):
+        self.cabecalho_cifra = cabecalho
+        self.page = 0
+
+
+def _desenhar_com_layout(caminho_pdf, cabecalho: dict, linhas: list, layout: LayoutPDF) -> int:
+    estilo = estilo_cifra()
+    canvas = Canvas(caminho_pdf, pagesize=A4)
+    pagina = _PaginaLayout(cabecalho)
+    blocos = iter(layout.blocos)
+    bloco = next(blocos, None)
+
+    for numero in range(1, layout.paginas + 1):
+        pagina.page = numero
+        _cabecalho_rodape(canvas, pagina)
+        if estilo.textColor:
+            canvas.setFillColor(estilo.textColor)
+        texto = canvas.beginText()
+        texto.setFont(estilo.fontName, estilo.fontSize, estilo.leading)
+        while bloco is not None and bloco[0] == numero:
+            _, x, y, indices = bloco
+            texto.setTextOrigin(x, y)
+            for indice in indices:
+                texto.textLine(linhas[indice][1])
+            bloco = next(blocos, None)
+        canvas.drawText(texto)
+        canvas.showPage()
+
+    canvas.save()
+    return layout.paginas
+
+
+def renderizar_pdf(caminho_pdf, cabecalho: dict, linhas: list, reutilizar_layout: bool = True) -> int:
+    chave = CacheLayouts.chave(linhas)
+    if reutilizar_layout:
+        layout = LAYOUTS.obter(chave)
+        if layout is not None and layout.comporta(linhas):
+            return _desenhar_com_layout(caminho_pdf, cabecalho, linhas, layout)
+
+    layout = LayoutPDF(linhas)
+    doc = BaseDocTemplate(caminho_pdf, pagesize=A4,
+                          rightMargin=1.5*cm, leftMargin=1.5*cm,
+                          topMargin=4*cm, bottomMargin=1.5*cm,
+                          pageTemplates=[template_duas_colunas()])
+    doc.cabecalho_cifra = cabecalho
+    doc.build(construir_story(linhas, layout))
+    layout.paginas = doc.page
+    if layout.reutilizavel:
+        LAYOUTS.guardar(chave, layout)
+    return doc.page
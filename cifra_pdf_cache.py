@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import weakref
+
+
+PASTA_PDF_PADRAO = 'pdf'
+NOME_MANIFESTO = '.manifesto.json'
+
+_locks_por_pasta = weakref.WeakValueDictionary()
+_locks_por_arquivo = weakref.WeakValueDictionary()
+_lock_pastas = threading.Lock()
+
+
+def _lock_da_pasta(pasta_pdf: str) -> threading.Lock:
+    with _lock_pastas:
+        return _locks_por_pasta.setdefault(os.path.abspath(pasta_pdf), threading.Lock())
+
+
+def _lock_do_arquivo(pasta_pdf: str, nome_arquivo: str) -> threading.Lock:
+    with _lock_pastas:
+        return _locks_por_arquivo.setdefault((os.path.abspath(pasta_pdf), nome_arquivo), threading.Lock())
+
+
+class CachePDF:
+
+    def __init__(self, pasta_pdf: str = PASTA_PDF_PADRAO):
+        self.pasta_pdf = pasta_pdf
+        self.caminho_manifesto = os.path.join(pasta_pdf, NOME_MANIFESTO)
+        self._lock = _lock_da_pasta(pasta_pdf)
+
+    @staticmethod
+    def chave(cifra: str, cabecalho: dict, layout: dict) -> str:
+        conteudo = json.dumps({'cifra': cifra, 'cabecalho': cabecalho, 'layout': layout},
+                              sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def manifesto(self) -> dict:
+        try:
+            with open(self.caminho_manifesto, encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _salvar_manifesto(self, manifesto: dict):
+        os.makedirs(self.pasta_pdf, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta_pdf, suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(manifesto, arquivo, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temporario, self.caminho_manifesto)
+        except BaseException:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            raise
+
+    def valido(self, nome_arquivo: str, chave: str) -> bool:
+        entrada = self.manifesto().get(nome_arquivo)
+        return bool(entrada) and entrada.get('hash') == chave and os.path.exists(os.path.join(self.pasta_pdf, nome_arquivo))
+
+    def lock_arquivo(self, nome_arquivo: str) -> threading.Lock:
+        return _lock_do_arquivo(self.pasta_pdf, nome_arquivo)
+
+    def temporario(self) -> str:
+        os.makedirs(self.pasta_pdf, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta_pdf, suffix='.pdf.tmp')
+        os.close(descritor)
+        return temporario
+
+    @staticmethod
+    def descartar_temporario(temporario: str):
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+
+    def publicar_temporario(self, nome_arquivo: str, temporario: str):
+        try:
+            os.replace(temporario, os.path.join(self.pasta_pdf, nome_arquivo))
+        except BaseException:
+            self.descartar_temporario(temporario)
+            raise
+
+    def publicar(self, nome_arquivo: str, renderizar):
+        temporario = self.temporario()
+        try:
+            resultado = renderizar(temporario)
+        except BaseException:
+            self.descartar_temporario(temporario)
+            raise
+        self.publicar_temporario(nome_arquivo, temporario)
+        return resultado
+
+    def registrar(self, nome_arquivo: str, chave: str, cabecalho: dict, paginas: int = None):
+        caminho = os.path.join(self.pasta_pdf, nome_arquivo)
+        with self._lock:
+            manifesto = self.manifesto()
+            manifesto[nome_arquivo] = {
+                'hash': chave,
+                'titulo': cabecalho.get('titulo'),
+                'tom': cabecalho.get('tom_exibir'),
+                'semitons': cabecalho.get('semitons', 0),
+                'fonte': cabecalho.get('url'),
+                'gerado_em': time.time(),
+                'tamanho': os.path.getsize(caminho) if os.path.exists(caminho) else 0,
+                'paginas': paginas
+            }
+            self._salvar_manifesto(manifesto)
+
+    def remover(self, nome_arquivo: str):
+        with self._lock:
+            manifesto = self.manifesto()
+            if manifesto.pop(nome_arquivo, None) is not None:
+                self._salvar_manifesto(manifesto)
+        try:
+            os.remove(os.path.join(self.pasta_pdf, nome_arquivo))
+        except FileNotFoundError:
+            pass
+
+    def podar(self, max_idade_dias: float = None) -> list:
+        removidos = []
+        limite = time.time() - max_idade_dias * 86400 if max_idade_dias is not None else None
+
+        with self._lock:
+            manifesto = self.manifesto()
+            for nome_arquivo, entrada in list(manifesto.items()):
+                caminho = os.path.join(self.pasta_pdf, nome_arquivo)
+                if not os.path.exists(caminho):
+                    del manifesto[nome_arquivo]
+                    removidos.append(nome_arquivo)
+                elif limite is not None and entrada.get('gerado_em', 0) < limite:
+                    os.remove(caminho)
+                    del manifesto[nome_arquivo]
+                    removidos.append(nome_arquivo)
+            self._salvar_manifesto(manifesto)
+
+        return removidos
+
+
+def main_cache_pdf(argumentos: list):
+    cache_pdf = CachePDF()
+    uso = "Uso: python cifra_standalone.py --pdf-cache [listar | podar [dias]]"
+
+    if argumentos and argumentos[0].lower() == 'podar':
+        max_idade_dias = None
+        if len(argumentos) > 1:
+            try:
+                max_idade_dias = float(argumentos[1])
+            except ValueError:
+                max_idade_dias = -1.0
+            if not max_idade_dias >= 0:
+                print(uso)
+                sys.exit(1)
+        removidos = cache_pdf.podar(max_idade_dias)
+        for nome_arquivo in removidos:
+            print(f"🗑️  {nome_arquivo}")
+        print(f"\n✅ {len(removidos)} entradas removidas do cache de PDFs\n")
+        return
+
+    if argumentos and argumentos[0].lower() != 'listar':
+        print(uso)
+        sys.exit(1)
+
+    manifesto = cache_pdf.manifesto()
+    if not manifesto:
+        print(f"\nNenhum PDF registrado em '{cache_pdf.pasta_pdf}'\n")
+        return
+
+    print(f"\n{'Arquivo':<50}{'Tom':>6}{'Págs':>6}{'KB':>8}  Gerado em")
+    for nome_arquivo, entrada in sorted(manifesto.items()):
+        existe = os.path.exists(os.path.join(cache_pdf.pasta_pdf, nome_arquivo))
+        gerado_em = time.strftime('%d/%m/%Y %H:%M', time.localtime(entrada.get('gerado_em', 0)))
+        aviso = '' if existe else '  (arquivo ausente)'
+        print(f"{nome_arquivo:<50}{str(entrada.get('tom')):>6}{str(entrada.get('paginas') or '-'):>6}{entrada.get('tamanho', 0) // 1024:>8}  {gerado_em}{aviso}")
+    print()
+
+
+if __name__ == "__main__":
+    main_cache_pdf(sys.argv[1:])
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+CAMPOS_ETAPA = ('segundos', 'chamadas', 'blocos_alocados', 'kb_alocados', 'pico_kb', 'picos_descartados')
+
+METRICAS_PROMETHEUS = (
+    ('segundos', 'cifra_etapa_segundos_total', 'counter', 'Tempo gasto em cada etapa, em segundos'),
+    ('chamadas', 'cifra_etapa_chamadas_total', 'counter', 'Número de execuções de cada etapa'),
+    ('blocos_alocados', 'cifra_etapa_blocos_alocados', 'gauge', 'Blocos de memória alocados (saldo) em cada etapa'),
+    ('kb_alocados', 'cifra_etapa_kb_alocados', 'gauge', 'Memória alocada (saldo) em cada etapa, em KB'),
+    ('pico_kb', 'cifra_etapa_pico_kb', 'gauge', 'Maior pico de memória de uma execução da etapa, em KB'),
+)
+
+_etapas_ativas = []
+_lock_memoria = threading.Lock()
+
+
+def _rotulo(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Perfilador:
+
+    def __init__(self, medir_alocacoes: bool = True, caminho_cprofile: str = None):
+        self.medir_alocacoes = medir_alocacoes
+        self.caminho_cprofile = caminho_cprofile
+        self.registros = OrderedDict()
+        self._ganchos = []
+        self._lock = threading.Lock()
+        self._cprofile = None
+        self._iniciou_tracemalloc = False
+
+    def adicionar_gancho(self, gancho):
+        self._ganchos.append(gancho)
+        return gancho
+
+    def remover_gancho(self, gancho):
+        self._ganchos.remove(gancho)
+
+    def iniciar(self):
+        if self.medir_alocacoes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+        if self.caminho_cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def finalizar(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.caminho_cprofile)
+            self._cprofile = None
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *excecao):
+        self.finalizar()
+
+    def _registro(self, musica: str) -> dict:
+        registro = self.registros.get(musica)
+        if registro is None:
+            registro = {'musica': musica, 'bytes_baixados': 0, 'etapas': OrderedDict()}
+            self.registros[musica] = registro
+        return registro
+
+    @staticmethod
+    def _entrar_memoria() -> dict:
+        memoria = {'thread': threading.get_ident(), 'compartilhada': False}
+        with _lock_memoria:
+            atual, pico = tracemalloc.get_traced_memory()
+            for outra in _etapas_ativas:
+                outra['pico'] = max(outra['pico'], pico)
+                if outra['thread'] != memoria['thread']:
+                    outra['compartilhada'] = memoria['compartilhada'] = True
+            tracemalloc.reset_peak()
+            memoria['inicial'] = memoria['pico'] = atual
+            _etapas_ativas.append(memoria)
+        return memoria
+
+    @staticmethod
+    def _sair_memoria(memoria: dict) -> tuple:
+        with _lock_memoria:
+            final, pico = tracemalloc.get_traced_memory()
+            _etapas_ativas.remove(memoria)
+        return final, max(memoria['pico'], pico)
+
+    @contextmanager
+    def etapa(self, musica: str, nome: str):
+        rastreando = tracemalloc.is_tracing()
+        if rastreando:
+            memoria = self._entrar_memoria()
+        blocos_iniciais = sys.getallocatedblocks()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            evento = {
+                'musica': musica,
+                'etapa': nome,
+                'segundos': time.perf_counter() - inicio,
+                'blocos_alocados': sys.getallocatedblocks() - blocos_iniciais,
+            }
+            if rastreando:
+                memoria_final, pico = self._sair_memoria(memoria)
+                evento['kb_alocados'] = (memoria_final - memoria['inicial']) / 1024
+                if memoria['compartilhada']:
+                    evento['pico_compartilhado'] = True
+                else:
+                    evento['pico_kb'] = max(0, pico - memoria['inicial']) / 1024
+            self._registrar(evento)
+
+    def contar_bytes(self, musica: str, quantidade: int):
+        with self._lock:
+            self._registro(musica)['bytes_baixados'] += quantidade
+        self._notificar({'musica': musica, 'etapa': 'bytes', 'bytes': quantidade})
+
+    def _registrar(self, evento: dict):
+        with self._lock:
+            etapas = self._registro(evento['musica'])['etapas']
+            acumulado = etapas.setdefault(evento['etapa'], {campo: 0 for campo in CAMPOS_ETAPA})
+            acumulado['chamadas'] += 1
+            for campo in ('segundos', 'blocos_alocados', 'kb_alocados'):
+                acumulado[campo] += evento.get(campo, 0)
+            acumulado['pico_kb'] = max(acumulado['pico_kb'], evento.get('pico_kb', 0))
+            acumulado['picos_descartados'] += bool(evento.get('pico_compartilhado'))
+        self._notificar(evento)
+
+    def _notificar(self, evento: dict):
+        for gancho in list(self._ganchos):
+            try:
+                gancho(evento)
+            except Exception:
+                pass
+
+    def linhas_json(self) -> list:
+        with self._lock:
+            return [json.dumps(registro, ensure_ascii=False) for registro in self.registros.values()]
+
+    def prometheus(self) -> str:
+        linhas = []
+        with self._lock:
+            registros = list(self.registros.values())
+            for campo, metrica, tipo, ajuda in METRICAS_PROMETHEUS:
+                linhas.append(f"# HELP {metrica} {ajuda}")
+                linhas.append(f"# TYPE {metrica} {tipo}")
+                for registro in registros:
+                    for nome, etapa in registro['etapas'].items():
+                        if campo == 'pico_kb' and etapa['picos_descartados'] == etapa['chamadas']:
+                            continue
+                        linhas.append(f'{metrica}{{musica="{_rotulo(registro["musica"])}",etapa="{_rotulo(nome)}"}} {etapa[campo]:g}')
+
+            linhas.append("# HELP cifra_bytes_baixados_total Bytes baixados por música")
+            linhas.append("# TYPE cifra_bytes_baixados_total counter")
+            for registro in registros:
+                linhas.append(f'cifra_bytes_baixados_total{{musica="{_rotulo(registro["musica"])}"}} {registro["bytes_baixados"]}')
+        return '\n'.join(linhas) + '\n'
+
+    def exportar(self, caminho: str):
+        if caminho.endswith(('.prom', '.txt')):
+            conteudo = self.prometheus()
+        else:
+            conteudo = ''.join(f"{linha}\n" for linha in self.linhas_json())
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+
+    def imprimir_resumo(self, saida=None):
+        saida = saida or sys.stderr
+        with self._lock:
+            registros = list(self.registros.values())
+
+        print("\n📊 Perfil por etapa", file=saida)
+        for registro in registros:
+            print(f"\n{registro['musica']}  ({registro['bytes_baixados'] / 1024:.1f} KB baixados)", file=saida)
+            print(f"  {'Etapa':<18}{'ms':>10}{'chamadas':>10}{'blocos':>10}{'KB':>10}{'pico KB':>10}", file=saida)
+            for nome, etapa in registro['etapas'].items():
+                pico = '-' if etapa['picos_descartados'] == etapa['chamadas'] else f"{etapa['pico_kb']:.1f}"
+                pico += '*' if etapa['picos_descartados'] else ' '
+                print(f"  {nome:<18}{etapa['segundos'] * 1000:>10.2f}{etapa['chamadas']:>10}"
+                      f"{etapa['blocos_alocados']:>10}{etapa['kb_alocados']:>10.1f}{pico:>11}", file=saida)
+        if any(etapa['picos_descartados'] for registro in registros for etapa in registro['etapas'].values()):
+            print("\n  * picos de execuções simultâneas a outras threads foram descartados", file=saida)
+        print(file=saida)
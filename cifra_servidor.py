@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import queue
+import signal
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+
+from cifra_cache import CacheCifras
+from cifra_standalone import MAX_POR_HOST_PADRAO, CifraClubStandalone, _interpretar_workers
+from cifra_tonalidade import interpretar_extensao
+from cifra_transporte import Transporte
+
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8000
+WORKERS_PADRAO = 4
+MAX_MUSICAS_MEMORIA = 512
+TAMANHO_BLOCO_PDF = 64 * 1024
+TIMEOUT_REQUISICAO = 30
+
+CAMPOS_RESPOSTA = ('url', 'artista', 'musica', 'tom_original', 'tom_detectado', 'cifra', 'youtube_url')
+
+STATUS_HTTP = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+    502: 'Bad Gateway',
+    503: 'Service Unavailable',
+    504: 'Gateway Timeout',
+}
+
+
+class ErroRequisicao(Exception):
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class ServicoCifras:
+
+    def __init__(self, workers: int = WORKERS_PADRAO, cache: CacheCifras = None,
+                 max_musicas_memoria: int = MAX_MUSICAS_MEMORIA, transporte: Transporte = None, **opcoes):
+        self.cache = cache if cache is not None else CacheCifras()
+        self.transporte = transporte if transporte is not None else Transporte(max_conexoes=MAX_POR_HOST_PADRAO)
+        self._sessoes = queue.Queue()
+        for _ in range(workers):
+            self._sessoes.put(CifraClubStandalone(cache=self.cache, transporte=self.transporte, **opcoes))
+        self._musicas = OrderedDict()
+        self._max_musicas = max_musicas_memoria
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def sessao(self):
+        cifra_club = self._sessoes.get()
+        try:
+            yield cifra_club
+        finally:
+            self._sessoes.put(cifra_club)
+
+    def buscar(self, artista: str, musica: str) -> dict:
+        chave = CacheCifras.chave(artista, musica)
+        with self._lock:
+            entrada = self._musicas.get(chave)
+            if entrada is not None:
+                dados, guardado_em = entrada
+                if time.monotonic() - guardado_em <= self.cache.ttl:
+                    self._musicas.move_to_end(chave)
+                    return dados
+                del self._musicas[chave]
+
+        with self.sessao() as cifra_club:
+            dados = cifra_club.buscar_cifra(artista, musica)
+
+        if 'erro' in dados:
+            raise ErroRequisicao(dados.get('status', 502), dados['erro'])
+
+        with self._lock:
+            self._musicas[chave] = (dados, time.monotonic())
+            while len(self._musicas) > self._max_musicas:
+                self._musicas.popitem(last=False)
+        return dados
+
+    def _semitons(self, cifra_club: CifraClubStandalone, dados: dict, parametros: dict) -> int:
+        if parametros.get('tom'):
+            if not dados.get('tom_original'):
+                raise ErroRequisicao(400, 'A cifra não tem tom original; use semitons')
+            return cifra_club.calcular_semitons_entre_tons(dados['tom_original'], parametros['tom'])
+        try:
+            return int(parametros.get('semitons', 0))
+        except ValueError:
+            raise ErroRequisicao(400, "Parâmetro 'semitons' deve ser um número inteiro")
+
+    def cifra(self, parametros: dict) -> dict:
+        dados = self.buscar(*_musica_dos_parametros(parametros))
+        return {campo: dados.get(campo) for campo in CAMPOS_RESPOSTA}
+
+    def transpor(self, parametros: dict) -> dict:
+        dados = self.buscar(*_musica_dos_parametros(parametros))
+        with self.sessao() as cifra_club:
+            semitons = self._semitons(cifra_club, dados, parametros)
+            resposta = {campo: dados.get(campo) for campo in CAMPOS_RESPOSTA}
+            resposta['semitons'] = semitons
+            resposta['tom'] = cifra_club.tom_transposto(dados, semitons)
+            resposta['cifra'] = cifra_club.documento(dados).renderizar(semitons, cifra_club.grafia(dados, semitons))
+        return resposta
+
+    def tom(self, parametros: dict) -> dict:
+        dados = self.buscar(*_musica_dos_parametros(parametros))
+        extensao = None
+        if parametros.get('voz'):
+            try:
+                extensao = interpretar_extensao(parametros['voz'])
+            except ValueError as e:
+                raise ErroRequisicao(400, str(e))
+        with self.sessao() as cifra_club:
+            tonalidade, opcoes = cifra_club.sugerir_tons(dados, extensao)
+        if tonalidade is None:
+            raise ErroRequisicao(404, 'Não há acordes suficientes para identificar o tom')
+        return {
+            'tom': tonalidade.tom,
+            'detectado': bool(dados.get('tom_detectado')),
+            'correlacao': tonalidade.correlacao,
+            'opcoes': opcoes,
+        }
+
+    def metricas(self, parametros: dict) -> dict:
+        return self.transporte.metricas.resumo()
+
+    def pdf(self, parametros: dict) -> str:
+        dados = self.buscar(*_musica_dos_parametros(parametros))
+        with self.sessao() as cifra_club:
+            semitons = self._semitons(cifra_club, dados, parametros)
+            return cifra_club.salvar_pdf(dados, semitons=semitons)
+
+
+def _musica_dos_parametros(parametros: dict) -> tuple:
+    artista = parametros.get('artista', '').strip()
+    musica = parametros.get('musica', '').strip()
+    if not artista or not musica:
+        raise ErroRequisicao(400, "Parâmetros 'artista' e 'musica' são obrigatórios")
+    return artista, musica
+
+
+class ServidorCifras:
+
+    def __init__(self, host: str = HOST_PADRAO, porta: int = PORTA_PADRAO, workers: int = WORKERS_PADRAO, **opcoes):
+        self.host = host
+        self.porta = porta
+        self.workers = workers
+        self.servico = ServicoCifras(workers=workers, **opcoes)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cifra')
+        self._encerrar = None
+        self._conexoes = set()
+        self.rotas = {
+            '/cifra': self.servico.cifra,
+            '/transpor': self.servico.transpor,
+            '/tom': self.servico.tom,
+            '/metricas': self.servico.metricas,
+        }
+
+    async def _responder(self, writer, status: int, corpo: bytes, tipo: str = 'application/json; charset=utf-8',
+                         extras: dict = None):
+        cabecalhos = [
+            f"HTTP/1.1 {status} {STATUS_HTTP.get(status, '')}",
+            f"Content-Type: {tipo}",
+            f"Content-Length: {len(corpo)}",
+            "Connection: close",
+        ]
+        for nome, valor in (extras or {}).items():
+            cabecalhos.append(f"{nome}: {valor}")
+        writer.write(('\r\n'.join(cabecalhos) + '\r\n\r\n').encode('latin-1') + corpo)
+        await writer.drain()
+
+    async def _responder_json(self, writer, status: int, dados: dict):
+        await self._responder(writer, status, json.dumps(dados, ensure_ascii=False).encode('utf-8'))
+
+    async def _enviar_pdf(self, writer, caminho_pdf: str):
+        loop = asyncio.get_running_loop()
+        with open(caminho_pdf, 'rb') as arquivo:
+            arquivo.seek(0, 2)
+            tamanho = arquivo.tell()
+            arquivo.seek(0)
+
+            nome = caminho_pdf.replace('\\', '/').rsplit('/', 1)[-1]
+            cabecalhos = [
+                "HTTP/1.1 200 OK",
+                "Content-Type: application/pdf",
+                f"Content-Length: {tamanho}",
+                f"Content-Disposition: inline; filename=\"{nome}\"",
+                "Connection: close",
+            ]
+            writer.write(('\r\n'.join(cabecalhos) + '\r\n\r\n').encode('utf-8'))
+
+            while True:
+                bloco = await loop.run_in_executor(self.executor, arquivo.read, TAMANHO_BLOCO_PDF)
+                if not bloco:
+                    break
+                writer.write(bloco)
+                await writer.drain()
+
+    async def _atender(self, reader, writer):
+        tarefa = asyncio.current_task()
+        self._conexoes.add(tarefa)
+        try:
+            try:
+                linha = await asyncio.wait_for(reader.readline(), TIMEOUT_REQUISICAO)
+                while True:
+                    cabecalho = await asyncio.wait_for(reader.readline(), TIMEOUT_REQUISICAO)
+                    if cabecalho in (b'\r\n', b'\n', b''):
+                        break
+            except (asyncio.TimeoutError, ConnectionError):
+                return
+
+            partes = linha.decode('latin-1').split()
+            if len(partes) < 2:
+                await self._responder_json(writer, 400, {'erro': 'Requisição inválida'})
+                return
+
+            metodo, alvo = partes[0], partes[1]
+            if metodo != 'GET':
+                await self._responder_json(writer, 405, {'erro': 'Use GET'})
+                return
+
+            url = urlsplit(alvo)
+            parametros = {nome: valores[0] for nome, valores in parse_qs(url.query).items()}
+            loop = asyncio.get_running_loop()
+
+            try:
+                if url.path == '/saude':
+                    await self._responder_json(writer, 200, {'status': 'ok'})
+                elif url.path == '/pdf':
+                    caminho_pdf = await loop.run_in_executor(self.executor, self.servico.pdf, parametros)
+                    if not caminho_pdf:
+                        raise ErroRequisicao(500, 'Não foi possível gerar o PDF')
+                    await self._enviar_pdf(writer, caminho_pdf)
+                elif url.path in self.rotas:
+                    resposta = await loop.run_in_executor(self.executor, self.rotas[url.path], parametros)
+                    await self._responder_json(writer, 200, resposta)
+                else:
+                    await self._responder_json(writer, 404, {'erro': f'Rota não encontrada: {url.path}'})
+            except ErroRequisicao as e:
+                await self._responder_json(writer, e.status, {'erro': e.mensagem})
+            except Exception as e:
+                await self._responder_json(writer, 500, {'erro': f'Erro interno: {str(e)}'})
+        except ConnectionError:
+            pass
+        finally:
+            self._conexoes.discard(tarefa)
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def encerrar(self):
+        if self._encerrar is not None:
+            self._encerrar.set()
+
+    async def executar(self):
+        self._encerrar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sinal, self.encerrar)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        print(f"🎸 Servidor de cifras em http://{self.host}:{self.porta} ({self.workers} workers)")
+        print("   Rotas: /cifra, /transpor, /tom, /pdf, /metricas, /saude")
+
+        try:
+            await self._encerrar.wait()
+        finally:
+            print("\n🛑 Encerrando servidor...")
+            servidor.close()
+            await servidor.wait_closed()
+            if self._conexoes:
+                await asyncio.wait(set(self._conexoes), timeout=TIMEOUT_REQUISICAO)
+            self.executor.shutdown(wait=True)
+            print("👋 Servidor encerrado")
+
+
+def main_servidor(argumentos: list):
+    host = HOST_PADRAO
+    porta = PORTA_PADRAO
+    workers = WORKERS_PADRAO
+
+    i = 0
+    while i < len(argumentos):
+        argumento = argumentos[i].strip().lower()
+        if argumento == '--host' and i + 1 < len(argumentos):
+            host = argumentos[i + 1]
+            i += 1
+        elif argumento == '--porta' and i + 1 < len(argumentos):
+            porta = int(argumentos[i + 1])
+            i += 1
+        elif argumento == '--workers' and i + 1 < len(argumentos):
+            workers = _interpretar_workers(argumentos[i + 1])
+            i += 1
+        i += 1
+
+    try:
+        asyncio.run(ServidorCifras(host, porta, workers).executar())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main_servidor(sys.argv[1:])
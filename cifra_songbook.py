@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from pypdf import PdfWriter, PdfReader
+except ImportError:
+    PdfWriter = None
+    PdfReader = None
+
+from cifra_standalone import CifraClubStandalone, ler_setlist, _interpretar_tom, _interpretar_workers, MAX_WORKERS_PADRAO
+from cifra_pdf import renderizar_pdf, estilo_cifra, template_duas_colunas, desenhar_numero_pagina
+
+
+CAMINHO_SONGBOOK_PADRAO = os.path.join('pdf', 'songbook.pdf')
+MUSICAS_POR_PAGINA_INDICE = 40
+
+
+def _inicializar_worker():
+    estilo_cifra()
+    template_duas_colunas()
+
+
+def _renderizar_musica(indice: int, caminho_pdf: str, cabecalho: dict, linhas: list) -> tuple:
+    inicio = time.perf_counter()
+    paginas = renderizar_pdf(caminho_pdf, cabecalho, linhas)
+    return indice, caminho_pdf, paginas, time.perf_counter() - inicio
+
+
+def _gerar_indice(caminho_pdf: str, entradas: list, paginas_indice: int):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas as canvas_pdf
+
+    canvas = canvas_pdf.Canvas(caminho_pdf, pagesize=A4)
+    for pagina in range(paginas_indice):
+        canvas.setFont('Helvetica-Bold', 16)
+        canvas.drawCentredString(A4[0]/2, A4[1] - 2*cm, "Índice")
+        canvas.setFont('Helvetica', 10)
+        y_pos = A4[1] - 3.2*cm
+
+        inicio = pagina * MUSICAS_POR_PAGINA_INDICE
+        for numero, (titulo, pagina_musica) in enumerate(entradas[inicio:inicio + MUSICAS_POR_PAGINA_INDICE], inicio + 1):
+            canvas.drawString(2*cm, y_pos, f"{numero:>3}. {titulo}")
+            canvas.drawRightString(A4[0] - 2*cm, y_pos, str(pagina_musica))
+            y_pos -= 0.6*cm
+
+        canvas.showPage()
+    canvas.save()
+
+
+def _gerar_numeracao(caminho_pdf: str, primeira: int, ultima: int):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas as canvas_pdf
+
+    canvas = canvas_pdf.Canvas(caminho_pdf, pagesize=A4)
+    for numero in range(primeira, ultima + 1):
+        desenhar_numero_pagina(canvas, numero)
+        canvas.showPage()
+    canvas.save()
+
+
+def _unir_pdfs(caminho_saida: str, pasta_temporaria: str, renderizados: list):
+    paginas_indice = max(1, -(-len(renderizados) // MUSICAS_POR_PAGINA_INDICE))
+
+    entradas = []
+    pagina_atual = paginas_indice + 1
+    for titulo, _, paginas in renderizados:
+        entradas.append((titulo, pagina_atual))
+        pagina_atual += paginas
+
+    caminho_indice = os.path.join(pasta_temporaria, 'indice.pdf')
+    _gerar_indice(caminho_indice, entradas, paginas_indice)
+    caminho_numeracao = os.path.join(pasta_temporaria, 'numeracao.pdf')
+    _gerar_numeracao(caminho_numeracao, paginas_indice + 1, pagina_atual - 1)
+
+    writer = PdfWriter()
+    writer.append(PdfReader(caminho_indice))
+    for (titulo, caminho_pdf, _), (_, pagina) in zip(renderizados, entradas):
+        writer.append(PdfReader(caminho_pdf))
+        writer.add_outline_item(titulo, pagina - 1)
+
+    numeracao = PdfReader(caminho_numeracao)
+    for deslocamento, pagina_numero in enumerate(numeracao.pages):
+        writer.pages[paginas_indice + deslocamento].merge_page(pagina_numero)
+
+    with open(caminho_saida, 'wb') as arquivo:
+        writer.write(arquivo)
+
+    return pagina_atual - 1
+
+
+def gerar_songbook(cifra_club: CifraClubStandalone, musicas: list, caminho_saida: str = CAMINHO_SONGBOOK_PADRAO,
+                   max_workers: int = None) -> dict:
+    pasta_saida = os.path.dirname(caminho_saida)
+    if pasta_saida:
+        os.makedirs(pasta_saida, exist_ok=True)
+
+    pasta_temporaria = tempfile.mkdtemp(prefix='songbook_')
+    tarefas = []
+    for indice, (dados, semitons, tom_destino) in enumerate(musicas):
+        _, cabecalho = cifra_club.preparar_pdf(dados, semitons, tom_destino)
+        cabecalho['numerar_paginas'] = PdfWriter is None
+        caminho_pdf = os.path.join(pasta_temporaria, f"{indice:04d}.pdf")
+        tarefas.append((indice, caminho_pdf, cabecalho, cifra_club.linhas_pdf(dados, cabecalho['semitons'])))
+
+    resultados = [None] * len(tarefas)
+    inicio = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializar_worker) as executor:
+            futuros = {executor.submit(_renderizar_musica, *tarefa): tarefa for tarefa in tarefas}
+            for concluidos, futuro in enumerate(as_completed(futuros), 1):
+                indice, caminho_pdf, cabecalho, _ = futuros[futuro]
+                try:
+                    _, _, paginas, tempo = futuro.result()
+                except Exception as e:
+                    print(f"  [{concluidos}/{len(tarefas)}] ❌ {cabecalho['titulo']}: {e}")
+                    continue
+                resultados[indice] = (cabecalho['titulo'], caminho_pdf, paginas)
+                print(f"  [{concluidos}/{len(tarefas)}] ✅ {cabecalho['titulo']} ({paginas} pág., {tempo:.2f}s)")
+
+        renderizados = [resultado for resultado in resultados if resultado]
+        if not renderizados:
+            return {'erro': 'Nenhuma música foi renderizada'}
+
+        if PdfWriter is None:
+            pasta_musicas = os.path.splitext(caminho_saida)[0]
+            os.makedirs(pasta_musicas, exist_ok=True)
+            for numero, (titulo, caminho_pdf, _) in enumerate(renderizados, 1):
+                nome = f"{numero:03d}_{titulo}.pdf".replace(' ', '_').replace('/', '_')
+                shutil.move(caminho_pdf, os.path.join(pasta_musicas, nome))
+            return {
+                'caminho': pasta_musicas,
+                'musicas': len(renderizados),
+                'tempo': time.perf_counter() - inicio,
+                'aviso': 'pypdf não instalado: os PDFs foram salvos separadamente (pip install pypdf)'
+            }
+
+        paginas = _unir_pdfs(caminho_saida, pasta_temporaria, renderizados)
+        return {
+            'caminho': caminho_saida,
+            'musicas': len(renderizados),
+            'paginas': paginas,
+            'tempo': time.perf_counter() - inicio
+        }
+    finally:
+        shutil.rmtree(pasta_temporaria, ignore_errors=True)
+
+
+def main_songbook(argumentos: list):
+    caminho_setlist = None
+    caminho_saida = CAMINHO_SONGBOOK_PADRAO
+    max_workers = None
+    offline = False
+    usar_cache = True
+
+    i = 0
+    while i < len(argumentos):
+        argumento = argumentos[i].strip()
+        if argumento.lower() == '--songbook' and i + 1 < len(argumentos):
+            caminho_setlist = argumentos[i + 1]
+            i += 1
+        elif argumento.lower() == '--saida' and i + 1 < len(argumentos):
+            caminho_saida = argumentos[i + 1]
+            i += 1
+        elif argumento.lower() == '--workers' and i + 1 < len(argumentos):
+            max_workers = _interpretar_workers(argumentos[i + 1])
+            i += 1
+        elif argumento.lower() == '--offline':
+            offline = True
+        elif argumento.lower() == '--sem-cache':
+            usar_cache = False
+        elif not argumento.startswith('--') and caminho_setlist is None:
+            caminho_setlist = argumento
+        i += 1
+
+    if not caminho_setlist:
+        print("Uso: python cifra_standalone.py --songbook <setlist> [--saida pdf/songbook.pdf] [--workers N] [--offline] [--sem-cache]")
+        sys.exit(1)
+
+    try:
+        itens = ler_setlist(caminho_setlist)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+
+    print(f"\n🔍 Buscando {len(itens)} cifras do setlist '{caminho_setlist}'...")
+    cifra_club = CifraClubStandalone(usar_cache=usar_cache, offline=offline)
+    resultados = cifra_club.buscar_cifras(itens, max_workers=max_workers or MAX_WORKERS_PADRAO)
+
+    musicas = []
+    for item, dados in zip(itens, resultados):
+        if 'erro' in dados:
+            print(f"❌ {item['artista']}/{item['musica']}: {dados['erro']}")
+            continue
+        semitons, tom_destino = _interpretar_tom(item['tom'])
+        musicas.append((dados, semitons, tom_destino))
+
+    if not musicas:
+        print("\n❌ Nenhuma cifra encontrada para o songbook\n")
+        sys.exit(2)
+
+    print(f"\n📚 Gerando songbook com {len(musicas)} músicas...")
+    resultado = gerar_songbook(cifra_club, musicas, caminho_saida, max_workers)
+
+    if 'erro' in resultado:
+        print(f"\n❌ {resultado['erro']}\n")
+        sys.exit(2)
+
+    if resultado.get('aviso'):
+        print(f"\n⚠️  {resultado['aviso']}")
+        print(f"✅ {resultado['musicas']} PDFs salvos em: {resultado['caminho']} ({resultado['tempo']:.2f}s)\n")
+    else:
+        print(f"\n✅ Songbook salvo em: {resultado['caminho']} ({resultado['musicas']} músicas, {resultado['paginas']} páginas, {resultado['tempo']:.2f}s)\n")
+
+
+if __name__ == "__main__":
+    main_songbook(sys.argv[1:])
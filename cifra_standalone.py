@@ -3,23 +3,20 @@
 import sys
 import re
 import os
-import webbrowser
-from pathlib import Path
-import requests
-from bs4 import BeautifulSoup
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted, PageBreak, KeepTogether, Frame, PageTemplate
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus.doctemplate import BaseDocTemplate
-from reportlab.platypus.frames import Frame
-
-
-NOTAS = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-NOTAS_FLAT = ['C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B']
+import threading
+from contextlib import nullcontext
+from cifra_cache import CacheCifras
+from cifra_extracao import extrair_pagina
+from cifra_acordes import (e_linha_de_acordes, grafia_para, interpretar_tom, nome_do_tom, transpor_linha, transpor_nota,
+                           transpor_texto)
+from cifra_documento import DocumentoCifra, TabelaTransposicoes, analisar_cifra, renderizar_em_fluxo
+from cifra_pdf_cache import CachePDF
+from cifra_tonalidade import (detectar_tom, imprimir_recomendacoes, interpretar_extensao, melhor_capotraste,
+                              recomendar_transposicoes, tonalidade_declarada)
+from cifra_transporte import (REQUISICOES_POR_SEGUNDO_PADRAO, TAMANHO_MAXIMO_PADRAO, LeitorResposta, RespostaMuitoGrande,
+                              Transporte)
+
+
 NOTAS_PORTUGUESAS = ['Dó', 'Dó#', 'Ré', 'Ré#', 'Mi', 'Fá', 'Fá#', 'Sol', 'Sol#', 'Lá', 'Lá#', 'Si']
 
 EQUIVALENCIAS = {
@@ -31,39 +28,237 @@ EQUIVALENCIAS = {
 }
 
 
+BASE_URL_PADRAO = "https://www.cifraclub.com.br/"
+MAX_WORKERS_PADRAO = 8
+MAX_POR_HOST_PADRAO = 4
+
+
+def ler_setlist(caminho: str) -> list:
+    itens = []
+    with open(caminho, encoding='utf-8') as arquivo:
+        for numero, linha in enumerate(arquivo, 1):
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+            
+            partes = linha.split()
+            caminho_musica = partes[0].strip('/')
+            if '/' not in caminho_musica:
+                raise ValueError(f"Linha {numero} inválida no setlist: '{linha}' (use artista/musica [tom])")
+            
+            artista, musica = caminho_musica.split('/', 1)
+            tom = partes[1] if len(partes) > 1 else None
+            itens.append({'artista': artista, 'musica': musica, 'tom': tom})
+    
+    return itens
+
+
+def _status_do_erro(e: Exception) -> int:
+    import requests
+    
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        return 404 if e.response.status_code in (404, 410) else 502
+    if isinstance(e, requests.exceptions.Timeout):
+        return 504
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return 503
+    return 502
+
+
 class CifraClubStandalone:
     
-    def __init__(self):
-        self.base_url = "https://www.cifraclub.com.br/"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+    def __init__(self, max_por_host: int = MAX_POR_HOST_PADRAO, cache: CacheCifras = None,
+                 usar_cache: bool = True, offline: bool = False, base_url: str = BASE_URL_PADRAO,
+                 motor_extracao: str = 'auto', usar_indice: bool = True, perfilador=None,
+                 transporte: Transporte = None, biblioteca=None, streaming: bool = True,
+                 tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO, revalidar: bool = False):
+        self.base_url = base_url
+        self.transporte = transporte if transporte is not None else Transporte(max_conexoes=max_por_host)
+        self.max_por_host = self.transporte.max_conexoes
+        self._lock_limites = threading.Lock()
+        if cache is None and (usar_cache or offline):
+            cache = CacheCifras()
+        self.cache = cache
+        self.offline = offline
+        self.motor_extracao = motor_extracao
+        self.transposicoes = None
+        self.usar_indice = usar_indice and cache is not None
+        self.indice = None
+        self.perfilador = perfilador
+        self.biblioteca = biblioteca
+        self.streaming = streaming
+        self.tamanho_maximo = tamanho_maximo
+        self.revalidar = revalidar
+    
+    @property
+    def session(self):
+        return self.transporte.session
+    
+    def _etapa(self, musica: str, nome: str):
+        if self.perfilador is None:
+            return nullcontext()
+        return self.perfilador.etapa(musica, nome)
+    
+    def buscar_cifras(self, musicas: list, max_workers: int = MAX_WORKERS_PADRAO) -> list:
+        if not musicas:
+            return []
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def buscar(item):
+            if isinstance(item, dict):
+                artista, musica = item['artista'], item['musica']
+            else:
+                artista, musica = item[0], item[1]
+            try:
+                return self.buscar_cifra(artista, musica)
+            except Exception as e:
+                return {'erro': f'Erro ao processar cifra: {str(e)}'}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(musicas))) as executor:
+            return list(executor.map(buscar, musicas))
     
     def buscar_cifra(self, artista: str, musica: str) -> dict:
+        dados = self._buscar_cifra(artista, musica)
+        if 'erro' not in dados:
+            self.completar_tom(dados)
+        return dados
+    
+    def _buscar_cifra(self, artista: str, musica: str) -> dict:
         url = f"{self.base_url}{artista}/{musica}"
         
+        chave = CacheCifras.chave(artista, musica)
+        with self._etapa(url, 'cache'):
+            entrada = self.cache.obter(chave) if self.cache is not None else None
+        
+        if entrada and (self.offline or not (self.revalidar or self.cache.expirado(entrada))):
+            return entrada['dados']
+        
+        if self.biblioteca is not None:
+            with self._etapa(url, 'biblioteca'):
+                dados = self.biblioteca.obter(chave)
+            if dados is not None:
+                return dados
+        
+        if self.offline:
+            return {'erro': f'Cifra não encontrada no cache (modo offline): {artista}/{musica}', 'status': 404}
+        
+        cabecalhos = self.cache.cabecalhos_revalidacao(entrada) if entrada else {}
+        
+        import requests
+        
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            with self._etapa(url, 'download'):
+                response = self.transporte.get(url, headers=cabecalhos, stream=self.streaming)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with response:
+                if response.status_code == 304 and entrada:
+                    self.cache.renovar(chave, entrada, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                    return entrada['dados']
+                
+                response.raise_for_status()
+                
+                metricas = self.transporte.metricas if self.streaming else None
+                leitor = LeitorResposta(response, self.tamanho_maximo, metricas=metricas)
+                resultado = {'url': url}
+                try:
+                    resultado.update(self._extrair_dados(response, leitor, url))
+                    leitor.descartar_restante()
+                finally:
+                    if self.perfilador is not None:
+                        self.perfilador.contar_bytes(url, leitor.recebidos)
+            
+            self.completar_tom(resultado)
             
-            resultado = {
-                'url': url,
-                'artista': self._extrair_artista(soup),
-                'musica': self._extrair_musica(soup),
-                'tom_original': self._extrair_tom_original(soup),
-                'cifra': self._extrair_cifra(soup),
-                'youtube_url': self._extrair_youtube(soup)
-            }
+            if self.cache is not None:
+                with self._etapa(url, 'cache'):
+                    self.cache.salvar(chave, resultado, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                with self._etapa(url, 'indexacao'):
+                    self._indexar(chave, resultado)
             
             return resultado
             
-        except requests.exceptions.RequestException as e:
-            return {'erro': f'Erro ao buscar cifra: {str(e)}'}
+        except (requests.exceptions.RequestException, RespostaMuitoGrande) as e:
+            if entrada:
+                return entrada['dados']
+            return {'erro': f'Erro ao buscar cifra: {str(e)}', 'status': _status_do_erro(e)}
         except Exception as e:
-            return {'erro': f'Erro ao processar cifra: {str(e)}'}
+            return {'erro': f'Erro ao processar cifra: {str(e)}', 'status': 500}
+    
+    def obter_indice(self):
+        if self.indice is None and self.usar_indice:
+            from cifra_indice import IndiceCifras
+            with self._lock_limites:
+                if self.indice is None:
+                    self.indice = IndiceCifras.do_cache(self.cache)
+        return self.indice
+    
+    def completar_tom(self, dados: dict) -> dict:
+        if dados.get('tom_original'):
+            return dados
+        with self._etapa(dados.get('url'), 'tonalidade'):
+            tonalidade = detectar_tom(self.documento(dados))
+        if tonalidade is not None:
+            dados['tom_original'] = tonalidade.tom
+            dados['tom_detectado'] = True
+        return dados
+    
+    def sugerir_tons(self, dados: dict, extensao: tuple = None) -> tuple:
+        documento = self.documento(dados)
+        tonalidade = None
+        if not dados.get('tom_detectado'):
+            tonalidade = tonalidade_declarada(dados.get('tom_original'))
+        if tonalidade is None:
+            tonalidade = detectar_tom(documento)
+        return tonalidade, recomendar_transposicoes(documento, tonalidade, extensao)
+    
+    def _indexar(self, chave: str, dados: dict):
+        if not self.usar_indice:
+            return
+        try:
+            self.obter_indice().indexar(chave, dados, self.documento(dados))
+        except Exception:
+            pass
+    
+    def _extrair_dados(self, response, leitor: LeitorResposta, url: str = None) -> dict:
+        if self.motor_extracao != 'bs4':
+            try:
+                with self._etapa(url, 'extracao'):
+                    return extrair_pagina(leitor, response.encoding, self.motor_extracao)
+            except RespostaMuitoGrande:
+                raise
+            except Exception:
+                if leitor.recebidos:
+                    if self.streaming:
+                        response.close()
+                        with self._etapa(url, 'download'):
+                            response = self.transporte.get(url)
+                        response.raise_for_status()
+                        if self.perfilador is not None:
+                            self.perfilador.contar_bytes(url, len(response.content))
+                    leitor = LeitorResposta(response, self.tamanho_maximo)
+        
+        from bs4 import BeautifulSoup
+        
+        with self._etapa(url, 'bs4_parse'):
+            html_text = leitor.ler_tudo().decode(response.encoding or 'utf-8', errors='replace')
+            soup = BeautifulSoup(html_text, 'html.parser')
+        
+        try:
+            with self._etapa(url, 'bs4_campos'):
+                dados = {
+                    'artista': self._extrair_artista(soup),
+                    'musica': self._extrair_musica(soup),
+                    'tom_original': self._extrair_tom_original(soup),
+                    'cifra': self._extrair_cifra(soup)
+                }
+        finally:
+            soup.decompose()
+        
+        with self._etapa(url, 'bs4_youtube'):
+            dados['youtube_url'] = self._extrair_youtube(html_text)
+        
+        return dados
     
     def _extrair_artista(self, soup):
         tag = soup.find('h2', class_='t3')
@@ -97,135 +292,95 @@ class CifraClubStandalone:
             return pre.text.strip()
         return 'Cifra não encontrada'
     
-    def _extrair_youtube(self, soup):
-        try:
-            html_text = str(soup)
-            match = re.search(r'youtube\.com/watch\?v=([A-Za-z0-9_-]+)', html_text)
-            if match:
-                video_id = match.group(1)
-                return f"https://www.youtube.com/watch?v={video_id}"
-            
-            match2 = re.search(r'youtu\.be/([A-Za-z0-9_-]+)', html_text)
-            if match2:
-                video_id = match2.group(1)
-                return f"https://www.youtube.com/watch?v={video_id}"
-        except:
-            pass
+    def _extrair_youtube(self, html_text: str):
+        match = re.search(r'youtube\.com/watch\?v=([A-Za-z0-9_-]+)', html_text)
+        if match:
+            video_id = match.group(1)
+            return f"https://www.youtube.com/watch?v={video_id}"
+        
+        match2 = re.search(r'youtu\.be/([A-Za-z0-9_-]+)', html_text)
+        if match2:
+            video_id = match2.group(1)
+            return f"https://www.youtube.com/watch?v={video_id}"
         return None
     
-    def transpor_cifra(self, cifra: str, semitons: int) -> str:
+    def transpor_cifra(self, cifra: str, semitons: int, tom: str = None) -> str:
         if semitons == 0:
             return cifra
         
-        linhas = cifra.split('\n')
-        linhas_transpostas = []
-        
-        for linha in linhas:
-            if self._e_linha_de_acordes(linha):
-                linha_transposta = self._transpor_linha(linha, semitons)
-            else:
-                linha_transposta = linha
-            linhas_transpostas.append(linha_transposta)
+        return transpor_texto(cifra, semitons, grafia_para(tom, semitons))
+    
+    def grafia(self, dados: dict, semitons: int):
+        return grafia_para(dados.get('tom_original'), semitons)
+    
+    def documento(self, dados: dict) -> DocumentoCifra:
+        documento = dados.get('documento')
+        if documento is None or documento.texto is not dados['cifra']:
+            documento = analisar_cifra(dados['cifra'])
+            dados['documento'] = documento
+        return documento
+    
+    def precalcular_transposicoes(self, dados: dict) -> TabelaTransposicoes:
+        self.transposicoes = TabelaTransposicoes(self.documento(dados), dados.get('tom_original')).iniciar()
+        return self.transposicoes
+    
+    def _tabela_de(self, dados: dict):
+        tabela = self.transposicoes
+        if tabela is not None and tabela.documento is dados.get('documento'):
+            return tabela
+        return None
+    
+    def linhas_da_cifra(self, dados: dict, semitons: int = 0):
+        tabela = self._tabela_de(dados)
+        if tabela is not None:
+            yield from tabela.linhas(semitons)
+            return
         
-        return '\n'.join(linhas_transpostas)
+        grafia = self.grafia(dados, semitons)
+        documento = dados.get('documento')
+        if documento is not None and documento.texto is dados['cifra']:
+            for linha in documento:
+                yield linha.renderizar(semitons, grafia)
+        else:
+            yield from renderizar_em_fluxo(dados['cifra'], semitons, grafia)
+    
+    def _linhas_renderizadas(self, dados: dict, semitons: int) -> list:
+        tabela = self._tabela_de(dados)
+        if tabela is not None:
+            return tabela.linhas(semitons)
+        return self.documento(dados).renderizar_linhas(semitons, self.grafia(dados, semitons))
     
     def _e_linha_de_acordes(self, linha: str) -> bool:
-        linha_limpa = linha.strip()
-        
-        if not linha_limpa or linha_limpa.startswith('[') or len(linha_limpa) < 2:
-            return False
-        
-        if linha.startswith('    ') and not re.match(r'^\s+[A-G][#b]?', linha):
-            return False
-        
-        if linha_limpa.startswith('(') and linha_limpa.endswith(')'):
-            return True
-        
-        if '  ' in linha or '\t' in linha:
-            palavras = linha_limpa.split()
-            if len(palavras) <= 8:
-                acordes = re.findall(r'\b[A-G][#b]?[m]?[0-9]?[^\s]{0,5}\b', linha)
-                if len(acordes) >= max(2, len(palavras) * 0.6):
-                    return True
-        
-        return False
+        return e_linha_de_acordes(linha)
     
     def _transpor_linha(self, linha: str, semitons: int) -> str:
-        padrao = r'([A-G])([#b]?)([^\s]*?)(?=\s|$|/|\))'
-        
-        def transpor_acorde(match):
-            nota_base = match.group(1)
-            acidente = match.group(2) if match.group(2) else ''
-            modificador = match.group(3) if match.group(3) else ''
-            
-            nota_completa = nota_base + acidente.upper()
-            
-            nota_transposta = self._transpor_nota(nota_completa, semitons)
-            
-            if acidente and acidente.islower():
-                if '#' in nota_transposta:
-                    nota_transposta = nota_transposta
-                elif nota_transposta[-1] in ['b', 'B']:
-                    nota_transposta = nota_transposta[:-1] + 'b'
-            
-            return f"{nota_transposta}{modificador}"
-        
-        return re.sub(padrao, transpor_acorde, linha)
+        return transpor_linha(linha, semitons)
     
     def _transpor_nota(self, nota: str, semitons: int) -> str:
-        nota_original = nota
-        nota = nota.upper().replace('B', 'b').upper()
-        
-        if len(nota) > 1 and nota[1] in ['b', 'B']:
-            nota = nota[0] + 'b'
-        
-        if nota in NOTAS:
-            indice = NOTAS.index(nota)
-            usar_sustenido = True
-        elif nota in NOTAS_FLAT:
-            indice = NOTAS_FLAT.index(nota)
-            usar_sustenido = False
-        else:
-            return nota_original
-        
-        novo_indice = (indice + semitons) % 12
-        
-        if usar_sustenido or '#' in nota_original:
-            return NOTAS[novo_indice]
-        else:
-            return NOTAS_FLAT[novo_indice]
+        return transpor_nota(nota, semitons)
     
     def calcular_semitons_entre_tons(self, tom_origem: str, tom_destino: str) -> int:
-        nota_origem = tom_origem.replace('m', '').strip()
-        nota_destino = tom_destino.replace('m', '').strip()
-        
-        nota_origem = nota_origem.upper().replace('B', 'b')
-        nota_destino = nota_destino.upper().replace('B', 'b')
-        
-        indice_origem = None
-        indice_destino = None
-        
-        if nota_origem in NOTAS:
-            indice_origem = NOTAS.index(nota_origem)
-        elif nota_origem in NOTAS_FLAT:
-            indice_origem = NOTAS_FLAT.index(nota_origem)
-        
-        if nota_destino in NOTAS:
-            indice_destino = NOTAS.index(nota_destino)
-        elif nota_destino in NOTAS_FLAT:
-            indice_destino = NOTAS_FLAT.index(nota_destino)
-        
-        if indice_origem is None or indice_destino is None:
+        origem = interpretar_tom(tom_origem)
+        destino = interpretar_tom(tom_destino)
+        if origem is None or destino is None:
             return 0
         
-        semitons = (indice_destino - indice_origem) % 12
+        semitons = (destino[0] - origem[0]) % 12
         
         if semitons > 6:
             semitons = semitons - 12
         
         return semitons
     
-    def exibir_cifra(self, dados: dict, semitons: int = 0, tom_destino: str = None):
+    def melhor_capo(self, dados: dict, semitons: int = 0) -> int:
+        _, opcoes = self.sugerir_tons(dados)
+        pestanas_por_forma = [0] * 12
+        for opcao in opcoes:
+            pestanas_por_forma[opcao['semitons'] % 12] = opcao['pestanas']
+        return melhor_capotraste(pestanas_por_forma, semitons)[0]
+    
+    def exibir_cifra(self, dados: dict, semitons: int = 0, tom_destino: str = None, linhas_por_pagina: int = None,
+                     capo: int = None):
         if 'erro' in dados:
             print(f"\n❌ {dados['erro']}\n")
             return
@@ -239,17 +394,15 @@ class CifraClubStandalone:
         
         if dados.get('tom_original'):
             tom_exibir = dados['tom_original']
+            detectado = ' (detectado)' if dados.get('tom_detectado') else ''
             if semitons != 0:
-                tom_transposto = self._transpor_nota(
-                    dados['tom_original'].split('m')[0], 
-                    semitons
-                )
-                sufixo = 'm' if 'm' in dados['tom_original'] else ''
-                tom_exibir = f"{tom_transposto}{sufixo}"
-                print(f"Tom original: {dados['tom_original']} → Tom atual: {tom_exibir}")
+                tom_exibir = self.tom_transposto(dados, semitons)
+                print(f"Tom original: {dados['tom_original']}{detectado} → Tom atual: {tom_exibir}")
                 print(f"Transposição: {'+' if semitons > 0 else ''}{semitons} semitons")
             else:
-                print(f"Tom: {tom_exibir}")
+                print(f"Tom: {tom_exibir}{detectado}")
+            if capo:
+                print(f"Capotraste na {capo}ª casa — formas de {self.tom_transposto(dados, semitons - capo)}")
         
         if dados.get('youtube_url'):
             print(f"YouTube: {dados['youtube_url']}")
@@ -257,130 +410,79 @@ class CifraClubStandalone:
         print(f"Fonte: {dados['url']}")
         print("="*70 + "\n")
         
-        cifra = dados['cifra']
-        if semitons != 0:
-            cifra = self.transpor_cifra(cifra, semitons)
-        
-        print(cifra)
+        with self._etapa(dados.get('url'), 'exibicao'):
+            linhas = self.linhas_da_cifra(dados, semitons - (capo or 0))
+            try:
+                exibidas = 0
+                linha = next(linhas, None)
+                while linha is not None:
+                    print(linha)
+                    exibidas += 1
+                    linha = next(linhas, None)
+                    if linha is not None and linhas_por_pagina and exibidas % linhas_por_pagina == 0:
+                        if input("-- Enter para continuar, q para parar -- ").strip().lower() == 'q':
+                            break
+            finally:
+                linhas.close()
         print("\n" + "="*70 + "\n")
     
-    def salvar_pdf(self, dados: dict, semitons: int = 0, tom_destino: str = None, abrir_automaticamente: bool = False):
-        if 'erro' in dados:
-            print(f"\n❌ {dados['erro']}\n")
-            return None
+    def tom_transposto(self, dados: dict, semitons: int):
+        tom_original = dados.get('tom_original')
+        if not tom_original or semitons == 0:
+            return tom_original
+        
+        tonalidade = interpretar_tom(tom_original)
+        if tonalidade is None:
+            return tom_original
+        return nome_do_tom(tonalidade[0] + semitons, tonalidade[1])
+    
+    def preparar_pdf(self, dados: dict, semitons: int = 0, tom_destino: str = None, capo: int = None) -> tuple:
+        from cifra_pdf import montar_cabecalho
         
         if tom_destino and dados.get('tom_original'):
             semitons = self.calcular_semitons_entre_tons(dados['tom_original'], tom_destino)
         
-        pasta_pdf = "pdf"
-        if not os.path.exists(pasta_pdf):
-            os.makedirs(pasta_pdf)
-        
-        tom_exibir = dados.get('tom_original', 'SemTom')
-        if semitons != 0 and dados.get('tom_original'):
-            tom_transposto = self._transpor_nota(
-                dados['tom_original'].split('m')[0], 
-                semitons
-            )
-            sufixo = 'm' if 'm' in dados['tom_original'] else ''
-            tom_exibir = f"{tom_transposto}{sufixo}"
-        
-        nome_arquivo = f"{dados['artista']}_{dados['musica']}_{tom_exibir}.pdf"
-        nome_arquivo = nome_arquivo.replace(' ', '_').replace('/', '_')
-        caminho_pdf = os.path.join(pasta_pdf, nome_arquivo)
+        tom_exibir = self.tom_transposto(dados, semitons) or dados.get('tom_original', 'SemTom')
+        
+        nome_arquivo = f"{dados['artista']}_{dados['musica']}_{tom_exibir}"
+        if capo:
+            nome_arquivo += f"_capo{capo}"
+        nome_arquivo = f"{nome_arquivo}.pdf".replace(' ', '_').replace('/', '_')
         
-        cifra = dados['cifra']
-        if semitons != 0:
-            cifra = self.transpor_cifra(cifra, semitons)
+        tom_formas = self.tom_transposto(dados, semitons - capo) if capo else None
+        return nome_arquivo, montar_cabecalho(dados, semitons, tom_exibir, capo, tom_formas)
+    
+    def linhas_pdf(self, dados: dict, semitons: int) -> list:
+        tipos = [linha.tipo for linha in self.documento(dados).linhas]
+        return list(zip(tipos, self._linhas_renderizadas(dados, semitons)))
+    
+    def salvar_pdf(self, dados: dict, semitons: int = 0, tom_destino: str = None, abrir_automaticamente: bool = False,
+                   capo: int = None):
+        if 'erro' in dados:
+            print(f"\n❌ {dados['erro']}\n")
+            return None
         
-        frame_width = (A4[0] - 4*cm) / 2
-        frame_height = A4[1] - 7*cm
+        pasta_pdf = "pdf"
+        os.makedirs(pasta_pdf, exist_ok=True)
         
-        frame1 = Frame(1.5*cm, 2*cm, frame_width, frame_height, id='col1', 
-                      leftPadding=0, rightPadding=10, topPadding=0, bottomPadding=0)
-        frame2 = Frame(1.5*cm + frame_width + 1*cm, 2*cm, frame_width, frame_height, id='col2',
-                      leftPadding=10, rightPadding=0, topPadding=0, bottomPadding=0)
+        from cifra_pdf import LAYOUT_PDF, renderizar_pdf
         
-        def header_footer(canvas, doc):
-            canvas.saveState()
-            
-            canvas.setFont('Helvetica-Bold', 14)
-            title = f"{dados['musica']} - {dados['artista']}"
-            canvas.drawCentredString(A4[0]/2, A4[1] - 1.5*cm, title)
-            
-            canvas.setFont('Helvetica', 9)
-            y_pos = A4[1] - 2*cm
-            
-            if dados.get('tom_original'):
-                if semitons != 0:
-                    info_tom = f"Tom original: {dados['tom_original']} → Tom atual: {tom_exibir} ({'+' if semitons > 0 else ''}{semitons} semitons)"
-                else:
-                    info_tom = f"Tom: {tom_exibir}"
-                canvas.drawCentredString(A4[0]/2, y_pos, info_tom)
-                y_pos -= 0.4*cm
-            
-            if dados.get('youtube_url'):
-                canvas.drawCentredString(A4[0]/2, y_pos, f"YouTube: {dados['youtube_url']}")
-                y_pos -= 0.4*cm
-            
-            canvas.setFont('Helvetica', 8)
-            canvas.drawCentredString(A4[0]/2, y_pos, f"Fonte: {dados['url']}")
-            
-            canvas.setFont('Helvetica', 8)
-            canvas.drawCentredString(A4[0]/2, 1*cm, f"Página {doc.page}")
-            
-            canvas.restoreState()
-        
-        template = PageTemplate(id='TwoCol', frames=[frame1, frame2], onPage=header_footer)
-        doc = SimpleDocTemplate(caminho_pdf, pagesize=A4,
-                                rightMargin=1.5*cm, leftMargin=1.5*cm,
-                                topMargin=4*cm, bottomMargin=1.5*cm)
-        doc.addPageTemplates([template])
-        
-        story = []
-        styles = getSampleStyleSheet()
-        
-        code_style = ParagraphStyle(
-            'Code',
-            parent=styles['Code'],
-            fontSize=8,
-            fontName='Courier',
-            leftIndent=0,
-            rightIndent=0,
-            spaceAfter=2,
-            spaceBefore=0,
-            leading=10,
-            keepWithNext=False
-        )
-        
-        linhas = cifra.split('\n')
-        i = 0
-        while i < len(linhas):
-            linha = linhas[i]
-            
-            if linha.strip():
-                is_section = linha.strip().startswith('[')
-                is_chord_line = self._e_linha_de_acordes(linha)
-                
-                if is_section:
-                    if i > 0:
-                        story.append(Spacer(1, 0.3*cm))
-                    story.append(Preformatted(linha, code_style))
-                elif is_chord_line and i + 1 < len(linhas) and linhas[i + 1].strip() and not linhas[i + 1].strip().startswith('['):
-                    combined = linha + '\n' + linhas[i + 1]
-                    story.append(KeepTogether([Preformatted(combined, code_style)]))
-                    i += 1
-                else:
-                    story.append(Preformatted(linha, code_style))
-            else:
-                story.append(Spacer(1, 0.15*cm))
-            
-            i += 1
+        nome_arquivo, cabecalho = self.preparar_pdf(dados, semitons, tom_destino, capo)
+        caminho_pdf = os.path.join(pasta_pdf, nome_arquivo)
         
-        doc.build(story)
+        cache_pdf = CachePDF(pasta_pdf)
+        chave = CachePDF.chave(dados['cifra'], cabecalho, LAYOUT_PDF)
+        with cache_pdf.lock_arquivo(nome_arquivo):
+            if not cache_pdf.valido(nome_arquivo, chave):
+                with self._etapa(dados.get('url'), 'pdf_linhas'):
+                    linhas = self.linhas_pdf(dados, cabecalho['semitons'] - (cabecalho['capo'] or 0))
+                with self._etapa(dados.get('url'), 'pdf_render'):
+                    paginas = cache_pdf.publicar(nome_arquivo, lambda caminho: renderizar_pdf(caminho, cabecalho, linhas))
+                cache_pdf.registrar(nome_arquivo, chave, cabecalho, paginas)
         
         if abrir_automaticamente:
             try:
+                import webbrowser
                 caminho_absoluto = os.path.abspath(caminho_pdf)
                 webbrowser.open(f'file:///{caminho_absoluto}')
             except:
@@ -389,9 +491,248 @@ class CifraClubStandalone:
         return caminho_pdf
 
 
+def linhas_do_terminal() -> int:
+    import shutil
+    return max(5, shutil.get_terminal_size().lines - 2)
+
+
+def _interpretar_tamanho(argumento: str) -> int:
+    try:
+        megabytes = float(argumento)
+    except ValueError:
+        megabytes = -1
+    if megabytes <= 0:
+        print(f"\n❌ Tamanho máximo inválido: '{argumento}' (use o limite em MB, ex.: 8)\n")
+        sys.exit(1)
+    return int(megabytes * 1024 * 1024)
+
+
+def _interpretar_workers(argumento: str) -> int:
+    try:
+        workers = int(argumento)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        print(f"\n❌ Número de workers inválido: '{argumento}' (use um inteiro a partir de 1)\n")
+        sys.exit(1)
+    return workers
+
+
+def _interpretar_taxa(argumento: str) -> float:
+    try:
+        taxa = float(argumento)
+    except ValueError:
+        taxa = -1.0
+    if not 0 <= taxa < float('inf'):
+        print(f"\n❌ Taxa inválida: '{argumento}' (use requisições por segundo, ex.: 4; 0 desliga o limite)\n")
+        sys.exit(1)
+    return taxa
+
+
+def _interpretar_tom(argumento):
+    if argumento is None:
+        return 0, None
+    try:
+        return int(argumento), None
+    except ValueError:
+        return 0, argumento
+
+
+def _opcoes_perfil(argumentos: list) -> tuple:
+    restantes = []
+    ativo = False
+    saida = None
+    caminho_cprofile = None
+    
+    i = 0
+    while i < len(argumentos):
+        argumento = argumentos[i].strip().lower()
+        if argumento == '--profile':
+            ativo = True
+        elif argumento == '--profile-saida' and i + 1 < len(argumentos):
+            ativo = True
+            saida = argumentos[i + 1]
+            i += 1
+        elif argumento == '--cprofile' and i + 1 < len(argumentos):
+            ativo = True
+            caminho_cprofile = argumentos[i + 1]
+            i += 1
+        else:
+            restantes.append(argumentos[i])
+        i += 1
+    
+    if not ativo:
+        return None, None, restantes
+    
+    from cifra_perfil import Perfilador
+    return Perfilador(caminho_cprofile=caminho_cprofile), saida, restantes
+
+
+def _finalizar_perfil(perfilador, saida: str):
+    perfilador.finalizar()
+    perfilador.imprimir_resumo()
+    if saida:
+        perfilador.exportar(saida)
+        print(f"📊 Perfil salvo em: {saida}", file=sys.stderr)
+    if perfilador.caminho_cprofile:
+        print(f"📊 cProfile salvo em: {perfilador.caminho_cprofile} (veja com: python -m pstats {perfilador.caminho_cprofile})", file=sys.stderr)
+
+
+def _opcao_biblioteca(argumentos: list) -> tuple:
+    opcoes = [argumento.strip().lower() for argumento in argumentos]
+    if '--biblioteca' not in opcoes:
+        return None, argumentos
+    
+    posicao = opcoes.index('--biblioteca')
+    if posicao + 1 >= len(argumentos):
+        print("Uso: --biblioteca <arquivo.cifras>")
+        sys.exit(1)
+    
+    from cifra_biblioteca import BibliotecaCifras, ErroBiblioteca
+    try:
+        biblioteca = BibliotecaCifras(argumentos[posicao + 1], somente_leitura=True)
+    except ErroBiblioteca as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+    return biblioteca, argumentos[:posicao] + argumentos[posicao + 2:]
+
+
+def main_setlist(argumentos: list, perfilador=None, biblioteca=None):
+    caminho_setlist = None
+    salvar_em_pdf = False
+    max_workers = MAX_WORKERS_PADRAO
+    offline = False
+    usar_cache = True
+    requisicoes_por_segundo = REQUISICOES_POR_SEGUNDO_PADRAO
+    tamanho_maximo = TAMANHO_MAXIMO_PADRAO
+    
+    i = 0
+    while i < len(argumentos):
+        argumento = argumentos[i].strip()
+        if argumento.lower() == '--setlist' and i + 1 < len(argumentos):
+            caminho_setlist = argumentos[i + 1]
+            i += 1
+        elif argumento.lower() == '--workers' and i + 1 < len(argumentos):
+            max_workers = _interpretar_workers(argumentos[i + 1])
+            i += 1
+        elif argumento.lower() == '--pdf':
+            salvar_em_pdf = True
+        elif argumento.lower() == '--offline':
+            offline = True
+        elif argumento.lower() == '--sem-cache':
+            usar_cache = False
+        elif argumento.lower() == '--taxa' and i + 1 < len(argumentos):
+            requisicoes_por_segundo = _interpretar_taxa(argumentos[i + 1])
+            i += 1
+        elif argumento.lower() == '--tamanho-maximo' and i + 1 < len(argumentos):
+            tamanho_maximo = _interpretar_tamanho(argumentos[i + 1])
+            i += 1
+        i += 1
+    
+    if not caminho_setlist:
+        print("Uso: python cifra_standalone.py --setlist <arquivo> [--workers N] [--taxa N] [--tamanho-maximo MB] [--pdf] [--offline] [--sem-cache]")
+        sys.exit(1)
+    
+    try:
+        itens = ler_setlist(caminho_setlist)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+    
+    print(f"\n🔍 Buscando {len(itens)} cifras do setlist '{caminho_setlist}'...")
+    
+    transporte = Transporte(max_conexoes=MAX_POR_HOST_PADRAO, requisicoes_por_segundo=requisicoes_por_segundo)
+    cifra_club = CifraClubStandalone(usar_cache=usar_cache, offline=offline, perfilador=perfilador,
+                                     transporte=transporte, biblioteca=biblioteca, tamanho_maximo=tamanho_maximo)
+    resultados = cifra_club.buscar_cifras(itens, max_workers=max_workers)
+    
+    falhas = 0
+    for item, dados in zip(itens, resultados):
+        semitons, tom_destino = _interpretar_tom(item['tom'])
+        if 'erro' in dados:
+            falhas += 1
+            print(f"\n❌ {item['artista']}/{item['musica']}: {dados['erro']}\n")
+            continue
+        
+        cifra_club.exibir_cifra(dados, semitons=semitons, tom_destino=tom_destino)
+        
+        if salvar_em_pdf:
+            caminho = cifra_club.salvar_pdf(dados, semitons=semitons, tom_destino=tom_destino)
+            if caminho:
+                print(f"✅ PDF salvo em: {caminho}\n")
+    
+    print(f"🎶 Setlist concluído: {len(itens) - falhas} de {len(itens)} cifras encontradas")
+    metricas = transporte.metricas.resumo()
+    if metricas['requisicoes']:
+        print(f"🌐 {metricas['requisicoes']} downloads, {metricas['repeticoes']} novas tentativas, "
+              f"{metricas['bytes_recebidos'] / 1024:.0f} KB recebidos, latência média {metricas['latencia_media_ms']:.0f} ms "
+              f"(p95 {metricas['latencia_p95_ms']:.0f} ms)")
+    if falhas:
+        sys.exit(2)
+
+
 def main():
-    if len(sys.argv) < 3:
-        print("Uso: python cifra_standalone.py <artista> <musica> [semitons|tom] [--pdf] [--abrir]")
+    opcoes = [argumento.lower() for argumento in sys.argv[1:]]
+    
+    if '--songbook' in opcoes:
+        from cifra_songbook import main_songbook
+        main_songbook(sys.argv[1:])
+        return
+    
+    if '--sincronizar' in opcoes:
+        from cifra_sync import main_sincronizar
+        main_sincronizar(sys.argv[1:])
+        return
+    
+    if '--servidor' in opcoes:
+        from cifra_servidor import main_servidor
+        main_servidor(sys.argv[1:])
+        return
+    
+    if '--tons' in opcoes:
+        from cifra_tonalidade import main_tonalidade
+        main_tonalidade(sys.argv[1:])
+        return
+    
+    if any(opcao in opcoes for opcao in ('--buscar', '--titulo', '--progressao', '--reindexar')):
+        from cifra_indice import main_indice
+        main_indice(sys.argv[1:])
+        return
+    
+    if '--biblioteca' in opcoes:
+        from cifra_biblioteca import ACOES_BIBLIOTECA, main_biblioteca
+        posicao = opcoes.index('--biblioteca')
+        if posicao + 1 < len(opcoes) and opcoes[posicao + 1] in ACOES_BIBLIOTECA:
+            main_biblioteca(sys.argv[1:])
+            return
+    
+    if '--pdf-cache' in opcoes:
+        from cifra_pdf_cache import main_cache_pdf
+        posicao = opcoes.index('--pdf-cache')
+        main_cache_pdf(sys.argv[posicao + 2:])
+        return
+    
+    perfilador, saida_perfil, argumentos = _opcoes_perfil(sys.argv[1:])
+    if perfilador is None:
+        _executar(argumentos)
+        return
+    
+    perfilador.iniciar()
+    try:
+        _executar(argumentos, perfilador)
+    finally:
+        _finalizar_perfil(perfilador, saida_perfil)
+
+
+def _executar(argumentos: list, perfilador=None):
+    biblioteca, argumentos = _opcao_biblioteca(argumentos)
+    
+    if '--setlist' in [argumento.lower() for argumento in argumentos]:
+        main_setlist(argumentos, perfilador, biblioteca)
+        return
+    
+    if len(argumentos) < 2:
+        print("Uso: python cifra_standalone.py <artista> <musica> [semitons|tom] [--pdf] [--abrir] [--offline] [--sem-cache] [--paginar] [--capo [N]] [--sugerir-tom] [--voz A2-E4] [--profile]")
         print("\nExemplos:")
         print("  python cifra_standalone.py coldplay the-scientist")
         print("  python cifra_standalone.py coldplay the-scientist 2")
@@ -403,53 +744,122 @@ def main():
         print("  python cifra_standalone.py coldplay the-scientist C --pdf")
         print("  python cifra_standalone.py coldplay the-scientist C --pdf --abrir")
         print("  python cifra_standalone.py coldplay the-scientist 2 --abrir")
+        print("  python cifra_standalone.py --setlist setlist.txt --workers 8 --pdf")
+        print("  python cifra_standalone.py --songbook setlist.txt --saida pdf/songbook.pdf")
+        print("  python cifra_standalone.py --sincronizar setlist.txt --assistir 600")
+        print("  python cifra_standalone.py --servidor --porta 8000 --workers 4")
+        print("  python cifra_standalone.py --titulo \"the scientist\"")
+        print("  python cifra_standalone.py --progressao I V vi IV")
+        print("  python cifra_standalone.py coldplay the-scientist --sugerir-tom --voz A2-E4")
+        print("  python cifra_standalone.py coldplay the-scientist Bb --capo")
+        print("  python cifra_standalone.py coldplay the-scientist --pdf --profile --profile-saida perfil.jsonl")
         print("\nDica:")
         print("  - Use números positivos/negativos para transpor por semitons")
         print("  - Use notas (C, D, E, F, G, A, B) com # ou b para transpor para um tom específico")
         print("  - Adicione 'm' após a nota para tons menores (Cm, Dm, etc.)")
         print("  - Use --pdf para salvar em PDF na pasta /pdf")
         print("  - Use --abrir para salvar e abrir o PDF automaticamente")
+        print("  - Use --offline para usar apenas cifras já salvas no cache local")
+        print("  - Use --sem-cache para sempre baixar a cifra novamente")
+        print("  - Use --tamanho-maximo <MB> para recusar páginas maiores que o limite (padrão: 8 MB)")
+        print("  - Use --paginar para ver cifras longas uma tela por vez")
+        print("  - Use --capo para tocar no tom escolhido com o capotraste que evita mais pestanas (ou --capo N para fixar a casa)")
+        print("  - Use --sugerir-tom para ver os tons com menos pestanas; com --voz <grave-aguda> considera sua extensão vocal")
+        print("  - Use --tons para conferir o tom de todas as cifras do cache (ou de uma --biblioteca)")
+        print("  - Use --setlist <arquivo> para buscar várias músicas em paralelo (uma 'artista/musica [tom]' por linha)")
+        print("  - Use --pdf-cache listar|podar [dias] para ver ou limpar os PDFs já gerados")
+        print("  - Use --biblioteca exportar|importar|info <arquivo> para levar suas cifras para outro computador")
+        print("  - Use --biblioteca <arquivo> para buscar as cifras primeiro numa biblioteca exportada")
+        print("  - Use --buscar <texto>, --titulo <nome> ou --progressao <graus> para pesquisar as cifras já baixadas")
+        print("  - Use --servidor para iniciar o serviço HTTP/JSON (rotas /cifra, /transpor e /pdf)")
+        print("  - Use --sincronizar <arquivo> para gerar só os PDFs do setlist que mudaram; com --assistir repete a cada N segundos")
+        print("  - Use --songbook <arquivo> para gerar um único PDF com índice a partir de um setlist")
+        print("  - Use --profile para ver o tempo de cada etapa; --profile-saida <arquivo.jsonl|.prom> e --cprofile <arquivo.prof> exportam os dados")
         sys.exit(1)
     
-    artista = sys.argv[1]
-    musica = sys.argv[2]
+    artista = argumentos[0]
+    musica = argumentos[1]
     
     tom_destino = None
     semitons = 0
     salvar_em_pdf = False
     abrir_pdf = False
+    offline = False
+    usar_cache = True
+    linhas_por_pagina = None
+    sugerir_tom = False
+    extensao = None
+    capo = None
+    tamanho_maximo = TAMANHO_MAXIMO_PADRAO
     
-    if len(sys.argv) > 3:
-        for i in range(3, len(sys.argv)):
-            argumento = sys.argv[i].strip()
+    if len(argumentos) > 2:
+        i = 2
+        while i < len(argumentos):
+            argumento = argumentos[i].strip()
             
             if argumento.lower() == '--pdf':
                 salvar_em_pdf = True
             elif argumento.lower() == '--abrir':
                 salvar_em_pdf = True
                 abrir_pdf = True
+            elif argumento.lower() == '--offline':
+                offline = True
+            elif argumento.lower() == '--sem-cache':
+                usar_cache = False
+            elif argumento.lower() == '--paginar':
+                linhas_por_pagina = linhas_do_terminal()
+            elif argumento.lower() == '--capo':
+                capo = 'auto'
+                if i + 1 < len(argumentos) and argumentos[i + 1].isdigit():
+                    capo = int(argumentos[i + 1])
+                    i += 1
+            elif argumento.lower() == '--sugerir-tom':
+                sugerir_tom = True
+            elif argumento.lower() == '--voz' and i + 1 < len(argumentos):
+                sugerir_tom = True
+                try:
+                    extensao = interpretar_extensao(argumentos[i + 1])
+                except ValueError as e:
+                    print(f"\n❌ {e}\n")
+                    sys.exit(1)
+                i += 1
+            elif argumento.lower() == '--tamanho-maximo' and i + 1 < len(argumentos):
+                tamanho_maximo = _interpretar_tamanho(argumentos[i + 1])
+                i += 1
             else:
                 try:
                     semitons = int(argumento)
                 except ValueError:
                     tom_destino = argumento
+            i += 1
     
     print(f"\n🔍 Buscando cifra de '{musica}' - {artista}...")
     
-    cifra_club = CifraClubStandalone()
+    cifra_club = CifraClubStandalone(usar_cache=usar_cache, offline=offline, perfilador=perfilador,
+                                     biblioteca=biblioteca, tamanho_maximo=tamanho_maximo)
     dados = cifra_club.buscar_cifra(artista, musica)
     
+    if tom_destino and 'erro' not in dados and dados.get('tom_original'):
+        semitons = cifra_club.calcular_semitons_entre_tons(dados['tom_original'], tom_destino)
+        tom_destino = None
+    if capo == 'auto':
+        capo = cifra_club.melhor_capo(dados, semitons) if 'erro' not in dados else None
+    
     if tom_destino:
-        cifra_club.exibir_cifra(dados, tom_destino=tom_destino)
+        cifra_club.exibir_cifra(dados, tom_destino=tom_destino, linhas_por_pagina=linhas_por_pagina)
     else:
-        cifra_club.exibir_cifra(dados, semitons=semitons)
+        cifra_club.exibir_cifra(dados, semitons=semitons, linhas_por_pagina=linhas_por_pagina, capo=capo)
+    
+    if sugerir_tom and 'erro' not in dados:
+        tonalidade, opcoes = cifra_club.sugerir_tons(dados, extensao)
+        imprimir_recomendacoes(tonalidade, opcoes, dados.get('tom_detectado'))
     
     if salvar_em_pdf:
         print("\n💾 Salvando em PDF...")
         if tom_destino:
             caminho = cifra_club.salvar_pdf(dados, tom_destino=tom_destino, abrir_automaticamente=abrir_pdf)
         else:
-            caminho = cifra_club.salvar_pdf(dados, semitons=semitons, abrir_automaticamente=abrir_pdf)
+            caminho = cifra_club.salvar_pdf(dados, semitons=semitons, abrir_automaticamente=abrir_pdf, capo=capo)
         
         if caminho:
             if abrir_pdf:
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cifra_cache import CacheCifras
+from cifra_pdf_cache import PASTA_PDF_PADRAO, CachePDF
+from cifra_standalone import (MAX_POR_HOST_PADRAO, MAX_WORKERS_PADRAO, CifraClubStandalone, _interpretar_taxa,
+                              _interpretar_tom, _interpretar_workers, ler_setlist)
+from cifra_transporte import REQUISICOES_POR_SEGUNDO_PADRAO, Transporte
+
+
+INTERVALO_PADRAO = 300
+VERIFICACAO_SETLIST = 1.0
+CAMPOS_CONTEUDO = ('artista', 'musica', 'tom_original', 'cifra', 'youtube_url')
+
+MOTIVO_NOVA = 'nova no setlist'
+MOTIVO_CIFRA = 'cifra mudou'
+MOTIVO_TOM = 'tom mudou'
+MOTIVO_PDF = 'PDF ausente ou desatualizado'
+MOTIVO_FORCADO = 'regeneração forçada'
+
+
+def caminho_estado(caminho_setlist: str) -> str:
+    pasta, nome = os.path.split(os.path.abspath(caminho_setlist))
+    return os.path.join(pasta, f".{nome}.sync.json")
+
+
+def hash_conteudo(dados: dict) -> str:
+    conteudo = json.dumps({campo: dados.get(campo) for campo in CAMPOS_CONTEUDO}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def _chaves_do_setlist(itens: list) -> list:
+    ocorrencias = {}
+    chaves = []
+    for item in itens:
+        chave = CacheCifras.chave(item['artista'], item['musica'])
+        ocorrencias[chave] = ocorrencias.get(chave, 0) + 1
+        chaves.append(chave if ocorrencias[chave] == 1 else f"{chave}#{ocorrencias[chave]}")
+    return chaves
+
+
+class SincronizadorSetlist:
+
+    def __init__(self, cifra_club: CifraClubStandalone, caminho_setlist: str, pasta_pdf: str = PASTA_PDF_PADRAO,
+                 max_workers: int = MAX_WORKERS_PADRAO, forcar: bool = False):
+        self.cifra_club = cifra_club
+        self.caminho_setlist = caminho_setlist
+        self.caminho_estado = caminho_estado(caminho_setlist)
+        self.cache_pdf = CachePDF(pasta_pdf)
+        self.max_workers = max_workers
+        self.forcar = forcar
+
+    def estado(self) -> dict:
+        try:
+            with open(self.caminho_estado, encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _salvar_estado(self, estado: dict):
+        pasta = os.path.dirname(self.caminho_estado)
+        descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(estado, arquivo, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temporario, self.caminho_estado)
+        except BaseException:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            raise
+
+    def _motivo(self, anterior: dict, conteudo: str, tom: str, nome_arquivo: str, chave_pdf: str) -> str:
+        if self.forcar:
+            return MOTIVO_FORCADO
+        if not anterior:
+            return MOTIVO_NOVA
+        if anterior.get('hash') != conteudo:
+            return MOTIVO_CIFRA
+        if anterior.get('tom') != tom:
+            return MOTIVO_TOM
+        if anterior.get('pdf') != nome_arquivo or not self.cache_pdf.valido(nome_arquivo, chave_pdf):
+            return MOTIVO_PDF
+        return None
+
+    def sincronizar(self) -> dict:
+        from cifra_pdf import LAYOUT_PDF
+        from cifra_songbook import _inicializar_worker, _renderizar_musica
+
+        inicio = time.perf_counter()
+        itens = ler_setlist(self.caminho_setlist)
+        chaves = _chaves_do_setlist(itens)
+        estado = self.estado()
+        resumo = {'geradas': [], 'puladas': [], 'erros': [], 'removidas': []}
+
+        resultados = self.cifra_club.buscar_cifras(itens, max_workers=self.max_workers)
+
+        novo_estado = {}
+        tarefas = []
+        for chave, item, dados in zip(chaves, itens, resultados):
+            rotulo = f"{item['artista']}/{item['musica']}"
+            anterior = estado.get(chave)
+            if 'erro' in dados:
+                resumo['erros'].append((rotulo, dados['erro']))
+                if anterior:
+                    novo_estado[chave] = anterior
+                continue
+
+            semitons, tom_destino = _interpretar_tom(item['tom'])
+            nome_arquivo, cabecalho = self.cifra_club.preparar_pdf(dados, semitons, tom_destino)
+            chave_pdf = CachePDF.chave(dados['cifra'], cabecalho, LAYOUT_PDF)
+            conteudo = hash_conteudo(dados)
+            entrada = {'hash': conteudo, 'tom': item['tom'], 'pdf': nome_arquivo, 'verificado_em': time.time()}
+
+            motivo = self._motivo(anterior, conteudo, item['tom'], nome_arquivo, chave_pdf)
+            if motivo is None:
+                entrada['gerado_em'] = anterior.get('gerado_em')
+                novo_estado[chave] = entrada
+                resumo['puladas'].append((rotulo, nome_arquivo))
+                continue
+
+            if anterior and anterior.get('pdf') and anterior['pdf'] != nome_arquivo:
+                resumo['removidas'].append(anterior['pdf'])
+            linhas = self.cifra_club.linhas_pdf(dados, cabecalho['semitons'])
+            tarefas.append((chave, rotulo, motivo, nome_arquivo, chave_pdf, cabecalho, linhas, entrada, anterior))
+
+        por_arquivo = {}
+        for indice, tarefa in enumerate(tarefas):
+            por_arquivo.setdefault(tarefa[3], []).append(indice)
+
+        if por_arquivo:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(por_arquivo)),
+                                     initializer=_inicializar_worker) as executor:
+                futuros = {}
+                for nome_arquivo, indices in por_arquivo.items():
+                    _, _, _, _, _, cabecalho, linhas, _, _ = tarefas[indices[0]]
+                    temporario = self.cache_pdf.temporario()
+                    futuro = executor.submit(_renderizar_musica, indices[0], temporario, cabecalho, linhas)
+                    futuros[futuro] = (nome_arquivo, temporario)
+
+                for futuro in as_completed(futuros):
+                    nome_arquivo, temporario = futuros[futuro]
+                    indices = por_arquivo[nome_arquivo]
+                    _, _, _, _, chave_pdf, cabecalho, _, _, _ = tarefas[indices[0]]
+                    try:
+                        _, _, paginas, tempo = futuro.result()
+                        with self.cache_pdf.lock_arquivo(nome_arquivo):
+                            self.cache_pdf.publicar_temporario(nome_arquivo, temporario)
+                            self.cache_pdf.registrar(nome_arquivo, chave_pdf, cabecalho, paginas)
+                    except Exception as e:
+                        self.cache_pdf.descartar_temporario(temporario)
+                        for indice in indices:
+                            chave, rotulo, _, _, _, _, _, _, anterior = tarefas[indice]
+                            resumo['erros'].append((rotulo, f"Erro ao gerar PDF: {e}"))
+                            if anterior:
+                                novo_estado[chave] = anterior
+                        continue
+                    for indice in indices:
+                        chave, rotulo, motivo, _, _, _, _, entrada, _ = tarefas[indice]
+                        entrada['gerado_em'] = time.time()
+                        novo_estado[chave] = entrada
+                        resumo['geradas'].append((indice, rotulo, nome_arquivo, motivo, tempo))
+            resumo['geradas'] = [gerada[1:] for gerada in sorted(resumo['geradas'])]
+
+        em_uso = {entrada['pdf'] for entrada in novo_estado.values()}
+        for nome_arquivo in resumo['removidas']:
+            if nome_arquivo not in em_uso:
+                self.cache_pdf.remover(nome_arquivo)
+        resumo['removidas'] = [nome_arquivo for nome_arquivo in resumo['removidas'] if nome_arquivo not in em_uso]
+
+        self._salvar_estado(novo_estado)
+        resumo['musicas'] = len(itens)
+        resumo['tempo'] = time.perf_counter() - inicio
+        return resumo
+
+
+def imprimir_resumo(resumo: dict):
+    for rotulo, nome_arquivo, motivo, tempo in resumo['geradas']:
+        print(f"  ✅ {rotulo}: {nome_arquivo} ({motivo}, {tempo:.2f}s)")
+    for nome_arquivo in resumo['removidas']:
+        print(f"  🗑️  {nome_arquivo} (tom antigo)")
+    for rotulo, nome_arquivo in resumo['puladas']:
+        print(f"  ⏭️  {rotulo}: sem mudanças ({nome_arquivo})")
+    for rotulo, erro in resumo['erros']:
+        print(f"  ❌ {rotulo}: {erro}")
+
+    print(f"\n🔄 {resumo['musicas']} músicas: {len(resumo['geradas'])} PDFs gerados, "
+          f"{len(resumo['puladas'])} sem mudanças, {len(resumo['erros'])} erros ({resumo['tempo']:.2f}s)")
+
+
+def _modificado_em(caminho: str) -> float:
+    try:
+        return os.path.getmtime(caminho)
+    except OSError:
+        return 0.0
+
+
+def _aguardar(caminho_setlist: str, intervalo: float) -> bool:
+    modificado_em = _modificado_em(caminho_setlist)
+    limite = time.monotonic() + intervalo
+    while time.monotonic() < limite:
+        time.sleep(min(VERIFICACAO_SETLIST, max(0.0, limite - time.monotonic())))
+        if _modificado_em(caminho_setlist) != modificado_em:
+            return True
+    return False
+
+
+def main_sincronizar(argumentos: list):
+    caminho_setlist = None
+    max_workers = MAX_WORKERS_PADRAO
+    intervalo = None
+    offline = False
+    forcar = False
+    requisicoes_por_segundo = REQUISICOES_POR_SEGUNDO_PADRAO
+
+    i = 0
+    while i < len(argumentos):
+        argumento = argumentos[i].strip()
+        if argumento.lower() == '--sincronizar' and i + 1 < len(argumentos):
+            caminho_setlist = argumentos[i + 1]
+            i += 1
+        elif argumento.lower() == '--assistir':
+            intervalo = INTERVALO_PADRAO
+            if i + 1 < len(argumentos) and argumentos[i + 1].isdigit():
+                intervalo = max(1, int(argumentos[i + 1]))
+                i += 1
+        elif argumento.lower() == '--workers' and i + 1 < len(argumentos):
+            max_workers = _interpretar_workers(argumentos[i + 1])
+            i += 1
+        elif argumento.lower() == '--taxa' and i + 1 < len(argumentos):
+            requisicoes_por_segundo = _interpretar_taxa(argumentos[i + 1])
+            i += 1
+        elif argumento.lower() == '--offline':
+            offline = True
+        elif argumento.lower() == '--forcar':
+            forcar = True
+        i += 1
+
+    if not caminho_setlist:
+        print("Uso: python cifra_standalone.py --sincronizar <setlist> [--assistir [segundos]] [--workers N] [--taxa N] [--offline] [--forcar]")
+        sys.exit(1)
+
+    transporte = Transporte(max_conexoes=MAX_POR_HOST_PADRAO, requisicoes_por_segundo=requisicoes_por_segundo)
+    cifra_club = CifraClubStandalone(offline=offline, transporte=transporte, revalidar=True)
+    sincronizador = SincronizadorSetlist(cifra_club, caminho_setlist, max_workers=max_workers, forcar=forcar)
+
+    try:
+        while True:
+            print(f"\n🔄 Sincronizando '{caminho_setlist}' em '{sincronizador.cache_pdf.pasta_pdf}/'...")
+            try:
+                resumo = sincronizador.sincronizar()
+            except (OSError, ValueError) as e:
+                print(f"\n❌ {e}\n")
+                if intervalo is None:
+                    sys.exit(1)
+            else:
+                imprimir_resumo(resumo)
+                metricas = transporte.metricas.resumo()
+                if metricas['requisicoes']:
+                    print(f"🌐 {metricas['requisicoes']} consultas ao site, "
+                          f"{metricas['por_status'].get('304', 0)} sem alteração (304), "
+                          f"{metricas['bytes_recebidos'] / 1024:.0f} KB recebidos")
+                if intervalo is None:
+                    if resumo['erros']:
+                        sys.exit(2)
+                    return
+
+            sincronizador.forcar = False
+            print(f"\n👀 Aguardando {intervalo}s ou uma alteração no setlist (Ctrl+C para sair)...")
+            if _aguardar(caminho_setlist, intervalo):
+                print("📝 Setlist alterado")
+    except KeyboardInterrupt:
+        print("\n👋 Sincronização encerrada")
+
+
+if __name__ == "__main__":
+    main_sincronizar(sys.argv[1:])
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+from cifra_acordes import CLASSES_DE_ALTURA, TONS_MAIORES, interpretar_tom, nome_do_tom, qualidade_basica
+from cifra_documento import DocumentoCifra, analisar_cifra
+
+
+PERFIL_MAIOR = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+PERFIL_MENOR = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)
+
+PESO_RAIZ = 2.0
+PESO_NOTA = 1.0
+PESO_BAIXO = 1.0
+PESO_EXTREMOS = 0.25
+
+EXTENSAO_MELODIA = (-5, 9)
+CASAS_CAPOTRASTE = 7
+
+ACORDES_ABERTOS = {
+    'M': {'C', 'D', 'E', 'G', 'A'},
+    'm': {'D', 'E', 'A'},
+    '7': {'C', 'D', 'E', 'G', 'A', 'B'},
+    'm7': {'D', 'E', 'A', 'B'},
+    '7M': {'C', 'D', 'E', 'F', 'G', 'A'},
+    'sus': {'D', 'E', 'A'},
+    '5': set(CLASSES_DE_ALTURA),
+}
+
+PADRAO_NOTA_OITAVA = re.compile(r'^([A-Ga-g][#b]?)(-?\d)$')
+
+Tonalidade = namedtuple('Tonalidade', 'tom tonica menor correlacao margem')
+
+
+def _centralizar(perfil: tuple) -> tuple:
+    media = sum(perfil) / len(perfil)
+    centrado = [valor - media for valor in perfil]
+    norma = sum(valor * valor for valor in centrado) ** 0.5
+    return tuple(valor / norma for valor in centrado)
+
+
+PERFIS = []
+for _tonica in range(12):
+    for _menor, _perfil in ((False, PERFIL_MAIOR), (True, PERFIL_MENOR)):
+        _rotacionado = _centralizar(tuple(_perfil[(classe - _tonica) % 12] for classe in range(12)))
+        PERFIS.append((_tonica, _menor, _rotacionado))
+
+
+def _forma(qualidade: str) -> str:
+    if qualidade.startswith('5'):
+        return '5'
+    if 'sus' in qualidade:
+        return 'sus'
+    basica = qualidade_basica(qualidade)
+    if basica == 'd':
+        return 'd'
+    if '7M' in qualidade or 'maj7' in qualidade or '7+' in qualidade:
+        return '7M' if basica == 'M' else 'm7M'
+    if '7' in qualidade:
+        return 'm7' if basica == 'm' else '7'
+    return basica
+
+
+@lru_cache(maxsize=1024)
+def notas_do_acorde(raiz: str, qualidade: str) -> tuple:
+    tonica = CLASSES_DE_ALTURA[raiz]
+    forma = _forma(qualidade)
+    if forma == '5':
+        intervalos = (0, 7)
+    elif forma == 'sus':
+        intervalos = (0, 2 if 'sus2' in qualidade else 5, 7)
+    elif forma == 'd':
+        setima = (10,) if 'b5' in qualidade else (9,)
+        intervalos = (0, 3, 6) + (setima if '7' in qualidade else ())
+    else:
+        terca = 3 if forma in ('m', 'm7', 'm7M') else 4
+        quinta = 8 if qualidade.startswith(('aug', '+')) or '5+' in qualidade else 7
+        intervalos = (0, terca, quinta)
+        if forma in ('7M', 'm7M'):
+            intervalos += (11,)
+        elif forma in ('7', 'm7'):
+            intervalos += (10,)
+    return tuple((tonica + intervalo) % 12 for intervalo in intervalos)
+
+
+def histograma(acordes) -> list:
+    pesos = [0.0] * 12
+    contagem = Counter()
+    primeiro = ultimo = None
+    for acorde in acordes:
+        contagem[acorde] += 1
+        if primeiro is None:
+            primeiro = acorde
+        ultimo = acorde
+
+    total = 0
+    for acorde, ocorrencias in contagem.items():
+        notas = notas_do_acorde(acorde.raiz + acorde.acidente, acorde.qualidade)
+        pesos[notas[0]] += PESO_RAIZ * ocorrencias
+        for nota in notas[1:]:
+            pesos[nota] += PESO_NOTA * ocorrencias
+        if acorde.baixo:
+            pesos[CLASSES_DE_ALTURA[acorde.baixo]] += PESO_BAIXO * ocorrencias
+        total += ocorrencias
+
+    for acorde in (primeiro, ultimo):
+        if acorde is not None:
+            pesos[CLASSES_DE_ALTURA[acorde.raiz + acorde.acidente]] += PESO_EXTREMOS * PESO_RAIZ * total
+    return pesos
+
+
+def _acordes_de(fonte):
+    if isinstance(fonte, str):
+        fonte = analisar_cifra(fonte)
+    if isinstance(fonte, DocumentoCifra):
+        return fonte.acordes()
+    return fonte
+
+
+def detectar_tom(fonte):
+    pesos = histograma(_acordes_de(fonte))
+    if not any(pesos):
+        return None
+
+    media = sum(pesos) / 12
+    centrado = [peso - media for peso in pesos]
+    norma = sum(valor * valor for valor in centrado) ** 0.5
+    if not norma:
+        return None
+
+    melhor = segundo = None
+    for tonica, menor, perfil in PERFIS:
+        correlacao = sum(a * b for a, b in zip(centrado, perfil)) / norma
+        if melhor is None or correlacao > melhor[0]:
+            melhor, segundo = (correlacao, tonica, menor), melhor
+        elif segundo is None or correlacao > segundo[0]:
+            segundo = (correlacao, tonica, menor)
+
+    correlacao, tonica, menor = melhor
+    return Tonalidade(nome_do_tom(tonica, menor), tonica, menor, correlacao, correlacao - segundo[0])
+
+
+def tonalidade_declarada(tom: str):
+    tonalidade = interpretar_tom(tom)
+    if tonalidade is None:
+        return None
+    tonica, menor = tonalidade
+    return Tonalidade(nome_do_tom(tonica, menor), tonica, menor, None, None)
+
+
+def exige_pestana(raiz: str, qualidade: str) -> bool:
+    forma = _forma(qualidade)
+    return raiz not in ACORDES_ABERTOS.get(forma, ())
+
+
+def contar_pestanas(contagem: Counter, semitons: int = 0) -> int:
+    total = 0
+    for acorde, ocorrencias in contagem.items():
+        raiz = TONS_MAIORES[(CLASSES_DE_ALTURA[acorde.raiz + acorde.acidente] + semitons) % 12]
+        if exige_pestana(raiz, acorde.qualidade):
+            total += ocorrencias
+    return total
+
+
+def melhor_capotraste(pestanas_por_forma: list, semitons: int, casas: int = CASAS_CAPOTRASTE) -> tuple:
+    melhor = (0, pestanas_por_forma[semitons % 12])
+    for casa in range(1, casas + 1):
+        pestanas = pestanas_por_forma[(semitons - casa) % 12]
+        if pestanas < melhor[1]:
+            melhor = (casa, pestanas)
+    return melhor
+
+
+def interpretar_extensao(texto: str) -> tuple:
+    partes = [parte.strip() for parte in texto.replace('..', '-').split('-', 1)]
+    if len(partes) != 2:
+        raise ValueError(f"Extensão vocal inválida: '{texto}' (use por exemplo A2-E4)")
+
+    alturas = []
+    for parte in partes:
+        match = PADRAO_NOTA_OITAVA.match(parte)
+        classe = CLASSES_DE_ALTURA.get(match.group(1)[0].upper() + match.group(1)[1:]) if match else None
+        if classe is None:
+            raise ValueError(f"Nota inválida na extensão vocal: '{parte}' (use por exemplo A2-E4)")
+        alturas.append(12 * (int(match.group(2)) + 1) + classe)
+
+    grave, aguda = sorted(alturas)
+    return grave, aguda
+
+
+def _fora_da_extensao(tonica: int, extensao: tuple, melodia: tuple = EXTENSAO_MELODIA) -> int:
+    grave, aguda = extensao
+    melhor = None
+    for oitava in range(1, 7):
+        altura = 12 * (oitava + 1) + tonica
+        fora = max(0, grave - (altura + melodia[0])) + max(0, (altura + melodia[1]) - aguda)
+        if melhor is None or fora < melhor:
+            melhor = fora
+    return melhor
+
+
+def recomendar_transposicoes(fonte, tonalidade: Tonalidade = None, extensao: tuple = None,
+                             melodia: tuple = EXTENSAO_MELODIA) -> list:
+    contagem = Counter(_acordes_de(fonte))
+    if tonalidade is None:
+        tonalidade = detectar_tom(contagem.elements())
+    total = sum(contagem.values())
+    pestanas_por_forma = [contar_pestanas(contagem, semitons) for semitons in range(12)]
+
+    opcoes = []
+    for semitons in range(-5, 7):
+        casa, pestanas_capo = melhor_capotraste(pestanas_por_forma, semitons)
+        opcao = {
+            'semitons': semitons,
+            'tom': nome_do_tom(tonalidade.tonica + semitons, tonalidade.menor) if tonalidade else None,
+            'pestanas': pestanas_por_forma[semitons % 12],
+            'acordes': total,
+            'capo': casa,
+            'formas': nome_do_tom(tonalidade.tonica + semitons - casa, tonalidade.menor) if tonalidade else None,
+            'pestanas_capo': pestanas_capo,
+            'fora_da_voz': None,
+        }
+        if extensao is not None and tonalidade is not None:
+            opcao['fora_da_voz'] = _fora_da_extensao((tonalidade.tonica + semitons) % 12, extensao, melodia)
+        opcoes.append(opcao)
+
+    opcoes.sort(key=lambda opcao: (opcao['fora_da_voz'] or 0, opcao['pestanas'], abs(opcao['semitons'])))
+    return opcoes
+
+
+def imprimir_recomendacoes(tonalidade: Tonalidade, opcoes: list, detectado: bool = False):
+    if tonalidade is None:
+        print("\n⚠️  Não há acordes suficientes para identificar o tom\n")
+        return
+
+    origem = f"detectado, confiança {tonalidade.correlacao:.2f}" if detectado else 'informado na página'
+    print(f"\n🎼 Tom: {tonalidade.tom} ({origem})\n")
+    print(f"  {'Tom':<6}{'Semitons':>9}{'Pestanas':>12}{'Fora da voz':>14}   Capotraste")
+    for posicao, opcao in enumerate(opcoes):
+        pestanas = f"{opcao['pestanas']}/{opcao['acordes']}"
+        voz = '—' if opcao['fora_da_voz'] is None else f"{opcao['fora_da_voz']} st"
+        capo = '—'
+        if opcao['capo']:
+            capo = f"{opcao['capo']}ª casa, formas de {opcao['formas']} ({opcao['pestanas_capo']}/{opcao['acordes']} pestanas)"
+        marcador = '⭐' if posicao == 0 else '  '
+        print(f"{marcador}{opcao['tom'] or '?':<6}{opcao['semitons']:>+9}{pestanas:>12}{voz:>14}   {capo}")
+    print()
+
+
+def detectar_em_lote(itens):
+    for chave, dados in itens:
+        documento = dados.get('documento')
+        if documento is None or documento.texto is not dados.get('cifra'):
+            documento = analisar_cifra(dados.get('cifra') or '')
+        yield chave, dados, detectar_tom(documento)
+
+
+def main_tonalidade(argumentos: list):
+    opcoes = [argumento.lower() for argumento in argumentos]
+    inicio = time.perf_counter()
+
+    if '--biblioteca' in opcoes and opcoes.index('--biblioteca') + 1 < len(argumentos):
+        from cifra_biblioteca import BibliotecaCifras, ErroBiblioteca
+        try:
+            biblioteca = BibliotecaCifras(argumentos[opcoes.index('--biblioteca') + 1], somente_leitura=True)
+        except ErroBiblioteca as e:
+            print(f"\n❌ {e}\n")
+            sys.exit(1)
+        itens = biblioteca.musicas()
+    else:
+        from cifra_cache import CacheCifras
+        biblioteca = None
+        itens = ((entrada['chave'], entrada['dados']) for entrada in CacheCifras().entradas()
+                 if 'erro' not in entrada['dados'])
+
+    total = com_tom = concordam = 0
+    divergentes = []
+    try:
+        for chave, dados, tonalidade in detectar_em_lote(itens):
+            total += 1
+            declarada = tonalidade_declarada(dados.get('tom_original'))
+            if declarada is None or tonalidade is None or dados.get('tom_detectado'):
+                continue
+            com_tom += 1
+            if (declarada.tonica, declarada.menor) == (tonalidade.tonica, tonalidade.menor):
+                concordam += 1
+            else:
+                divergentes.append((chave, declarada.tom, tonalidade))
+    finally:
+        if biblioteca is not None:
+            biblioteca.fechar()
+
+    duracao = time.perf_counter() - inicio
+    print(f"\n🎼 {total} cifras analisadas em {duracao:.2f}s ({total / duracao if duracao else 0:,.0f} cifras/s)")
+    if com_tom:
+        print(f"   Tom detectado igual ao informado em {concordam} de {com_tom} ({concordam / com_tom:.0%})")
+    for chave, declarado, tonalidade in divergentes[:20]:
+        print(f"   {chave}: informado {declarado}, detectado {tonalidade.tom} ({tonalidade.correlacao:.2f})")
+    if len(divergentes) > 20:
+        print(f"   ... e mais {len(divergentes) - 20}")
+    print()
+
+
+if __name__ == "__main__":
+    main_tonalidade(sys.argv[1:])
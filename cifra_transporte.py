@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import time
+import random
+import threading
+import importlib.util
+from collections import Counter, deque
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+TIMEOUT_PADRAO = (5, 10)
+MAX_CONEXOES_PADRAO = 4
+TENTATIVAS_PADRAO = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAXIMO = 10.0
+REQUISICOES_POR_SEGUNDO_PADRAO = 8.0
+RAJADA_PADRAO = 16
+HOSTS_POR_SESSAO = 8
+STATUS_REPETIR = frozenset((429, 500, 502, 503, 504))
+AMOSTRAS_LATENCIA = 1000
+TAMANHO_MAXIMO_PADRAO = 8 * 1024 * 1024
+TAMANHO_BLOCO_LEITURA = 64 * 1024
+
+
+def codificacoes_aceitas() -> str:
+    codificacoes = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        codificacoes.append('br')
+    return ', '.join(codificacoes)
+
+
+class RespostaMuitoGrande(Exception):
+    pass
+
+
+class LeitorResposta:
+
+    def __init__(self, response, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO,
+                 tamanho_bloco: int = TAMANHO_BLOCO_LEITURA, metricas=None):
+        self.tamanho_maximo = tamanho_maximo
+        self.metricas = metricas
+        self.recebidos = 0
+        declarado = response.headers.get('Content-Length')
+        if tamanho_maximo and declarado and declarado.isdigit() and int(declarado) > tamanho_maximo:
+            raise RespostaMuitoGrande(self._mensagem())
+        self._blocos = response.iter_content(tamanho_bloco)
+
+    def _mensagem(self) -> str:
+        return f"Resposta maior que o limite de {self.tamanho_maximo / 1024 / 1024:g} MB"
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        bloco = next(self._blocos)
+        self.recebidos += len(bloco)
+        if self.metricas is not None:
+            self.metricas.registrar_bytes(len(bloco))
+        if self.tamanho_maximo and self.recebidos > self.tamanho_maximo:
+            raise RespostaMuitoGrande(self._mensagem())
+        return bloco
+
+    def ler_tudo(self) -> bytes:
+        return b''.join(self)
+
+    def descartar_restante(self):
+        for _ in self:
+            pass
+
+
+class LimitadorTaxa:
+
+    def __init__(self, taxa: float = REQUISICOES_POR_SEGUNDO_PADRAO, capacidade: int = RAJADA_PADRAO):
+        self.taxa = taxa
+        self.capacidade = max(1, capacidade)
+        self._fichas = float(self.capacidade)
+        self._atualizado_em = time.monotonic()
+        self._lock = threading.Lock()
+
+    def adquirir(self) -> float:
+        if not self.taxa:
+            return 0.0
+
+        esperado = 0.0
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado_em) * self.taxa)
+                self._atualizado_em = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return esperado
+                espera = (1 - self._fichas) / self.taxa
+            time.sleep(espera)
+            esperado += espera
+
+
+def _percentil(valores: list, fracao: float) -> float:
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(fracao * len(valores)))]
+
+
+class MetricasTransporte:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes = 0
+        self.tentativas = 0
+        self.repeticoes = 0
+        self.falhas = 0
+        self.bytes_recebidos = 0
+        self.espera_limitador = 0.0
+        self.espera_backoff = 0.0
+        self.por_status = Counter()
+        self._latencias = deque(maxlen=AMOSTRAS_LATENCIA)
+        self._latencia_total = 0.0
+
+    def registrar_tentativa(self, latencia: float, status: int = None, tamanho: int = 0):
+        with self._lock:
+            self.tentativas += 1
+            self._latencias.append(latencia)
+            self._latencia_total += latencia
+            self.bytes_recebidos += tamanho
+            self.por_status[status if status is not None else 'erro'] += 1
+
+    def registrar_bytes(self, tamanho: int):
+        with self._lock:
+            self.bytes_recebidos += tamanho
+
+    def registrar_requisicao(self, sucesso: bool, espera_limitador: float):
+        with self._lock:
+            self.requisicoes += 1
+            self.espera_limitador += espera_limitador
+            if not sucesso:
+                self.falhas += 1
+
+    def registrar_repeticao(self, espera: float):
+        with self._lock:
+            self.repeticoes += 1
+            self.espera_backoff += espera
+
+    def resumo(self) -> dict:
+        with self._lock:
+            latencias = sorted(self._latencias)
+            return {
+                'requisicoes': self.requisicoes,
+                'tentativas': self.tentativas,
+                'repeticoes': self.repeticoes,
+                'falhas': self.falhas,
+                'bytes_recebidos': self.bytes_recebidos,
+                'por_status': {str(status): total for status, total in self.por_status.items()},
+                'latencia_media_ms': self._latencia_total / self.tentativas * 1000 if self.tentativas else 0.0,
+                'latencia_p50_ms': _percentil(latencias, 0.50) * 1000,
+                'latencia_p95_ms': _percentil(latencias, 0.95) * 1000,
+                'espera_limitador_s': self.espera_limitador,
+                'espera_backoff_s': self.espera_backoff,
+            }
+
+
+class Transporte:
+
+    def __init__(self, max_conexoes: int = MAX_CONEXOES_PADRAO, tentativas: int = TENTATIVAS_PADRAO,
+                 backoff_base: float = BACKOFF_BASE, backoff_maximo: float = BACKOFF_MAXIMO,
+                 requisicoes_por_segundo: float = REQUISICOES_POR_SEGUNDO_PADRAO, rajada: int = RAJADA_PADRAO,
+                 timeout=TIMEOUT_PADRAO, limitador: LimitadorTaxa = None):
+        self.max_conexoes = max_conexoes
+        self.tentativas = max(1, tentativas)
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.timeout = timeout
+        self.limitador = limitador if limitador is not None else LimitadorTaxa(requisicoes_por_segundo, rajada)
+        self.metricas = MetricasTransporte()
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adaptador = HTTPAdapter(pool_connections=HOSTS_POR_SESSAO, pool_maxsize=self.max_conexoes,
+                                            pool_block=True, max_retries=0)
+                    session.mount('https://', adaptador)
+                    session.mount('http://', adaptador)
+                    session.headers.update({
+                        'User-Agent': USER_AGENT,
+                        'Accept-Encoding': codificacoes_aceitas(),
+                    })
+                    self._session = session
+        return self._session
+
+    def _espera(self, tentativa: int, response) -> float:
+        if response is not None and response.status_code in (429, 503):
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(self.backoff_maximo, max(0.0, float(retry_after)))
+                except ValueError:
+                    from email.utils import parsedate_to_datetime
+                    try:
+                        return min(self.backoff_maximo, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+                    except (TypeError, ValueError):
+                        pass
+        return random.uniform(0, min(self.backoff_maximo, self.backoff_base * 2 ** tentativa))
+
+    def get(self, url: str, headers: dict = None, **opcoes):
+        import requests
+
+        opcoes.setdefault('timeout', self.timeout)
+        espera_limitador = 0.0
+        for tentativa in range(self.tentativas):
+            espera_limitador += self.limitador.adquirir()
+            response = None
+            inicio = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, **opcoes)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.metricas.registrar_tentativa(time.perf_counter() - inicio)
+                if tentativa == self.tentativas - 1:
+                    self.metricas.registrar_requisicao(False, espera_limitador)
+                    raise
+            else:
+                tamanho = 0 if opcoes.get('stream') else len(response.content)
+                self.metricas.registrar_tentativa(time.perf_counter() - inicio, response.status_code, tamanho)
+                if response.status_code not in STATUS_REPETIR or tentativa == self.tentativas - 1:
+                    self.metricas.registrar_requisicao(response.status_code < 400, espera_limitador)
+                    return response
+                response.close()
+
+            espera = self._espera(tentativa, response)
+            self.metricas.registrar_repeticao(espera)
+            time.sleep(espera)